@@ -1,112 +1,237 @@
+from array import array
+import logging
 from pathlib import Path
+import numpy as np
 from config.base.data_loader import load_game_tables
+from config.base import config_cache
+from config.base.frozen import Frozen, readonly
+from config.base.symbols import SymbolRegistry
+from config.base.line_evaluator import LineEvaluator
 
-# ---- Simple wrapper classes (expandable later) ----
-class Grid:
-    def __init__(self, df, strips):
+logger = logging.getLogger(__name__)
+
+# ---- Compiled config classes (slotted and read-only, see config/base/frozen.py) ----
+class Grid(Frozen):
+    """
+    Grid size and the visible symbols, as a flat row-major array('B') of symbol IDs (`cells`).
+    The cells buffer is the only mutable part: spins write the stopped windows into it in place.
+    """
+
+    __slots__ = ("rows", "columns", "symbols", "cells")
+
+    def __init__(self, df, strips, symbols=None):
         """
         Creates the initial 2D grid (rows x columns) using the first symbols of each strip.
         Args:
-            df (DataFrame): Table containing the grid size (Rows, Columns).
+            df (Table): Table containing the grid size (Rows, Columns).
             strips (Strips): Strips object containing the reels.
+            symbols (SymbolRegistry): Symbol IDs (built from the strips if None).
         """
-        self.data = df
-        self.rows = int(df.loc[0, "Rows"])
-        self.columns = int(df.loc[0, "Columns"])
+        self._build(int(df["Rows"][0]), int(df["Columns"][0]), strips, symbols)
 
+    def _build(self, rows, columns, strips, symbols):
         # Validació bàsica
-        if self.columns != len(strips.reels):
-            print(f"⚠️ Warning: Grid expects {self.columns} columns but found {len(strips.reels)} strips.")
+        if columns != len(strips.reels):
+            logger.warning(f"⚠️ Warning: Grid expects {columns} columns but found {len(strips.reels)} strips.")
+        symbols = symbols or SymbolRegistry.for_base(strips)
 
         # 🔹 Construïm la grid inicial: primer símbol de cada strip
-        # Cada columna del slot correspon a un strip (reel)
-        self.grid = []
-        for row in range(self.rows):
-            fila = []
-            for col in range(self.columns):
-                # agafem símbol de la posició "row" dins del reel (si existeix)
-                reel = strips.reels[col]
-                symbol = reel[row % len(reel)] if reel else None
-                fila.append(symbol)
-            self.grid.append(fila)
+        # Cada columna del slot correspon a un strip (reel); agafem el símbol de la posició "row" dins del reel
+        cells = symbols.encode(
+            strips.reels[col][row % len(strips.reels[col])] if strips.reels[col] else None
+            for row in range(rows) for col in range(columns)
+        )
+        return self._set(rows=rows, columns=columns, symbols=symbols, cells=cells)
 
     def __repr__(self):
         return f"<Grid {self.rows}x{self.columns}>"
 
+    def to_dict(self):
+        """Return the compiled grid size (for the config cache)."""
+        return {"rows": self.rows, "columns": self.columns}
+
+    @classmethod
+    def from_dict(cls, data, strips, symbols=None):
+        """Rebuild a Grid from to_dict() output, without reading the workbook."""
+        return cls.__new__(cls)._build(int(data["rows"]), int(data["columns"]), strips, symbols)
+
+    @property
+    def grid(self):
+        """The grid as a list of rows of symbol names (decoded from `cells`)."""
+        return self.symbols.decode(self.cells, self.columns)
+
     def get_symbol(self, row, col):
         """Return a symbol from the grid (row, column)."""
-        return self.grid[row][col]
+        return self.symbols.names[self.cells[row * self.columns + col]]
+
+    def get_id(self, row, col):
+        """Return the symbol ID at (row, column)."""
+        return self.cells[row * self.columns + col]
+
+    def count(self, flag):
+        """Number of visible symbols carrying a SymbolRegistry flag (e.g. SymbolRegistry.SCATTER)."""
+        return self.symbols.count(self.cells, flag)
 
     def get_all(self):
         """Return the full 2D grid as a list of lists."""
         return self.grid
 
 
-class Strips:
+class Strips(Frozen):
+    """
+    The reels as a tuple of symbol tuples (one per reel, in strip order) and, once
+    compiled for a number of rows, their per-stop windows and Scatter counts.
+    """
+
+    __slots__ = ("reels", "rows", "window_table", "windows", "scatter_counts")
+    _DERIVED = ("windows",)
+
     def __init__(self, df):
         """
-        Converts the strips DataFrame into a 2D list.
-        Each sublist corresponds to one reel (column) and contains its symbols in order.
+        Converts the strips table into one tuple of symbols per reel (column).
         """
-        # Guarda el DataFrame original (opcional per depuració)
-        self.data = df
-
-        # Converteix cada columna en una llista de símbols no nuls
-        self.reels = [df[col].dropna().tolist() for col in df.columns]
+        # Converteix cada columna en una tupla de símbols no nuls
+        self._build(tuple(symbol for symbol in df[col] if symbol is not None) for col in df.columns)
+
+    def _build(self, reels, rows=None, window_table=None, scatter_counts=None):
+        self._set(reels=tuple(tuple(reel) for reel in reels), rows=rows,
+                  window_table=window_table, scatter_counts=scatter_counts)
+        self._derive()
+        return self
+
+    def _derive(self):
+        # windows[reel][stop]: slices of window_table (not pickled, rebuilt on load)
+        windows = None
+        if self.window_table is not None:
+            rows = self.rows
+            windows = tuple(
+                tuple(table[stop * rows:(stop + 1) * rows] for stop in range(len(table) // rows))
+                for table in self.window_table
+            )
+        self._set(windows=windows)
 
     def __repr__(self):
-        return f"<Strips {len(self.reels)} reels>"
+        compiled = f", compiled for {self.rows} rows" if self.rows else ""
+        return f"<Strips {len(self.reels)} reels{compiled}>"
+
+    def compile(self, rows, symbols):
+        """
+        Returns these strips compiled for a window of `rows` symbols, with per-stop data:
+        - window_table[reel]: every visible window, stop after stop, as one contiguous
+          array('B') of symbol IDs (stops x rows, wrapping around the strip);
+        - windows[reel][stop]: the same window as its own array('B'), ready to be written
+          into a grid column in one slice assignment;
+        - scatter_counts[reel][stop]: number of Scatters visible when the reel stops there,
+          so the Scatters of a spin are a sum of one lookup per reel.
+        Args:
+            rows (int): Visible rows of the grid.
+            symbols (SymbolRegistry): Symbol IDs and flags.
+        """
+        window_table = []
+        scatter_counts = []
+        for reel in self.reels:
+            ids = symbols.encode(reel)
+            table = array("B", [ids[(stop + row) % len(ids)] for stop in range(len(ids)) for row in range(rows)])
+            window_table.append(table)
+            scatter_counts.append(array("B", [
+                symbols.count(table[stop * rows:(stop + 1) * rows], SymbolRegistry.SCATTER) for stop in range(len(ids))
+            ]))
+        return type(self).__new__(type(self))._build(self.reels, rows, tuple(window_table), tuple(scatter_counts))
+
+    def scatter_distribution(self):
+        """Exact distribution of the visible Scatters over all stop combinations: {count: probability}."""
+        distribution = {0: 1.0}
+        for counts in self.scatter_counts:
+            per_reel = {}
+            for count in counts:
+                per_reel[count] = per_reel.get(count, 0) + 1 / len(counts)
+            combined = {}
+            for total, p_total in distribution.items():
+                for count, p_count in per_reel.items():
+                    combined[total + count] = combined.get(total + count, 0.0) + p_total * p_count
+            distribution = combined
+        return dict(sorted(distribution.items()))
+
+    def to_dict(self):
+        """Return the compiled reels (for the config cache)."""
+        return {"reels": [list(reel) for reel in self.reels]}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild Strips from to_dict() output, without reading the workbook."""
+        return cls.__new__(cls)._build(data["reels"])
 
     def get_reel(self, index):
-        """Returns a specific reel (list of symbols)."""
+        """Returns a specific reel (tuple of symbols)."""
         if 0 <= index < len(self.reels):
             return self.reels[index]
         raise IndexError("Reel index out of range")
 
     def get_all(self):
-        """Returns the full 2D array of reels."""
+        """Returns every reel (tuple of symbol tuples)."""
         return self.reels
 
 
-class Paylines:
+class Paylines(Frozen):
+    """The paylines as a read-only (lines x reels) array of row indexes (0 at top)."""
+
+    __slots__ = ("lines",)
+
     def __init__(self, df):
         """
-        Converts the Paylines DataFrame into a 2D list.
-        Each sublist corresponds to one payline, and each element indicates the row
-        index (0 at top) for that reel.
+        Converts the Paylines table into a (lines x reels) array: each row is one payline,
+        and each element indicates the row index (0 at top) for that reel.
         """
-        self.data = df
-
         # 🧹 Neteja: selecciona només les columnes que comencen amb "Reel"
-        reel_columns = [col for col in df.columns if "Reel" in col]
+        reel_columns = [col for col in df.columns if "Reel" in str(col)]
 
         # 🔹 Converteix cada fila en una llista d'enters
-        self.lines = df[reel_columns].astype(int).values.tolist()
+        self._build([[int(row[col]) for col in reel_columns] for row in df.rows()])
+
+    def _build(self, lines):
+        return self._set(lines=readonly(np.array(lines, dtype=np.intp)))
 
     def __repr__(self):
         return f"<Paylines {len(self.lines)} lines>"
 
+    def to_dict(self):
+        """Return the compiled paylines (for the config cache)."""
+        return {"lines": self.lines.tolist()}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild Paylines from to_dict() output, without reading the workbook."""
+        return cls.__new__(cls)._build(data["lines"])
+
+    def compile(self, paytable, symbols, columns):
+        """Return the compiled LineEvaluator of these paylines with the given paytable."""
+        return LineEvaluator(self.lines, paytable.table, symbols, columns)
+
     def get_line(self, index):
         """Return a specific payline (list of row indexes per reel)."""
         if 0 <= index < len(self.lines):
-            return self.lines[index]
+            return self.lines[index].tolist()
         raise IndexError("Payline index out of range")
 
     def get_all(self):
-        """Return the full 2D array of paylines."""
+        """Return the full (lines x reels) array of paylines."""
         return self.lines
 
 
-class Paytable:
+class Paytable(Frozen):
+    """
+    The paytable as a dense read-only (symbols x counts) array of payouts: row `i` holds
+    [pay3, pay4, pay5] of names[i].
+    """
+
+    __slots__ = ("names", "payouts", "_rows")
+
     def __init__(self, df):
         """
-        Converts the Paytable DataFrame into a dictionary:
-        { symbol: [pay3, pay4, pay5], ... }
+        Converts the Paytable table into the symbol names and their payout rows.
         """
-        self.data = df
-
         # 🧹 Normalitza noms de columnes per seguretat (per si hi ha espais o majúscules)
-        df.columns = [str(col).strip() for col in df.columns]
+        df.rename_columns(lambda col: str(col).strip())
 
         # Detectem automàticament la columna del símbol (la primera)
         symbol_col = df.columns[0]
@@ -114,27 +239,47 @@ class Paytable:
         # Les columnes de pagament (Pay3, Pay4, Pay5)
         pay_columns = [col for col in df.columns if col.lower().startswith("pay")]
 
-        # 🔹 Creem el diccionari
-        self.table = {
-            str(row[symbol_col]).strip(): [float(row[pay]) for pay in pay_columns]
-            for _, row in df.iterrows()
-        }
+        # 🔹 Creem la taula densa
+        self._build({str(row[symbol_col]).strip(): [float(row[pay]) for pay in pay_columns] for row in df.rows()})
+
+    def _build(self, table):
+        names = tuple(table)
+        payouts = np.array([table[name] for name in names], dtype=np.float64).reshape(len(names), -1) if names else np.zeros((0, 3))
+        return self._set(
+            names=names,
+            payouts=readonly(payouts),
+            _rows={name: row for row, name in enumerate(names)},
+        )
 
     def __repr__(self):
-        return f"<Paytable {len(self.table)} symbols>"
+        return f"<Paytable {len(self.names)} symbols>"
+
+    @property
+    def table(self):
+        """The paytable as a new dictionary { symbol: [pay3, pay4, pay5], ... }."""
+        return dict(zip(self.names, self.payouts.tolist()))
+
+    def to_dict(self):
+        """Return the compiled paytable (for the config cache)."""
+        return {"table": self.table}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a Paytable from to_dict() output, without reading the workbook."""
+        return cls.__new__(cls)._build({symbol: [float(p) for p in pays] for symbol, pays in data["table"].items()})
 
     def get_payouts(self, symbol):
         """Return the list of payouts [pay3, pay4, pay5] for a symbol."""
-        return self.table.get(symbol, [0, 0, 0])
+        row = self._rows.get(symbol)
+        return self.payouts[row].tolist() if row is not None else [0, 0, 0]
 
     def get_payout(self, symbol, count):
         """Return the specific payout for a symbol given its count (3, 4, or 5)."""
-        if symbol not in self.table:
-            return 0
+        row = self._rows.get(symbol)
         index = count - 3  # 3→0, 4→1, 5→2
-        if 0 <= index < len(self.table[symbol]):
-            return self.table[symbol][index]
-        return 0
+        if row is None or not 0 <= index < self.payouts.shape[1]:
+            return 0
+        return float(self.payouts[row, index])
 
     def get_all(self):
         """Return the full paytable dictionary."""
@@ -153,25 +298,48 @@ class BaseConfigFactory:
         self.file_name = "slot_config.xlsx"
         self.game_name = game_name
 
-    def build(self, table_names, debug=False):
-        """Loads all tables listed in table_names and builds config objects."""
+    def build(self, table_names, debug=False, use_cache=True):
+        """
+        Loads all tables listed in table_names and builds config objects.
+        The compiled objects are cached next to the project (keyed on the workbook content,
+        the table list and the loader sources), so warm starts skip the Excel parsing entirely.
+        """
+
+        logger.info("Loading Base Config...")
+
+        excel_file = self.base_path / self.file_name
+        cache_key = config_cache.cache_key(excel_file, table_names, "base", __file__)
 
-        print("Loading Base Config...")
+        # Warm start: rebuild the objects from the compiled cache (debug needs the raw tables)
+        if use_cache and not debug:
+            cached = config_cache.load(self.base_path, cache_key)
+            if cached is not None:
+                config = self.from_dict(cached)
+                logger.info("BASE CONFIG LOADED FROM CACHE ✅")
+                return config
 
         tables = load_game_tables(table_names, self.base_path, self.file_name)
 
         # Create objects conditionally
         config = {}
         if "Grid" in table_names:
-            strips = Strips(tables.get("strips"))
-            config["grid"] = Grid(tables.get("grid"), strips)
-            config["strips"] = strips
+            config["strips"] = Strips(tables.get("strips"))
         if "Paylines" in table_names:
             config["paylines"] = Paylines(tables.get("paylines"))
         if "Paytable" in table_names:
             config["paytable"] = Paytable(tables.get("paytable"))
+        if "Grid" in table_names:
+            # Symbol IDs shared by the grid and every engine built from this config
+            config["symbols"] = SymbolRegistry.for_base(config["strips"], config.get("paytable"))
+            config["grid"] = Grid(tables.get("grid"), config["strips"], config["symbols"])
+            config["strips"] = config["strips"].compile(config["grid"].rows, config["symbols"])
+        self._compile_evaluator(config)
+
+        if use_cache:
+            # The symbol registry and the evaluator are derived from the other objects, so they are not stored
+            config_cache.save(self.base_path, cache_key, self.to_dict(config))
 
-        print("BASE CONFIG LOADED SUCCESSFULLY ✅ \n")
+        logger.info("BASE CONFIG LOADED SUCCESSFULLY ✅")
 
         if debug:
             print("──────────────────────────────\n")
@@ -180,9 +348,38 @@ class BaseConfigFactory:
 
             for name, df in tables.items():
                 print(f"\nTABLE: {name}")
-                print(df.to_string(index=False))  # <-- sense índex       
+                print(df.to_string())
 
             print("\n──────────────────────────────\n")
 
         return config
 
+    @staticmethod
+    def from_dict(cached):
+        """Rebuild the config objects from compiled to_dict() payloads (cache or sweep variants)."""
+        config = {}
+        if "strips" in cached:
+            config["strips"] = Strips.from_dict(cached["strips"])
+        if "paylines" in cached:
+            config["paylines"] = Paylines.from_dict(cached["paylines"])
+        if "paytable" in cached:
+            config["paytable"] = Paytable.from_dict(cached["paytable"])
+        if "grid" in cached:
+            config["symbols"] = SymbolRegistry.for_base(config["strips"], config.get("paytable"))
+            config["grid"] = Grid.from_dict(cached["grid"], config["strips"], config["symbols"])
+            config["strips"] = config["strips"].compile(config["grid"].rows, config["symbols"])
+        BaseConfigFactory._compile_evaluator(config)
+        return config
+
+    @staticmethod
+    def to_dict(config):
+        """Compiled payload of every stored config object (derived ones are rebuilt by from_dict)."""
+        return {name: obj.to_dict() for name, obj in config.items() if name not in ("symbols", "evaluator")}
+
+    @staticmethod
+    def _compile_evaluator(config):
+        """Adds the compiled payline evaluator when the grid, paylines and paytable are all loaded."""
+        if all(name in config for name in ("grid", "paylines", "paytable")):
+            config["evaluator"] = config["paylines"].compile(
+                config["paytable"], config["symbols"], config["grid"].columns
+            )
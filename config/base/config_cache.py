@@ -0,0 +1,72 @@
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+
+# Bump when the compiled format of any config object changes (the key also hashes the
+# loader and factory sources, so a code change can never reuse a stale cache)
+CACHE_VERSION = 2
+CACHE_DIR = ".config_cache"
+
+# Shared loader, compiled objects and cache code every payload depends on
+SCHEMA_DIR = Path(__file__).resolve().parent
+
+logger = logging.getLogger(__name__)
+
+_schema_digests = {}
+
+
+def schema_digest(factory_file):
+    """Hash of the sources that parse and (de)serialize a config: config/base plus the factory module."""
+    files = sorted(set(SCHEMA_DIR.glob("*.py")) | {Path(factory_file).resolve()})
+    key = tuple(files)
+    if key not in _schema_digests:
+        digest = hashlib.sha256()
+        for path in files:
+            digest.update(path.name.encode("utf-8"))
+            digest.update(path.read_bytes())
+        _schema_digests[key] = digest.hexdigest()
+    return _schema_digests[key]
+
+
+def cache_key(excel_file, table_names, kind, factory_file):
+    """
+    Key of a compiled config: hash of the workbook content, the requested table list,
+    the config kind ("base", "bonus"...), the cache format version and the sources of the
+    loader and of the factory (factory_file: the factory's module file) that wrote it.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"v{CACHE_VERSION}|{kind}|{'|'.join(table_names)}|{schema_digest(factory_file)}|".encode("utf-8"))
+    with open(excel_file, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return f"{kind}-{digest.hexdigest()[:32]}"
+
+
+def _cache_file(base_path, key):
+    return Path(base_path) / CACHE_DIR / f"{key}.json"
+
+
+def load(base_path, key):
+    """Return the cached payload for `key`, or None if it is missing or unreadable."""
+    path = _cache_file(base_path, key)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save(base_path, key, payload):
+    """Write the payload for `key` atomically (never leaves a half-written cache file)."""
+    path = _cache_file(base_path, key)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+    except OSError as e:
+        # A read-only project folder must not prevent the game from loading
+        logger.warning(f"⚠️ Warning: could not write config cache {path}: {e}")
@@ -1,58 +1,176 @@
-import pandas as pd
-from openpyxl import load_workbook
+import logging
+import posixpath
+import zipfile
+import xml.etree.ElementTree as ET
 from pathlib import Path
 
+_NS_MAIN = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_NS_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_NS_PKG_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+logger = logging.getLogger(__name__)
+
+
+class Table:
+    """
+    Lightweight column-oriented table read from the workbook.
+    Holds the header names and one plain list of cell values per column
+    (empty cells are None).
+    """
+
+    def __init__(self, columns, values):
+        """
+        Args:
+            columns (list): Header names, in sheet order.
+            values (list): One list of cell values per column, all the same length.
+        """
+        self.columns = list(columns)
+        self.values = [list(column) for column in values]
+
+    def __repr__(self):
+        return f"<Table {len(self)} rows x {len(self.columns)} columns>"
+
+    def __len__(self):
+        return len(self.values[0]) if self.values else 0
+
+    def __getitem__(self, column):
+        """Return the list of values of a column."""
+        return self.values[self.columns.index(column)]
+
+    def rename_columns(self, rename):
+        """Apply rename(column) to every header name (in place)."""
+        self.columns = [rename(column) for column in self.columns]
+        return self
+
+    def rows(self):
+        """Iterate the table as {column: value} dictionaries."""
+        for row in zip(*self.values):
+            yield dict(zip(self.columns, row))
+
+    def to_string(self):
+        """Format the table as aligned text (for debug output)."""
+        cells = [[str(c) for c in self.columns]] + [["" if v is None else str(v) for v in row] for row in zip(*self.values)]
+        widths = [max(len(row[i]) for row in cells) for i in range(len(self.columns))]
+        return "\n".join(" ".join(value.rjust(widths[i]) for i, value in enumerate(row)) for row in cells)
+
+
+# ---- Workbook parts ----
+
+def _resolve(part, target):
+    """Resolve a relationship target relative to the part that declares it."""
+    if target.startswith("/"):
+        return target.lstrip("/")
+    return posixpath.normpath(posixpath.join(posixpath.dirname(part), target))
+
+
+def _relationships(archive, part):
+    """Return {relationship id: target part} for a workbook part."""
+    rels_part = posixpath.join(posixpath.dirname(part), "_rels", posixpath.basename(part) + ".rels")
+    if rels_part not in archive.namelist():
+        return {}
+    root = ET.fromstring(archive.read(rels_part))
+    return {
+        rel.get("Id"): _resolve(part, rel.get("Target"))
+        for rel in root.iter(f"{_NS_PKG_REL}Relationship")
+        if rel.get("TargetMode") != "External"
+    }
+
+
+def _table_definitions(excel_file):
+    """
+    Read the Excel Table definitions straight from the xlsx package
+    (read-only worksheets do not expose them).
+    Returns {table_name: (sheet_title, ref)}.
+    """
+    definitions = {}
+    with zipfile.ZipFile(excel_file) as archive:
+        workbook_part = "xl/workbook.xml"
+        workbook_rels = _relationships(archive, workbook_part)
+        workbook = ET.fromstring(archive.read(workbook_part))
+
+        for sheet in workbook.iter(f"{_NS_MAIN}sheet"):
+            sheet_part = workbook_rels.get(sheet.get(f"{_NS_REL}id"))
+            if not sheet_part:
+                continue
+            for table_part in _relationships(archive, sheet_part).values():
+                if not table_part.startswith("xl/tables/"):
+                    continue
+                table = ET.fromstring(archive.read(table_part))
+                for name in {table.get("name"), table.get("displayName")} - {None}:
+                    definitions[name] = (sheet.get("name"), table.get("ref"))
+    return definitions
+
+
+def _split_table(rows, min_col, max_col):
+    """Turn raw rows (first one is the header) into a Table restricted to [min_col, max_col]."""
+    width = max_col - min_col + 1
+    padded = [(tuple(row[min_col - 1:max_col]) + (None,) * width)[:width] for row in rows]
+    header, body = padded[0], padded[1:]
+    return Table(header, [list(column) for column in zip(*body)] if body else [[] for _ in header])
+
+
 def load_game_tables(table_names, base_path, file_name="slot_config.xlsx"):
     """
     Loads specific tables (Grid, Strips, Paylines, Paytable...) from the Excel file.
     Supports both true Excel Tables and plain sheet names (Google Sheets exports).
-    Returns a dict {table_name_lower: DataFrame}.
+
+    The workbook is opened once in read-only mode and each worksheet is streamed once,
+    extracting every requested range from the same pass.
+    Returns a dict {table_name_lower: Table}.
     """
+    # Imported here so warm starts from the compiled config cache never load it
+    from openpyxl import load_workbook
+    from openpyxl.utils.cell import range_boundaries
+
     excel_file = Path(base_path) / file_name
-    wb = load_workbook(excel_file, data_only=True)
-    result = {}    
-
-    for table_name in table_names:
-        df = None
-        found_table = False
-
-        # 1️⃣ Try to load as real Excel Table (with .ref)
-        for ws in wb.worksheets:
-            if table_name in ws.tables:
-                table_obj = ws.tables[table_name]
-
-                # Comprovem si és un objecte amb .ref
-                if hasattr(table_obj, "ref"):
-                    ref = table_obj.ref
-                    start_cell, end_cell = ref.split(":")
-                    start_col = ''.join([c for c in start_cell if c.isalpha()])
-                    start_row = int(''.join([c for c in start_cell if c.isdigit()]))
-                    end_col = ''.join([c for c in end_cell if c.isalpha()])
-                    end_row = int(''.join([c for c in end_cell if c.isdigit()]))
-
-                    df = pd.read_excel(
-                        excel_file,
-                        sheet_name=ws.title,
-                        header=None,
-                        usecols=f"{start_col}:{end_col}",
-                        skiprows=start_row - 1,
-                        nrows=end_row - start_row + 1
-                    )
-
-                    df.columns = df.iloc[0]
-                    df = df[1:].reset_index(drop=True)
-                    result[table_name.lower()] = df
-                    found_table = True
-                    break
-
-        # 2️⃣ Fallback: try to load by sheet name
-        if not found_table:
-            if table_name in wb.sheetnames:
-                print(f"📄 Loading sheet '{table_name}' directly (no Excel Table found).")
-                df = pd.read_excel(excel_file, sheet_name=table_name)
-                result[table_name.lower()] = df
+    definitions = _table_definitions(excel_file)
+    wb = load_workbook(excel_file, read_only=True, data_only=True)
+
+    try:
+        # 1️⃣ Plan what to read from every sheet: real Excel Tables first, then whole sheets
+        requests = {}  # sheet title → list of (table_name, min_col, min_row, max_col, max_row)
+        for table_name in table_names:
+            if table_name in definitions:
+                sheet_title, ref = definitions[table_name]
+                min_col, min_row, max_col, max_row = range_boundaries(ref)
+                requests.setdefault(sheet_title, []).append((table_name, min_col, min_row, max_col, max_row))
+            elif table_name in wb.sheetnames:
+                # 2️⃣ Fallback: load by sheet name
+                logger.info(f"📄 Loading sheet '{table_name}' directly (no Excel Table found).")
+                requests.setdefault(table_name, []).append((table_name, None, None, None, None))
             else:
-                print(f"⚠️ Table or sheet '{table_name}' not found in workbook.")
+                logger.warning(f"⚠️ Table or sheet '{table_name}' not found in workbook.")
+
+        # 3️⃣ Stream every needed sheet once and cut the requested ranges out of it
+        loaded = {}
+        for sheet_title, sheet_requests in requests.items():
+            ws = wb[sheet_title]
+            whole_sheet = any(req[2] is None for req in sheet_requests)
+            first_row = 1 if whole_sheet else min(req[2] for req in sheet_requests)
+            last_row = None if whole_sheet else max(req[4] for req in sheet_requests)
+
+            sheet_rows = list(ws.iter_rows(min_row=first_row, max_row=last_row, values_only=True))
+
+            for table_name, min_col, min_row, max_col, max_row in sheet_requests:
+                if min_row is None:
+                    # Header is the first non-empty row; trailing empty rows are dropped
+                    rows = sheet_rows
+                    while rows and all(v is None for v in rows[0]):
+                        rows = rows[1:]
+                    while rows and all(v is None for v in rows[-1]):
+                        rows = rows[:-1]
+                    if not rows:
+                        continue
+                    width = max(len(row) for row in rows)
+                    loaded[table_name] = _split_table(rows, 1, width)
+                else:
+                    rows = sheet_rows[min_row - first_row:max_row - first_row + 1]
+                    loaded[table_name] = _split_table(rows, min_col, max_col)
+    finally:
+        wb.close()
+
+    # Keep the requested order in the result
+    result = {name.lower(): loaded[name] for name in table_names if name in loaded}
 
-    print(f"Loaded tables: {list(result.keys())} ✅")
+    logger.info(f"Loaded tables: {list(result.keys())} ✅")
     return result
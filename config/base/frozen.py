@@ -0,0 +1,48 @@
+import numpy as np
+
+
+def readonly(values):
+    """Marks a NumPy array read-only (in place) and returns it."""
+    values.flags.writeable = False
+    return values
+
+
+class Frozen:
+    """
+    Base of the compiled config objects: slotted (no per-instance __dict__) and read-only
+    once built. Subclasses declare their fields in __slots__ and fill them with _set()
+    while building; any later assignment raises AttributeError.
+
+    Pickles as the plain slot values, leaving out the fields named in _DERIVED, which
+    _derive() rebuilds on load (views and per-stop slices that are cheaper to recompute
+    than to ship to a worker).
+    """
+
+    __slots__ = ()
+    _DERIVED = ()
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def _set(self, **fields):
+        for name, value in fields.items():
+            object.__setattr__(self, name, value)
+        return self
+
+    @classmethod
+    def _fields(cls):
+        return [name for klass in reversed(cls.__mro__) for name in getattr(klass, "__slots__", ())]
+
+    def _derive(self):
+        """Rebuilds the _DERIVED fields after unpickling."""
+
+    def __getstate__(self):
+        return {name: getattr(self, name) for name in self._fields() if name not in self._DERIVED}
+
+    def __setstate__(self, state):
+        # Arrays come back writeable from a pickle
+        self._set(**{name: readonly(value) if isinstance(value, np.ndarray) else value for name, value in state.items()})
+        self._derive()
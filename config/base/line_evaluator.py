@@ -0,0 +1,127 @@
+from operator import itemgetter
+import numpy as np
+from config.base.symbols import SymbolRegistry
+
+
+class LineEvaluator:
+    """
+    Compiled payline evaluator, built once from Paylines + Paytable + SymbolRegistry.
+
+    Holds the lines as flat row-major cell indexes, a dense payout matrix indexed by
+    [symbol_id, count], and, when the symbol alphabet is small enough, a table with the
+    payout of every possible sequence of symbols along a line. A line win is then one
+    lookup: a tuple of IDs read from the grid (scalar path) or the base-N key of the
+    sequence (vectorized path).
+
+    The rule is the one BaseSlotGame always used: the line symbol is the first one that is
+    neither Wild nor Scatter, Wilds substitute for it, and the run counts from the leftmost reel.
+
+    The table costs 8 bytes per sequence in every process holding an evaluator (each pool or
+    job-server worker), plus a few times that in temporaries while it is built. It is capped at
+    MAX_TABLE_SIZE sequences (512 KB); larger alphabets use the dense path, which evaluates
+    the rule with arrays instead: slower, but with no per-worker table.
+    """
+
+    # Largest number of symbol sequences the line table may hold (9 symbols x 5 reels = 59,049)
+    MAX_TABLE_SIZE = 1 << 16
+
+    def __init__(self, lines, payouts, symbols, columns):
+        """
+        Args:
+            lines (list): Row index per reel for every payline.
+            payouts (dict): {symbol: [pay3, pay4, pay5, ...]} from the Paytable.
+            symbols (SymbolRegistry): Symbol IDs and flags.
+            columns (int): Number of reels.
+        """
+        self.symbols = symbols
+        self.columns = columns
+        self.payouts = payouts
+        self.lines = np.array(lines, dtype=np.intp).reshape(-1, columns)
+        self.line_cells = self.lines * columns + np.arange(columns)
+
+        self.is_wild = symbols.mask(SymbolRegistry.WILD)
+        self.is_scatter = symbols.mask(SymbolRegistry.SCATTER)
+
+        # 🔹 Dense payout lookup indexed by [symbol_id, count]; 0 where nothing pays
+        self.pay = np.zeros((len(symbols), columns + 1), dtype=np.float64)
+        for symbol, pays in payouts.items():
+            if symbol not in symbols.ids:
+                continue
+            for index, payout in enumerate(pays):
+                count = index + 3  # 0→3, 1→4, 2→5
+                if count <= columns:
+                    self.pay[symbols.ids[symbol], count] = payout
+
+        # 🔹 Scalar path: one C-level getter per line reading its IDs out of the grid cells
+        self._line_getters = [itemgetter(*cells) for cells in self.line_cells.tolist()]
+
+        # 🔹 Payout of every symbol sequence: dense (vectorized) and as a dict of paying tuples (scalar)
+        n = len(symbols)
+        self.key_powers = n ** np.arange(columns, dtype=np.int64)
+        self.sequence_payouts = None
+        self._paying_sequences = None
+        if n ** columns <= self.MAX_TABLE_SIZE:
+            # uint8 IDs (the registry holds at most 256 symbols) keep the build temporaries small
+            sequences = np.indices((n,) * columns, dtype=np.uint8).reshape(columns, -1)[::-1].T
+            _, _, payout = self.evaluate_line(sequences)
+            self.sequence_payouts = payout
+            self._paying_sequences = {
+                tuple(sequences[key].tolist()): float(payout[key]) for key in np.flatnonzero(payout).tolist()
+            }
+
+    def __repr__(self):
+        table = f"{len(self._paying_sequences):,} paying sequences" if self._paying_sequences is not None else "no table"
+        return f"<LineEvaluator {len(self.lines)} lines, {table}>"
+
+    def __reduce__(self):
+        # Pickles as its inputs: the sequence tables are rebuilt on load instead of shipped
+        return type(self), (self.lines, self.payouts, self.symbols, self.columns)
+
+    # --------------------------------------------------------------
+    def evaluate_line(self, symbols):
+        """
+        Applies the payline rule to an (N, columns) array of symbol IDs read along one line.
+        Returns (first_symbol, count, payout) arrays of length N; payout is 0 where nothing pays.
+        """
+        is_wild = self.is_wild[symbols]
+
+        # First non-Wild and non-Scatter symbol of the line
+        candidates = ~(is_wild | self.is_scatter[symbols])
+        has_first = candidates.any(axis=1)
+        first_symbol = symbols[np.arange(symbols.shape[0]), candidates.argmax(axis=1)]
+
+        # Consecutive matches from the leftmost reel
+        matches = (symbols == first_symbol[:, None]) | is_wild
+        count = np.where(matches.all(axis=1), symbols.shape[1], matches.argmin(axis=1))
+
+        payout = np.where(has_first, self.pay[first_symbol, count], 0.0)
+        return first_symbol, count, payout
+
+    def line_result(self, cells, line_index):
+        """(first_symbol_id, count, payout) of one line on a grid of cells (None as symbol if none qualifies)."""
+        ids = np.array([self._line_getters[line_index](cells)], dtype=np.int64).reshape(1, -1)
+        first_symbol, count, payout = self.evaluate_line(ids)
+        has_first = bool((~(self.is_wild[ids] | self.is_scatter[ids])).any())
+        return (int(first_symbol[0]) if has_first else None), int(count[0]), float(payout[0])
+
+    # --------------------------------------------------------------
+    def line_payouts(self, cells):
+        """Payout (per unit bet) of every line on one grid of cells (flat row-major IDs)."""
+        if self._paying_sequences is None:
+            return [self.line_result(cells, i)[2] for i in range(len(self._line_getters))]
+        get = self._paying_sequences.get
+        return [get(getter(cells), 0.0) for getter in self._line_getters]
+
+    def evaluate(self, cells, bet=1.0):
+        """Total win of one grid of cells; lines are added in order (same float sum as before)."""
+        total_win = 0.0
+        for payout in self.line_payouts(cells):
+            total_win += payout * bet
+        return total_win
+
+    def line_payouts_batch(self, flat_windows):
+        """Per-line payouts of N grids at once: (N, rows * columns) IDs → (N, lines) payouts."""
+        if self.sequence_payouts is None:
+            return np.stack([self.evaluate_line(flat_windows[:, cells])[2] for cells in self.line_cells], axis=1)
+        keys = flat_windows[:, self.line_cells].astype(np.int64) @ self.key_powers
+        return self.sequence_payouts[keys]
@@ -0,0 +1,71 @@
+from bisect import bisect_left
+import numpy as np
+from src.freeprngLib import pcg
+
+
+class DiscreteSampler:
+    """
+    Compiled sampler for a discrete distribution given in percent (0–100).
+    Built once at config load: keeps the cumulative boundaries as a list (scalar draws
+    with bisect) and as a NumPy array (vectorized draws with searchsorted).
+
+    A draw maps a PCG float r in [0, 100) to the first entry whose cumulative
+    probability is >= r, the same rule the old running-sum walk used.
+    """
+
+    def __init__(self, values, probabilities, name="distribution", tolerance=1e-6):
+        """
+        Args:
+            values (list): Outcomes, in table order.
+            probabilities (list): Probability of each outcome, in percent.
+            name (str): Table name used in error messages.
+            tolerance (float): Allowed deviation of the total from 100%.
+        """
+        self.name = name
+        self.values = list(values)
+        if not self.values or len(self.values) != len(probabilities):
+            raise ValueError(f"❌ {name}: expected one probability per value, got {len(self.values)} values and {len(probabilities)} probabilities")
+
+        probabilities = np.asarray(probabilities, dtype=np.float64)
+        if np.any(probabilities < 0):
+            raise ValueError(f"❌ {name}: negative probabilities are not allowed")
+
+        total = float(probabilities.sum())
+        if abs(total - 100.0) > tolerance:
+            raise ValueError(f"❌ {name}: probabilities sum to {total}%, expected 100%")
+
+        # Sequential running sum (same float boundaries as the old dict walk).
+        # The last boundary is closed at 100 so rounding gaps can never fall through.
+        self.cumulative = np.cumsum(probabilities)
+        self.cumulative[-1] = 100.0
+        self._cumulative_list = self.cumulative.tolist()
+
+        # Effective probabilities (fractions) after closing the rounding gap
+        self.probabilities = np.diff(self.cumulative, prepend=0.0) / 100.0
+        self.value_array = np.array(self.values)
+
+    def __repr__(self):
+        return f"<DiscreteSampler {self.name}: {len(self.values)} outcomes>"
+
+    # --------------------------------------------------------------
+    def index_of(self, rand_value):
+        """Return the outcome index for a float in [0, 100)."""
+        return bisect_left(self._cumulative_list, rand_value)
+
+    def draw(self):
+        """Draw one outcome (a single PCG call)."""
+        return self.values[self.index_of(pcg.get_float_between(0.0, 100.0))]
+
+    def indices_for(self, rand_values):
+        """Return the outcome indexes for an array of floats in [0, 100)."""
+        return np.searchsorted(self.cumulative, rand_values, side="left")
+
+    def draw_indices(self, n):
+        """Draw n outcome indexes with a single bulk PCG fill."""
+        rand_values = np.empty(n, dtype=np.float64)
+        pcg.fill_float_between(rand_values, 0.0, 100.0)
+        return self.indices_for(rand_values)
+
+    def draw_values(self, n):
+        """Draw n outcomes as a NumPy array."""
+        return self.value_array[self.draw_indices(n)]
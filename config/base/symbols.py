@@ -0,0 +1,118 @@
+from array import array
+import numpy as np
+
+
+class SymbolRegistry:
+    """
+    Compact integer IDs for the symbols (or bonus elements) of a game, built once at config load.
+    Every ID carries flag bits describing its role, so hot paths count and match symbols
+    with integer / bitmask operations instead of comparing lowercased strings.
+
+    Grids are stored as array('B') / NumPy uint8 buffers of IDs (row-major).
+    """
+
+    WILD = 1
+    SCATTER = 2
+    CHEST = 4
+    CARD_FRONT = 8
+    BONUS = 16
+
+    def __init__(self, names=()):
+        self.names = []
+        self.ids = {}
+        self.flags = []
+        self._tables = {}
+        for name in names:
+            self.register(name)
+
+    def __repr__(self):
+        return f"<SymbolRegistry {len(self.names)} symbols>"
+
+    def __len__(self):
+        return len(self.names)
+
+    @classmethod
+    def for_base(cls, strips, paytable=None, wild="Wild", scatter="Scatter"):
+        """Registry of the base game: reel symbols, then paytable symbols, then Wild and Scatter."""
+        registry = cls()
+        for reel in strips.reels:
+            for symbol in reel:
+                registry.register(symbol)
+        for symbol in (paytable.names if paytable else ()):
+            registry.register(symbol)
+        registry.register(wild)
+        registry.register(scatter)
+        return registry
+
+    # --------------------------------------------------------------
+    @classmethod
+    def flags_for(cls, name):
+        """Flag bits of a symbol name (same matching rules the string checks used)."""
+        name = str(name).strip().lower()
+        flags = 0
+        if name == "wild":
+            flags |= cls.WILD
+        if name == "scatter":
+            flags |= cls.SCATTER
+        if "chest" in name:
+            flags |= cls.CHEST
+        if "card front" in name:
+            flags |= cls.CARD_FRONT
+        if "bonus" in name:
+            flags |= cls.BONUS
+        return flags
+
+    def register(self, name):
+        """Returns the ID of a symbol, assigning the next free one on first sight."""
+        symbol_id = self.ids.get(name)
+        if symbol_id is None:
+            if len(self.names) >= 256:
+                raise ValueError("❌ SymbolRegistry: more than 256 symbols do not fit in a uint8 grid")
+            symbol_id = len(self.names)
+            self.ids[name] = symbol_id
+            self.names.append(name)
+            self.flags.append(self.flags_for(name))
+            self._tables = {}
+        return symbol_id
+
+    def id_of(self, name):
+        return self.ids[name]
+
+    def name_of(self, symbol_id):
+        return self.names[symbol_id]
+
+    def ids_with(self, flag):
+        """IDs of every symbol carrying the flag."""
+        return [symbol_id for symbol_id, flags in enumerate(self.flags) if flags & flag]
+
+    def mask(self, flag):
+        """Boolean NumPy array indexed by ID: True where the symbol carries the flag."""
+        return np.array([bool(flags & flag) for flags in self.flags], dtype=bool)
+
+    # --------------------------------------------------------------
+    def encode(self, names):
+        """Encodes a sequence of names as an array('B') of IDs."""
+        return array("B", [self.ids[name] for name in names])
+
+    def decode(self, ids, columns=None):
+        """Decodes IDs back to names; with columns, as a list of rows."""
+        names = [self.names[symbol_id] for symbol_id in ids]
+        if columns is None:
+            return names
+        return [names[start:start + columns] for start in range(0, len(names), columns)]
+
+    def _table(self, flag):
+        # bytes.translate table: ID → 1 if the symbol carries the flag, else 0
+        table = self._tables.get(flag)
+        if table is None:
+            table = bytes(1 if i < len(self.flags) and self.flags[i] & flag else 0 for i in range(256))
+            self._tables[flag] = table
+        return table
+
+    def count(self, cells, flag):
+        """Number of cells (array('B') / bytes / uint8 buffer of IDs) whose symbol carries the flag."""
+        return bytes(cells).translate(self._table(flag)).count(1)
+
+    def any(self, cells, flag):
+        """True if any cell's symbol carries the flag."""
+        return 1 in bytes(cells).translate(self._table(flag))
@@ -0,0 +1,138 @@
+import numpy as np
+from src.freeprngLib import pcg
+from config.base.symbols import SymbolRegistry
+
+
+class BonusBatchEngine:
+    """
+    Vectorized bonus engine for 'Mysterious Night'.
+    Advances many bonus rounds in lockstep as NumPy arrays (level, free spins left, collected
+    Bonus symbols, total multiplier): every step fills the grids of all active rounds at once,
+    counts Card Fronts / Chests / Bonus symbols with array reductions and applies the level
+    upgrades with masks. Rounds retire from the batch as their free spins run out.
+
+    Follows exactly the rules of BonusSlotGame, so the results are statistically identical;
+    the random numbers are drawn in a different order, so individual rounds are not.
+    """
+
+    def __init__(self, elementsSpawnrate, multipliersSpawnrate, bonusLevels, gridSize):
+        self.elementsSpawnrate = elementsSpawnrate
+        self.multipliersSpawnrate = multipliersSpawnrate
+        self.bonusLevels = bonusLevels
+        self.grid_rows, self.grid_cols = gridSize
+        self.cells = self.grid_rows * self.grid_cols
+
+        # 🔹 Role of every element ID (spawner order)
+        symbols = elementsSpawnrate.symbols
+        self.is_card_front = symbols.mask(SymbolRegistry.CARD_FRONT)
+        self.is_chest = symbols.mask(SymbolRegistry.CHEST)
+        self.is_bonus = symbols.mask(SymbolRegistry.BONUS)
+        self.multiplier_values = np.asarray(multipliersSpawnrate.sampler.value_array, dtype=np.int64)
+
+        # 🔹 Levels as arrays indexed by position in bonusLevels.levels
+        next_index = bonusLevels.next_index
+        self.level_ids = bonusLevels.level_ids
+        self.level_free_spins = bonusLevels.free_spins
+        self.level_bonus_to_upgrade = bonusLevels.bonus_to_upgrade
+        self.level_next = np.where(next_index >= 0, next_index, np.arange(len(next_index)))
+        self.level_can_upgrade = bonusLevels.upgradeable & (next_index >= 0)
+        # Free spins granted when moving up from each level
+        self.level_extra_free_spins = np.maximum(0, self.level_free_spins[self.level_next] - self.level_free_spins)
+
+    def __repr__(self):
+        return f"<BonusBatchEngine {self.grid_rows}x{self.grid_cols}, {len(self.level_ids)} levels>"
+
+    # --------------------------------------------------------------
+    def level_index_for(self, scatters):
+        """Position of the level a round with `scatters` Scatters starts at (same rule as BonusSlotGame.start), or -1."""
+        return self.bonusLevels.index_for(scatters)
+
+    def play(self, scatters, n, bet=1.0, batch_size=100000):
+        """
+        Plays n bonus rounds started with `scatters` Scatters (an int, or an array with one
+        count per round). Returns a dict of per-round NumPy arrays: "win", "total_multiplier",
+        "spins_played", "cf_count", "spins_with_chest", "multi_sum" and "multi_when_chest"
+        (the same quantities BonusSlotGame exposes after start()).
+
+        Args:
+            scatters (int | array): Scatters that triggered each round.
+            n (int): Number of rounds.
+            bet (float): Bet amount of the triggering spin.
+            batch_size (int): Rounds advanced together (bounds the memory of one step).
+        """
+        scatters = np.broadcast_to(np.asarray(scatters, dtype=np.int64), (n,))
+        lookup = {int(k): self.level_index_for(int(k)) for k in np.unique(scatters)}
+        start_levels = np.array([lookup[int(k)] for k in scatters.tolist()], dtype=np.int64)
+        if bet <= 0:
+            start_levels[:] = -1
+
+        results = {
+            name: np.zeros(n, dtype=np.int64)
+            for name in ("total_multiplier", "spins_played", "cf_count", "spins_with_chest", "multi_sum", "multi_when_chest")
+        }
+        for first in range(0, n, batch_size):
+            last = min(first + batch_size, n)
+            self._play_batch(start_levels[first:last], {name: out[first:last] for name, out in results.items()})
+
+        # Rounds that never started (no level, no free spins or no bet) win nothing; the others at least x1
+        started = results["spins_played"] > 0
+        results["total_multiplier"][started & (results["total_multiplier"] == 0)] = 1
+        results["win"] = np.where(started, bet * results["total_multiplier"], 0.0)
+        return results
+
+    def _play_batch(self, start_levels, out):
+        """Advances one batch of rounds to completion, writing the per-round results into `out` (views)."""
+        level = np.where(start_levels >= 0, start_levels, 0)
+        free_spins = np.where(start_levels >= 0, self.level_free_spins[level], 0)
+        collected = np.zeros(len(level), dtype=np.int64)
+        active = np.flatnonzero(free_spins > 0)
+
+        element_sampler = self.elementsSpawnrate.sampler
+        multiplier_sampler = self.multipliersSpawnrate.sampler
+
+        while active.size:
+            m = active.size
+
+            # --- Spin: fill every active grid with one bulk draw ---
+            rand_values = np.empty(m * self.cells, dtype=np.float64)
+            pcg.fill_float_between(rand_values, 0.0, 100.0)
+            elements = element_sampler.indices_for(rand_values).reshape(m, self.cells)
+
+            card_fronts = self.is_card_front[elements].sum(axis=1)
+            chest_found = self.is_chest[elements].any(axis=1)
+            bonus_count = self.is_bonus[elements].sum(axis=1)
+
+            # One multiplier per Card Front, summed per round
+            total_card_fronts = int(card_fronts.sum())
+            spin_multiplier = np.zeros(m, dtype=np.int64)
+            if total_card_fronts:
+                multiplier_rand = np.empty(total_card_fronts, dtype=np.float64)
+                pcg.fill_float_between(multiplier_rand, 0.0, 100.0)
+                values = self.multiplier_values[multiplier_sampler.indices_for(multiplier_rand)]
+                owners = np.repeat(np.arange(m), card_fronts)
+                spin_multiplier = np.bincount(owners, weights=values, minlength=m).astype(np.int64)
+
+            free_spins[active] -= 1
+
+            # --- Debug counters (same meaning as BonusSlotGame's) ---
+            out["spins_played"][active] += 1
+            out["cf_count"][active] += card_fronts
+            out["multi_sum"][active] += spin_multiplier
+            out["spins_with_chest"][active] += chest_found
+            out["multi_when_chest"][active] += np.where(chest_found, spin_multiplier, 0)
+
+            # --- Evaluate: multiplier only with a Chest, Bonus symbols and level upgrades ---
+            out["total_multiplier"][active] += np.where(chest_found, spin_multiplier, 0)
+            collected[active] += bonus_count
+
+            current = level[active]
+            upgrade = self.level_can_upgrade[current] & (collected[active] >= self.level_bonus_to_upgrade[current])
+            if upgrade.any():
+                upgraded = active[upgrade]
+                previous = current[upgrade]
+                collected[upgraded] -= self.level_bonus_to_upgrade[previous]
+                free_spins[upgraded] += self.level_extra_free_spins[previous]
+                level[upgraded] = self.level_next[previous]
+
+            # Finished rounds retire from the batch
+            active = active[free_spins[active] > 0]
@@ -1,4 +1,6 @@
+import numpy as np
 from src.freeprngLib import pcg
+from config.base.symbols import SymbolRegistry
 
 class BonusSlotGame:
     """
@@ -6,11 +8,20 @@ class BonusSlotGame:
     Handles bonus spawning, multipliers, and level progression.
     """
 
+    __slots__ = (
+        "elementsSpawnrate", "multipliersSpawnrate", "bonusLevels", "symbols",
+        "current_level", "grid", "grid_rows", "grid_cols", "free_spins", "bonus_symbols_collected", "total_multiplier",
+        "spins_played", "debug_cf_count", "debug_spins_with_chest", "debug_multi_sum", "debug_multi_when_chest",
+    )
+
     def __init__(self, elementsSpawnrate, multipliersSpawnrate, bonusLevels):
         self.elementsSpawnrate = elementsSpawnrate          
         self.multipliersSpawnrate = multipliersSpawnrate    
         self.bonusLevels = bonusLevels                      
 
+        # Element IDs (spawner order) with their role flags: the bonus grid holds these IDs
+        self.symbols = elementsSpawnrate.symbols
+
         self.current_level = None
         self.grid = None
         self.grid_rows = 0
@@ -27,15 +38,13 @@ class BonusSlotGame:
 
 
     # --------------------------------------------------------------
-    def start(self, scatters, bet, gridSize):
+    def start(self, scatters, bet, gridSize, debug=False):
         """
         Starts the bonus, executes spins, and collects statistics.
+        With debug, prints every bonus spin's grid, multipliers and level progress.
         """
         # Assign the level based on the number of scatters
-        self.current_level = None
-        for level in self.bonusLevels.levels:
-            if scatters >= level.scatters_required:
-                self.current_level = level
+        self.current_level = self.bonusLevels.level_for(scatters)
 
         if self.current_level is None or bet <= 0:
             return 0.0
@@ -48,7 +57,7 @@ class BonusSlotGame:
         self.bonus_symbols_collected = 0
         self.total_multiplier = 0
         self.grid_rows, self.grid_cols = gridSize
-        self.grid = [["" for _ in range(self.grid_cols)] for _ in range(self.grid_rows)]
+        self.grid = np.zeros((self.grid_rows, self.grid_cols), dtype=np.uint8)
 
         # Reset counters for the GameManager
         self.spins_played = 0
@@ -57,14 +66,21 @@ class BonusSlotGame:
         self.debug_multi_sum = 0
         self.debug_multi_when_chest = 0
 
+        if debug:
+            print(f"\n🎁 Bonus triggered with {scatters} Scatters → Level {self.current_level.level_id}, "
+                  f"{self.free_spins} free spins")
+
         # Main bonus loop
         while self.free_spins > 0:
             self.spins_played += 1
-            spin_multiplier = self.spin(debug=False)
+            if debug:
+                print(f"\n🔄 Bonus spin {self.spins_played} (Level {self.current_level.level_id}, "
+                      f"{self.free_spins - 1} free spins left)")
+            spin_multiplier = self.spin(debug=debug)
 
             # Count relevant symbols
-            cf_this_spin = sum(1 for row in self.grid for cell in row if "card front" in str(cell).lower())
-            chest_found = any("chest" in str(cell).lower() for row in self.grid for cell in row)
+            cf_this_spin = self.symbols.count(self.grid, SymbolRegistry.CARD_FRONT)
+            chest_found = self.symbols.any(self.grid, SymbolRegistry.CHEST)
 
             # Update debug counters for GameManager
             self.debug_cf_count += cf_this_spin
@@ -73,7 +89,7 @@ class BonusSlotGame:
                 self.debug_spins_with_chest += 1
                 self.debug_multi_when_chest += spin_multiplier
 
-            self.evaluate_spin(spin_multiplier)
+            self.evaluate_spin(spin_multiplier, debug=debug)
 
         # If no multiplier accumulated, assign x1
         if self.total_multiplier == 0:
@@ -81,60 +97,68 @@ class BonusSlotGame:
 
         # Final win calculation
         total_win = bet * self.total_multiplier
+        if debug:
+            print(f"\n🏆 Bonus Win: x{self.total_multiplier} → {total_win:.2f} "
+                  f"({self.spins_played} spins, final Level {self.current_level.level_id})\n")
         return total_win
 
 
     # --------------------------------------------------------------
     def spin(self, debug=False):
-        """Generates the grid and calculates the multiplier for a bonus spin (using PCG RNG)."""
+        """
+        Generates the grid and calculates the multiplier for a bonus spin (using PCG RNG).
+        The whole grid is filled in one batched draw: one value per cell for the element,
+        followed by one value per Card Front for its multiplier.
+        """
+        cells = self.grid_rows * self.grid_cols
+
+        # Draw ahead for the worst case (every cell a Card Front); only the values used are consumed
+        rand_values = pcg.peek_float_between(2 * cells, 0.0, 100.0)
+
+        # Select every cell's element based on spawn probabilities
+        element_ids = self.elementsSpawnrate.sampler.indices_for(rand_values[:cells]).astype(np.uint8)
+
+        # Each "Card Front" adds a multiplier
+        card_fronts = self.symbols.count(element_ids, SymbolRegistry.CARD_FRONT)
         current_spin_multiplier = 0
-        grid = []
-
-        # RNG seed initialization can be done globally (handled outside this function)        
-
-        for _ in range(self.grid_rows):
-            fila = []
-            for _ in range(self.grid_cols):
-                # --- Use native PCG RNG instead of Python's random ---
-                rand_value = pcg.get_float_between(0.0, 100.0)
-                selected_element = None
-                cumulative = 0
-
-                # Select element based on spawn probabilities
-                for element, prob in self.elementsSpawnrate.probabilities.items():
-                    cumulative += prob
-                    if rand_value <= cumulative:
-                        selected_element = element
-                        break
-
-                # If "Card Front", add a multiplier
-                if selected_element and selected_element.lower() == "card front":
-                    rand_multi = pcg.get_float_between(0.0, 100.0)
-                    cumulative_multi = 0
-                    for multi, prob in self.multipliersSpawnrate.multipliers.items():
-                        cumulative_multi += prob
-                        if rand_multi <= cumulative_multi:
-                            current_spin_multiplier += multi
-                            break
-
-                fila.append(selected_element or "Empty")
-            grid.append(fila)
-
-        self.grid = grid
+        multipliers = []
+        if card_fronts:
+            multiplier_sampler = self.multipliersSpawnrate.sampler
+            multiplier_indices = multiplier_sampler.indices_for(rand_values[cells:cells + card_fronts])
+            multipliers = multiplier_sampler.value_array[multiplier_indices]
+            current_spin_multiplier = int(multipliers.sum())
+
+        pcg.skip(cells + card_fronts)
+
+        self.grid = element_ids.reshape(self.grid_rows, self.grid_cols)
         self.free_spins -= 1
+
+        if debug:
+            print("🎯 Bonus grid:")
+            rows = self.symbols.decode(element_ids.tolist(), self.grid_cols)
+            col_widths = [max(len(row[col]) for row in rows) for col in range(self.grid_cols)]
+            for row in rows:
+                print(" | ".join(f"{name:<{col_widths[i]}}" for i, name in enumerate(row)))
+            if card_fronts:
+                print(f"🃏 Card Front multipliers: {' + '.join(f'x{int(m)}' for m in multipliers)} = x{current_spin_multiplier}")
+
         return current_spin_multiplier
 
 
 
     # --------------------------------------------------------------
-    def evaluate_spin(self, multiplier):
+    def evaluate_spin(self, multiplier, debug=False):
         """Stores the multiplier if a chest is found and manages possible level upgrades."""
-        chest_found = any("chest" in (cell or "").lower() for row in self.grid for cell in row)
+        chest_found = self.symbols.any(self.grid, SymbolRegistry.CHEST)
+        if debug and multiplier:
+            print(f"🧰 Chest found → x{multiplier} kept" if chest_found else f"❌ No chest → x{multiplier} lost")
         if not chest_found:
             multiplier = 0
 
-        bonus_count = sum(1 for row in self.grid for cell in row if "bonus" in (cell or "").lower())
+        bonus_count = self.symbols.count(self.grid, SymbolRegistry.BONUS)
         self.bonus_symbols_collected += bonus_count
+        if debug and self.current_level.upgrade_possible:
+            print(f"⭐ Bonus symbols: +{bonus_count} → {self.bonus_symbols_collected}/{self.current_level.bonus_to_upgrade}")
 
         # Level-up management
         if self.current_level.upgrade_possible and \
@@ -147,8 +171,12 @@ class BonusSlotGame:
                 extra_fs = max(0, next_level.start_free_spins - previous_level.start_free_spins)
                 self.free_spins += extra_fs
                 self.bonus_symbols_collected = overflow
+                if debug:
+                    print(f"⬆️ Level up: {previous_level.level_id} → {next_level.level_id} (+{extra_fs} free spins)")
 
         self.total_multiplier += multiplier
+        if debug:
+            print(f"✖️ Total multiplier: x{self.total_multiplier}")
         return self.total_multiplier
 
 
@@ -0,0 +1,272 @@
+import ctypes
+import hashlib
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+import numpy as np
+from src.freeprngLib import pcg
+from src.simulation.counters import SimulationCounters
+from src.simulation.statistics import RunningStats, LogHistogram, TopWins
+from config.base.symbols import SymbolRegistry
+
+logger = logging.getLogger(__name__)
+
+SOURCE = Path(__file__).resolve().parent / "sim_kernel.c"
+CFLAGS = ["-O2", "-shared", "-fPIC", "-ffp-contract=off"]
+# The library name carries a hash of the source and flags, so a stale build is never loaded
+_DIGEST = hashlib.sha256(SOURCE.read_bytes() + " ".join(CFLAGS).encode()).hexdigest()[:12]
+LIBRARY = SOURCE.with_name(f"libsim_kernel-{_DIGEST}.so")
+BUILD_LOCK = SOURCE.with_name(".libsim_kernel.lock")
+
+_i64p = ctypes.POINTER(ctypes.c_int64)
+_u8p = ctypes.POINTER(ctypes.c_uint8)
+_f64p = ctypes.POINTER(ctypes.c_double)
+
+
+class _Welford(ctypes.Structure):
+    _fields_ = [("count", ctypes.c_int64), ("mean", ctypes.c_double), ("m2", ctypes.c_double)]
+
+
+class _HistogramLayout(ctypes.Structure):
+    _fields_ = [
+        ("min_value", ctypes.c_double),
+        ("log_min", ctypes.c_double),
+        ("buckets_per_decade", ctypes.c_int64),
+        ("log_buckets", ctypes.c_int64),
+    ]
+
+
+class _Game(ctypes.Structure):
+    _fields_ = [
+        ("rows", ctypes.c_int64), ("columns", ctypes.c_int64),
+        ("reel_lengths", _i64p), ("window_offsets", _i64p), ("windows", _u8p),
+        ("lines", ctypes.c_int64), ("line_cells", _i64p),
+        ("symbols", ctypes.c_int64), ("pay", _f64p), ("is_wild", _u8p), ("is_scatter", _u8p),
+        ("trigger_scatters", ctypes.c_int64),
+        ("elements", ctypes.c_int64), ("element_cumulative", _f64p),
+        ("is_card_front", _u8p), ("is_chest", _u8p), ("is_bonus", _u8p),
+        ("multipliers", ctypes.c_int64), ("multiplier_cumulative", _f64p), ("multiplier_values", _i64p),
+        ("levels", ctypes.c_int64), ("level_scatters", _i64p), ("level_free_spins", _i64p),
+        ("level_bonus_to_upgrade", _i64p), ("level_upgradeable", _i64p), ("level_next", _i64p),
+        ("histogram", _HistogramLayout), ("histogram_size", ctypes.c_int64), ("top_size", ctypes.c_int64),
+    ]
+
+
+class _Counters(ctypes.Structure):
+    _fields_ = [
+        (name, ctypes.c_int64) for name in (
+            "spins", "bonus_triggers", "bonus_total_spins", "total_cf_count", "total_chest_spins",
+            "total_bonus_multiplier_sum", "total_bonus_multi_when_chest", "total_bonus_multiplier_final",
+            "base_hits", "bonus_only_hits",
+        )
+    ] + [
+        (name, ctypes.c_double) for name in ("total_bet", "base_win_total", "bonus_win_total", "base_bonus_cross_sum")
+    ] + [
+        ("base_win_stats", _Welford), ("bonus_win_stats", _Welford),
+        ("top_length", ctypes.c_int64), ("last_total_multiplier", ctypes.c_int64),
+    ]
+
+
+class _Distribution(ctypes.Structure):
+    _fields_ = [
+        ("win_counts", _i64p), ("win_sums", _f64p),
+        ("top_wins", _f64p), ("top_spins", _i64p),
+        ("level_stats", ctypes.POINTER(_Welford)),
+        ("level_counts", _i64p), ("level_sums", _f64p),
+    ]
+
+
+@contextmanager
+def _build_lock():
+    """Exclusive lock serializing builds between processes (parallel or job-server workers)."""
+    try:
+        import fcntl
+    except ImportError:  # No flock (Windows): builds are still atomic thanks to the rename
+        yield
+        return
+    with open(BUILD_LOCK, "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def build(force=False):
+    """
+    Compiles sim_kernel.c into LIBRARY next to it (only when that build of the source does not
+    exist yet) and returns the library path. Needs a C compiler (cc / gcc / clang).
+    The compiler writes a temporary file that is renamed onto LIBRARY under a file lock, so
+    concurrent workers never load a half-written library.
+    """
+    if not force and LIBRARY.exists():
+        return LIBRARY
+
+    compiler = next((c for c in ("cc", "gcc", "clang") if shutil.which(c)), None)
+    if compiler is None:
+        raise RuntimeError("❌ Native kernel: no C compiler found (cc, gcc or clang)")
+
+    with _build_lock():
+        if not force and LIBRARY.exists():
+            return LIBRARY  # Built by another process while this one waited
+
+        fd, temporary = tempfile.mkstemp(prefix=".libsim_kernel-", suffix=".so", dir=LIBRARY.parent)
+        os.close(fd)
+        try:
+            command = [compiler, *CFLAGS, "-o", temporary, str(SOURCE), "-lm"]
+            result = subprocess.run(command, capture_output=True, text=True)
+            if result.returncode != 0:
+                raise RuntimeError(f"❌ Native kernel build failed:\n{result.stderr}")
+            os.replace(temporary, LIBRARY)
+        finally:
+            if os.path.exists(temporary):
+                os.unlink(temporary)
+
+        # Builds of older sources (processes that loaded them keep their mapping)
+        for stale in LIBRARY.parent.glob("libsim_kernel*.so"):
+            if stale != LIBRARY:
+                stale.unlink(missing_ok=True)
+
+    logger.info(f"Native kernel built: {LIBRARY.name} ✅")
+    return LIBRARY
+
+
+def _ptr(array, pointer_type):
+    return array.ctypes.data_as(pointer_type)
+
+
+class NativeKernel:
+    """
+    Compiled simulation kernel for 'Mysterious Night': plays base spins and their bonus rounds
+    in C from flat buffers (integer-encoded reel windows, payline cells, payout matrix, spawn
+    tables and levels) and returns the same SimulationCounters as GameManager.run_spins with
+    the scalar engine, which stays the reference. The kernel draws from its own copy of the
+    PCG state and hands it back, so Python and native runs can be interleaved.
+    """
+
+    def __init__(self, game, bonus, trigger_scatters):
+        """
+        Args:
+            game (BaseSlotGame): Base game (grid, strips, evaluator, symbol registry).
+            bonus (BonusSlotGame): Bonus game (spawners and levels).
+            trigger_scatters (int): Scatters that trigger the bonus (GameManager.TRIGGER_SCATTERS).
+        """
+        self.lib = ctypes.CDLL(str(build()))
+        self.lib.run_spins.argtypes = [
+            ctypes.POINTER(_Game), ctypes.POINTER(ctypes.c_uint64), ctypes.c_int64, ctypes.c_double,
+            ctypes.POINTER(_Counters), ctypes.POINTER(_Distribution),
+        ]
+        self.lib.run_spins.restype = ctypes.c_int
+        self.bonus = bonus
+
+        strips, evaluator, registry = game.strips, game.evaluator, game.symbols
+        rows, columns = game.grid.rows, game.grid.columns
+        spawner, multipliers, levels = bonus.elementsSpawnrate, bonus.multipliersSpawnrate, bonus.bonusLevels
+
+        # 🔹 Flat buffers (kept on the instance: the C struct only holds pointers to them)
+        tables = [np.frombuffer(table, dtype=np.uint8) for table in strips.window_table]
+        self._buffers = buffers = {
+            "reel_lengths": np.array([len(t) // rows for t in tables], dtype=np.int64),
+            "window_offsets": np.cumsum([0] + [len(t) for t in tables[:-1]]).astype(np.int64),
+            "windows": np.ascontiguousarray(np.concatenate(tables)),
+            "line_cells": np.ascontiguousarray(evaluator.line_cells, dtype=np.int64),
+            "pay": np.ascontiguousarray(evaluator.pay, dtype=np.float64),
+            "is_wild": registry.mask(SymbolRegistry.WILD).astype(np.uint8),
+            "is_scatter": registry.mask(SymbolRegistry.SCATTER).astype(np.uint8),
+            "element_cumulative": np.ascontiguousarray(spawner.sampler.cumulative, dtype=np.float64),
+            "is_card_front": spawner.symbols.mask(SymbolRegistry.CARD_FRONT).astype(np.uint8),
+            "is_chest": spawner.symbols.mask(SymbolRegistry.CHEST).astype(np.uint8),
+            "is_bonus": spawner.symbols.mask(SymbolRegistry.BONUS).astype(np.uint8),
+            "multiplier_cumulative": np.ascontiguousarray(multipliers.sampler.cumulative, dtype=np.float64),
+            "multiplier_values": np.asarray(multipliers.sampler.value_array, dtype=np.int64),
+        }
+        self.level_ids = levels.level_ids.tolist()
+        buffers.update({
+            "level_scatters": np.ascontiguousarray(levels.scatters_required, dtype=np.int64),
+            "level_free_spins": np.ascontiguousarray(levels.free_spins, dtype=np.int64),
+            "level_bonus_to_upgrade": np.ascontiguousarray(levels.bonus_to_upgrade, dtype=np.int64),
+            "level_upgradeable": levels.upgradeable.astype(np.int64),
+            "level_next": np.ascontiguousarray(levels.next_index, dtype=np.int64),
+        })
+
+        layout = LogHistogram()
+        self.histogram_size = len(layout.counts)
+        self.game = _Game(
+            rows=rows, columns=columns,
+            reel_lengths=_ptr(buffers["reel_lengths"], _i64p),
+            window_offsets=_ptr(buffers["window_offsets"], _i64p),
+            windows=_ptr(buffers["windows"], _u8p),
+            lines=len(evaluator.line_cells), line_cells=_ptr(buffers["line_cells"], _i64p),
+            symbols=len(registry), pay=_ptr(buffers["pay"], _f64p),
+            is_wild=_ptr(buffers["is_wild"], _u8p), is_scatter=_ptr(buffers["is_scatter"], _u8p),
+            trigger_scatters=int(trigger_scatters),
+            elements=len(buffers["element_cumulative"]),
+            element_cumulative=_ptr(buffers["element_cumulative"], _f64p),
+            is_card_front=_ptr(buffers["is_card_front"], _u8p),
+            is_chest=_ptr(buffers["is_chest"], _u8p),
+            is_bonus=_ptr(buffers["is_bonus"], _u8p),
+            multipliers=len(buffers["multiplier_values"]),
+            multiplier_cumulative=_ptr(buffers["multiplier_cumulative"], _f64p),
+            multiplier_values=_ptr(buffers["multiplier_values"], _i64p),
+            levels=len(self.level_ids),
+            level_scatters=_ptr(buffers["level_scatters"], _i64p),
+            level_free_spins=_ptr(buffers["level_free_spins"], _i64p),
+            level_bonus_to_upgrade=_ptr(buffers["level_bonus_to_upgrade"], _i64p),
+            level_upgradeable=_ptr(buffers["level_upgradeable"], _i64p),
+            level_next=_ptr(buffers["level_next"], _i64p),
+            histogram=_HistogramLayout(layout.min_value, float(layout._log_min), layout.buckets_per_decade, layout.log_buckets),
+            histogram_size=self.histogram_size,
+            top_size=SimulationCounters.TOP_WINS,
+        )
+
+    def __repr__(self):
+        return f"<NativeKernel {LIBRARY.name}>"
+
+    # --------------------------------------------------------------
+    def run_spins(self, total_spins, bet=1.0):
+        """
+        Plays total_spins spins from the current PCG state (which it advances) and returns
+        a new SimulationCounters, identical to GameManager.run_spins(total_spins, bet).
+        """
+        size, levels, top = self.histogram_size, len(self.level_ids), SimulationCounters.TOP_WINS
+
+        win_counts = np.zeros(size, dtype=np.int64)
+        win_sums = np.zeros(size, dtype=np.float64)
+        top_wins = np.zeros(top, dtype=np.float64)
+        top_spins = np.zeros(top, dtype=np.int64)
+        level_stats = (_Welford * max(1, levels))()
+        level_counts = np.zeros(max(1, levels) * size, dtype=np.int64)
+        level_sums = np.zeros(max(1, levels) * size, dtype=np.float64)
+        distribution = _Distribution(
+            _ptr(win_counts, _i64p), _ptr(win_sums, _f64p), _ptr(top_wins, _f64p), _ptr(top_spins, _i64p),
+            level_stats, _ptr(level_counts, _i64p), _ptr(level_sums, _f64p),
+        )
+
+        counters = _Counters()
+        counters.last_total_multiplier = int(getattr(self.bonus, "total_multiplier", 0) or 0)
+        state = ctypes.c_uint64(pcg.get_state())
+        if self.lib.run_spins(ctypes.byref(self.game), ctypes.byref(state), int(total_spins), float(bet),
+                              ctypes.byref(counters), ctypes.byref(distribution)) != 0:
+            raise ValueError("❌ Native kernel: grid larger than 256 cells")
+        pcg.set_state(state.value)
+        self.bonus.total_multiplier = counters.last_total_multiplier
+
+        values = {name: getattr(counters, name) for name in SimulationCounters.FIELDS}
+        values["base_win_stats"] = RunningStats(counters.base_win_stats.count, counters.base_win_stats.mean, counters.base_win_stats.m2)
+        values["bonus_win_stats"] = RunningStats(counters.bonus_win_stats.count, counters.bonus_win_stats.mean, counters.bonus_win_stats.m2)
+        result = SimulationCounters(**values)
+        result.win_histogram = LogHistogram(counts=win_counts, sums=win_sums)
+        result.top_wins = TopWins(top, [[win, result.stream, spin] for win, spin in zip(top_wins[:counters.top_length].tolist(), top_spins[:counters.top_length].tolist())])
+        for index, level_id in enumerate(self.level_ids):
+            stats = level_stats[index]
+            if stats.count:
+                result.bonus_levels[level_id] = {
+                    "stats": RunningStats(stats.count, stats.mean, stats.m2),
+                    "histogram": LogHistogram(counts=level_counts[index * size:(index + 1) * size],
+                                              sums=level_sums[index * size:(index + 1) * size]),
+                }
+        return result
@@ -1,71 +1,138 @@
-import pandas as pd
+from array import array
+import logging
 from pathlib import Path
+import numpy as np
 from config.base.data_loader import load_game_tables
+from config.base import config_cache
+from config.base.frozen import Frozen, readonly
+from config.base.sampler import DiscreteSampler
+from config.base.symbols import SymbolRegistry
 
+logger = logging.getLogger(__name__)
 
-# ---- Bonus configuration data classes ----
 
-class BonusSpawner:
-    """Represents the probabilities of spawning different bonus elements."""
+# ---- Bonus configuration data classes (slotted and read-only, see config/base/frozen.py) ----
+
+class BonusSpawner(Frozen):
+    """
+    Represents the probabilities of spawning different bonus elements, as the element
+    names and a read-only array of their probabilities (%), in table order.
+    """
+
+    __slots__ = ("names", "percentages", "sampler", "symbols")
+
     def __init__(self, df):
-        self.data = df
-        self.probabilities = {
-            col: round(float(df[col].iloc[0]) * 100, 2)
+        self._build([
+            (col, round(float(df[col][0]) * 100, 2))
             for col in df.columns
             if str(col).strip().lower() != "columna 1"
-        }
+        ])
+
+    def _build(self, probabilities):
+        probabilities = list(probabilities)
+        names = tuple(name for name, _ in probabilities)
+        percentages = readonly(np.array([prob for _, prob in probabilities], dtype=np.float64))
+        # Compiled sampler (validates that the probabilities add up to 100%)
+        sampler = DiscreteSampler(names, percentages, name="Bonus_Spawner")
+        # Element IDs follow the sampler order, so a drawn index is directly the element ID
+        return self._set(names=names, percentages=percentages, sampler=sampler, symbols=SymbolRegistry(sampler.values))
 
     def __repr__(self):
-        return f"<BonusSpawner {len(self.probabilities)} entries>"
+        return f"<BonusSpawner {len(self.names)} entries>"
+
+    @property
+    def probabilities(self):
+        """{element: probability%} as a new dictionary."""
+        return dict(zip(self.names, self.percentages.tolist()))
+
+    def to_dict(self):
+        """Return the compiled probabilities (for the config cache)."""
+        return {"probabilities": list(zip(self.names, self.percentages.tolist()))}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a BonusSpawner from to_dict() output, without reading the workbook."""
+        return cls.__new__(cls)._build({name: float(prob) for name, prob in data["probabilities"]}.items())
 
     def get_probability(self, name):
         """Return the probability for a specific bonus type (%)."""
-        return self.probabilities.get(name, 0.0)
+        element_id = self.symbols.ids.get(name)
+        return float(self.percentages[element_id]) if element_id is not None else 0.0
 
 
-class CardMultiplierSpawner:
+class CardMultiplierSpawner(Frozen):
     """
-    Represents the card multiplier probabilities as a dictionary:
-        { multiplier: probability%, ... }
+    Represents the card multiplier probabilities as read-only arrays of the multiplier
+    values and their probabilities (%), in table order.
     """
-    def __init__(self, df):
-        self.data = df
 
+    __slots__ = ("values", "percentages", "sampler")
+
+    def __init__(self, df):
         # Normalize column names
-        df.columns = [str(c).strip().lower() for c in df.columns]
+        df.rename_columns(lambda c: str(c).strip().lower())
 
         # Verify that the required columns exist
         if "card multiplier" not in df.columns or "probability" not in df.columns:
             raise KeyError(f"❌ Expected columns 'Card Multiplier' and 'Probability' not found in {list(df.columns)}")
 
-        # Create the dictionary {multiplier: probability%}, multiplying by 100
-        self.multipliers = {
+        # Pairs (multiplier, probability%), multiplying by 100 (a repeated multiplier keeps its last probability)
+        multipliers = {
             int(row["card multiplier"]): float(row["probability"]) * 100
-            for _, row in df.iterrows()
-            if not pd.isna(row["card multiplier"])
+            for row in df.rows()
+            if row["card multiplier"] is not None
         }
+        self._build(multipliers.items())
+
+    def _build(self, multipliers):
+        multipliers = list(multipliers)
+        values = readonly(np.array([multiplier for multiplier, _ in multipliers], dtype=np.int64))
+        percentages = readonly(np.array([prob for _, prob in multipliers], dtype=np.float64))
+        # Compiled sampler (validates that the probabilities add up to 100%)
+        sampler = DiscreteSampler(values.tolist(), percentages, name="Card_Multiplier_Spawner")
+        return self._set(values=values, percentages=percentages, sampler=sampler)
 
     def __repr__(self):
-        return f"<CardMultiplierSpawner {len(self.multipliers)} entries>"
+        return f"<CardMultiplierSpawner {len(self.values)} entries>"
+
+    @property
+    def multipliers(self):
+        """{multiplier: probability%} as a new dictionary."""
+        return dict(zip(self.values.tolist(), self.percentages.tolist()))
+
+    def to_dict(self):
+        """Return the compiled multipliers (for the config cache)."""
+        return {"multipliers": list(zip(self.values.tolist(), self.percentages.tolist()))}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a CardMultiplierSpawner from to_dict() output, without reading the workbook."""
+        return cls.__new__(cls)._build({int(multiplier): float(prob) for multiplier, prob in data["multipliers"]}.items())
 
     def get_probability(self, multiplier):
         """Return the probability % for a given multiplier value."""
-        return self.multipliers.get(multiplier, 0.0)
+        matches = np.flatnonzero(self.values == multiplier)
+        return float(self.percentages[matches[0]]) if matches.size else 0.0
 
 
 
 # ---- Bonus Levels ----
 
-class Level:
+class Level(Frozen):
     """
     Represents one bonus level in the bonus game.
     """
+
+    __slots__ = ("level_id", "scatters_required", "start_free_spins", "upgrade_possible", "bonus_to_upgrade")
+
     def __init__(self, level_id, scatters, free_spins, upgrade_required):
-        self.level_id = int(level_id)
-        self.scatters_required = int(scatters)
-        self.start_free_spins = int(free_spins)
-        self.upgrade_possible = upgrade_required > 0
-        self.bonus_to_upgrade = int(upgrade_required)
+        self._set(
+            level_id=int(level_id),
+            scatters_required=int(scatters),
+            start_free_spins=int(free_spins),
+            upgrade_possible=upgrade_required > 0,
+            bonus_to_upgrade=int(upgrade_required),
+        )
 
     def __repr__(self):
         return (f"<Level {self.level_id}: {self.start_free_spins} FS, "
@@ -73,36 +140,101 @@ class Level:
                 f"{'upgradeable' if self.upgrade_possible else 'final'}>")
 
 
-class BonusLevels:
+class BonusLevels(Frozen):
     """
-    Container class for all bonus levels, ordered by level ID.
+    Container class for all bonus levels, in table order, with their fields as read-only
+    arrays indexed by position and array lookups by level ID and by Scatter count.
     """
-    def __init__(self, df):
-        self.data = df
-        df.columns = [str(c).strip().lower() for c in df.columns]
 
-        self.levels = []
-        for _, row in df.iterrows():
-            lvl = Level(
+    __slots__ = (
+        "levels", "level_ids", "scatters_required", "free_spins", "bonus_to_upgrade", "upgradeable",
+        "next_index", "_first_id", "_by_id", "_by_scatters",
+    )
+
+    def __init__(self, df):
+        df.rename_columns(lambda c: str(c).strip().lower())
+        self._build(
+            Level(
                 level_id=row["level"],
                 scatters=row["scatters"],
                 free_spins=row["start free spins"],
                 upgrade_required=row["bonus to upgrade"]
             )
-            self.levels.append(lvl)
+            for row in df.rows()
+        )
+
+    def _build(self, levels):
+        levels = tuple(levels)
+        level_ids = [lvl.level_id for lvl in levels]
+        required = [lvl.scatters_required for lvl in levels]
+
+        # Position of every level ID (offset by the smallest one); -1 where no level has that ID
+        first_id = min(level_ids, default=0)
+        by_id = array("q", [-1]) * (max(level_ids, default=-1) - first_id + 1)
+        for position in reversed(range(len(levels))):
+            by_id[level_ids[position] - first_id] = position  # The first level with an ID wins, as the old scan
+
+        # Level a round starts at for every Scatter count up to the largest requirement:
+        # the last one in table order whose requirement is met (counts above it behave like it)
+        by_scatters = array("q", [-1]) * (max(required, default=-1) + 1)
+        for scatters in range(len(by_scatters)):
+            for position, needed in enumerate(required):
+                if scatters >= needed:
+                    by_scatters[scatters] = position
+
+        self._set(levels=levels, _first_id=first_id, _by_id=by_id, _by_scatters=by_scatters)
+        return self._set(
+            level_ids=readonly(np.array(level_ids, dtype=np.int64)),
+            scatters_required=readonly(np.array(required, dtype=np.int64)),
+            free_spins=readonly(np.array([lvl.start_free_spins for lvl in levels], dtype=np.int64)),
+            bonus_to_upgrade=readonly(np.array([lvl.bonus_to_upgrade for lvl in levels], dtype=np.int64)),
+            upgradeable=readonly(np.array([lvl.upgrade_possible for lvl in levels], dtype=bool)),
+            next_index=readonly(np.array([self.index_of(lvl.level_id + 1) for lvl in levels], dtype=np.int64)),
+        )
 
     def __repr__(self):
         return f"<BonusLevels {len(self.levels)} levels>"
 
+    def to_dict(self):
+        """Return the compiled levels (for the config cache)."""
+        return {
+            "levels": [
+                [lvl.level_id, lvl.scatters_required, lvl.start_free_spins, lvl.bonus_to_upgrade]
+                for lvl in self.levels
+            ]
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild BonusLevels from to_dict() output, without reading the workbook."""
+        return cls.__new__(cls)._build(
+            Level(level_id=level_id, scatters=scatters, free_spins=free_spins, upgrade_required=upgrade)
+            for level_id, scatters, free_spins, upgrade in data["levels"]
+        )
+
+    def index_of(self, level_id):
+        """Position of the level with the given ID, or -1."""
+        offset = level_id - self._first_id
+        return self._by_id[offset] if 0 <= offset < len(self._by_id) else -1
+
     def get_level(self, level_id):
         """Return the Level object for the given ID."""
-        for lvl in self.levels:
-            if lvl.level_id == level_id:
-                return lvl
-        return None
+        index = self.index_of(level_id)
+        return self.levels[index] if index >= 0 else None
+
+    def index_for(self, scatters):
+        """Position of the level a round with `scatters` Scatters starts at, or -1."""
+        if not self._by_scatters or scatters < 0:
+            return -1
+        return self._by_scatters[min(scatters, len(self._by_scatters) - 1)]
+
+    def level_for(self, scatters):
+        """Level a round with `scatters` Scatters starts at (the last one whose requirement is met), or None."""
+        index = self.index_for(scatters)
+        return self.levels[index] if index >= 0 else None
 
     def get_all(self):
-        """Return all levels as a list."""
+        """Return all levels as a tuple."""
         return self.levels
 
 
@@ -110,46 +242,66 @@ class BonusLevels:
 
 class BonusConfigFactory:
     """Loads the Excel tables for a specific slot game and builds the configuration objects for the bonus logic."""
+
+    # Table name (lowercase) → configuration class
+    CONFIG_CLASSES = {
+        "bonus_spawner": BonusSpawner,
+        "card_multiplier_spawner": CardMultiplierSpawner,
+        "levels": BonusLevels,
+    }
+
     def __init__(self, game_name, base_dir=None):
         root = Path(__file__).resolve().parents[1]
         self.base_path = Path(base_dir or root / game_name)
         self.file_name = "slot_config.xlsx"
         self.game_name = game_name
 
-    def build(self, table_names, debug=False):
-        """Loads all tables listed in table_names and builds configuration objects."""
+    def build(self, table_names, debug=False, use_cache=True):
+        """
+        Loads all tables listed in table_names and builds configuration objects.
+        The compiled objects are cached next to the project, so warm starts skip the Excel parsing.
+        """
+
+        logger.info("Loading Bonus Config...")
+
+        excel_file = self.base_path / self.file_name
+        cache_key = config_cache.cache_key(excel_file, table_names, "bonus", __file__)
+
+        # Warm start: rebuild the objects from the compiled cache (debug needs the raw tables)
+        if use_cache and not debug:
+            cached = config_cache.load(self.base_path, cache_key)
+            if cached is not None:
+                config = self.from_dict(cached)
+                logger.info("BONUS CONFIG LOADED FROM CACHE ✅")
+                return config
 
-        print("Loading Bonus Config...")
         tables = load_game_tables(table_names, self.base_path, self.file_name)
 
         config = {}
+        for name, cls in self.CONFIG_CLASSES.items():
+            if name in tables:
+                config[name] = cls(tables[name])
 
-        if "bonus_spawner" in tables:
-            config["bonus_spawner"] = BonusSpawner(tables["bonus_spawner"])                
-
-        if "card_multiplier_spawner" in tables:
-            config["card_multiplier_spawner"] = CardMultiplierSpawner(tables["card_multiplier_spawner"])                
+        if use_cache:
+            config_cache.save(self.base_path, cache_key, self.to_dict(config))
 
-        if "levels" in tables:
-            config["levels"] = BonusLevels(tables["levels"])
-                
-        print("BONUS CONFIG LOADED SUCCESSFULLY ✅\n")
+        logger.info("BONUS CONFIG LOADED SUCCESSFULLY ✅")
 
         if debug:
             print("────────────────────────────────\n")
             print("Debug Loaded Bonus Data")      
             print("\n────────────────────────────────")
 
-            print("\nBONUS SPAWNER DATAFRAME:")
-            print(tables["bonus_spawner"].to_string(index=False))
+            print("\nBONUS SPAWNER TABLE:")
+            print(tables["bonus_spawner"].to_string())
             print("\nBONUS SPAWNER PROBABILITIES (%):")
             print(config["bonus_spawner"].probabilities)
-            print("\nCARD MULTIPLIER SPAWNER DATAFRAME:")
-            print(tables["card_multiplier_spawner"].to_string(index=False))
+            print("\nCARD MULTIPLIER SPAWNER TABLE:")
+            print(tables["card_multiplier_spawner"].to_string())
             print("\nCARD MULTIPLIER SPAWNER MULTIPLIERS (%):")
             print(config["card_multiplier_spawner"].multipliers)
-            print("\nBONUS LEVELS DATAFRAME:")
-            print(tables["levels"].to_string(index=False))
+            print("\nBONUS LEVELS TABLE:")
+            print(tables["levels"].to_string())
             print("\nPARSED BONUS LEVEL OBJECTS:")
             for lvl in config["levels"].levels:
                 print(f" - {lvl}")
@@ -157,3 +309,13 @@ class BonusConfigFactory:
             print("\n")
 
         return config
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild the config objects from compiled to_dict() payloads (cache or sweep variants)."""
+        return {name: config_class.from_dict(data[name]) for name, config_class in cls.CONFIG_CLASSES.items() if name in data}
+
+    @staticmethod
+    def to_dict(config):
+        """Compiled payload of every config object."""
+        return {name: obj.to_dict() for name, obj in config.items()}
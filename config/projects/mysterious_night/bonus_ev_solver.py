@@ -0,0 +1,189 @@
+import numpy as np
+from config.base.symbols import SymbolRegistry
+
+
+class BonusEvSolver:
+    """
+    Exact expected value of the 'Mysterious Night' bonus, without simulation.
+
+    Every cell of a bonus spin is drawn independently, so the distribution of one spin's
+    (chest present, multiplier sum, bonus symbols) is built by convolution over the cells.
+    The bonus itself is a Markov chain over (level, free spins left, bonus symbols collected):
+    a forward DP propagates, for every state, its probability and the first two moments of
+    the accumulated multiplier, exactly as BonusSlotGame.start / evaluate_spin play it.
+    """
+
+    def __init__(self, elementsSpawnrate, multipliersSpawnrate, bonusLevels, gridSize):
+        self.elementsSpawnrate = elementsSpawnrate
+        self.multipliersSpawnrate = multipliersSpawnrate
+        self.bonusLevels = bonusLevels
+        self.grid_rows, self.grid_cols = gridSize
+
+        self.spin_outcomes = self._spin_distribution()
+
+    def __repr__(self):
+        return f"<BonusEvSolver {self.grid_rows}x{self.grid_cols}, {len(self.bonusLevels.levels)} levels>"
+
+    # --------------------------------------------------------------
+    def _spin_distribution(self):
+        """
+        Distribution of a single bonus spin, convolved cell by cell.
+        Returns a list of (bonus_count, P(b), E[c; b], E[c²; b], P(c = 0; b)) where c is the
+        multiplier the spin adds (its Card Front sum when a Chest is present, else 0).
+        """
+        element_sampler = self.elementsSpawnrate.sampler
+        multiplier_sampler = self.multipliersSpawnrate.sampler
+        element_flags = self.elementsSpawnrate.symbols.flags
+        cells = self.grid_rows * self.grid_cols
+
+        multipliers = [int(m) for m in multiplier_sampler.values]
+        max_multiplier = max(max(multipliers), 0)
+        max_sum = max_multiplier * cells
+
+        # dist[chest, multiplier_sum, bonus_count]
+        dist = np.zeros((2, max_sum + 1, cells + 1), dtype=np.float64)
+        dist[0, 0, 0] = 1.0
+
+        for _ in range(cells):
+            new = np.zeros_like(dist)
+            for flags, prob in zip(element_flags, element_sampler.probabilities):
+                if prob == 0:
+                    continue
+                shifted = dist
+                if flags & SymbolRegistry.BONUS:
+                    shifted = np.roll(shifted, 1, axis=2)
+                if flags & SymbolRegistry.CHEST:
+                    shifted = np.stack([np.zeros_like(shifted[0]), shifted[0] + shifted[1]])
+                if flags & SymbolRegistry.CARD_FRONT:
+                    added = np.zeros_like(shifted)
+                    for multiplier, multi_prob in zip(multipliers, multiplier_sampler.probabilities):
+                        added[:, multiplier:] += multi_prob * shifted[:, :shifted.shape[1] - multiplier]
+                    shifted = added
+                new += prob * shifted
+            dist = new
+
+        sums = np.arange(max_sum + 1, dtype=np.float64)
+        with_chest = dist[1]  # (multiplier_sum, bonus_count)
+
+        outcomes = []
+        for bonus_count in range(cells + 1):
+            p_b = float(dist[:, :, bonus_count].sum())
+            if p_b == 0:
+                continue
+            mean_c = float(np.dot(sums, with_chest[:, bonus_count]))
+            mean_c2 = float(np.dot(sums ** 2, with_chest[:, bonus_count]))
+            zero_c = float(dist[0, :, bonus_count].sum() + with_chest[0, bonus_count])
+            outcomes.append((bonus_count, p_b, mean_c, mean_c2, zero_c))
+        return outcomes
+
+    def _next_state(self, level_index, free_spins, collected, bonus_count):
+        """State after a spin that found bonus_count symbols (mirrors evaluate_spin)."""
+        levels = self.bonusLevels.levels
+        level = levels[level_index]
+        free_spins -= 1
+        collected += bonus_count
+
+        if level.upgrade_possible and collected >= level.bonus_to_upgrade:
+            next_level = self.bonusLevels.get_level(level.level_id + 1)
+            if next_level:
+                collected -= level.bonus_to_upgrade
+                free_spins += max(0, next_level.start_free_spins - level.start_free_spins)
+                level_index = self.bonusLevels.index_of(next_level.level_id)
+                level = next_level
+
+        # Symbols collected on a final level can never matter again
+        if not level.upgrade_possible:
+            collected = 0
+        return level_index, free_spins, collected
+
+    # --------------------------------------------------------------
+    def solve_level(self, level_index):
+        """
+        Exact bonus results for a round started at bonusLevels.levels[level_index].
+        Returns a dict with the expected final multiplier (win per unit bet), its variance,
+        the probability that the x1 minimum applies, the free-spins-played distribution
+        and the final-level distribution.
+        """
+        levels = self.bonusLevels.levels
+        start = levels[level_index]
+        if start.start_free_spins <= 0:
+            return {
+                "level": start.level_id, "expected_multiplier": 0.0, "variance": 0.0, "std_dev": 0.0,
+                "p_minimum_multiplier": 0.0, "expected_spins": 0.0, "spins_distribution": {}, "final_level_distribution": {},
+            }
+
+        # state → [probability, E[S; state], E[S²; state], P(S = 0; state)]
+        live = {(level_index, start.start_free_spins, 0): [1.0, 0.0, 0.0, 1.0]}
+        finished = [0.0, 0.0, 0.0, 0.0]
+        spins_distribution = {}
+        final_levels = {}
+        spins_played = 0
+
+        while live:
+            spins_played += 1
+            next_live = {}
+            for (lvl, free_spins, collected), (p, s1, s2, z) in live.items():
+                for bonus_count, p_b, mean_c, mean_c2, zero_c in self.spin_outcomes:
+                    state = self._next_state(lvl, free_spins, collected, bonus_count)
+                    moments = (
+                        p * p_b,
+                        s1 * p_b + p * mean_c,
+                        s2 * p_b + 2 * s1 * mean_c + p * mean_c2,
+                        z * zero_c,
+                    )
+                    if state[1] <= 0:
+                        for i, value in enumerate(moments):
+                            finished[i] += value
+                        spins_distribution[spins_played] = spins_distribution.get(spins_played, 0.0) + moments[0]
+                        level_id = levels[state[0]].level_id
+                        final_levels[level_id] = final_levels.get(level_id, 0.0) + moments[0]
+                    else:
+                        target = next_live.setdefault(state, [0.0, 0.0, 0.0, 0.0])
+                        for i, value in enumerate(moments):
+                            target[i] += value
+            live = next_live
+
+        # Final multiplier is S, or 1 when nothing was accumulated
+        _, s1, s2, z = finished
+        expected = s1 + z
+        variance = max(0.0, s2 + z - expected ** 2)
+        return {
+            "level": start.level_id,
+            "expected_multiplier": expected,
+            "variance": variance,
+            "std_dev": variance ** 0.5,
+            "p_minimum_multiplier": z,
+            "expected_spins": sum(t * p for t, p in spins_distribution.items()),
+            "spins_distribution": spins_distribution,
+            "final_level_distribution": final_levels,
+        }
+
+    def solve(self):
+        """Solve every trigger level: {level_id: solve_level result}."""
+        return {level.level_id: self.solve_level(i) for i, level in enumerate(self.bonusLevels.levels)}
+
+    def level_for_scatters(self, scatters):
+        """Index of the level a round starts at for a scatter count (same rule as start), or None."""
+        index = self.bonusLevels.index_for(scatters)
+        return index if index >= 0 else None
+
+    def bonus_rtp(self, scatter_distribution, trigger_scatters):
+        """
+        Exact bonus RTP (%) given the base game's Scatter-count distribution {count: probability}.
+
+        Args:
+            scatter_distribution (dict): {scatter count: probability} of a base spin.
+            trigger_scatters (int): Scatters needed to trigger the bonus (GameManager.TRIGGER_SCATTERS).
+        """
+        solved = {}
+        rtp = 0.0
+        for scatters, probability in scatter_distribution.items():
+            if scatters < trigger_scatters:
+                continue  # The base game only triggers the bonus from trigger_scatters Scatters
+            index = self.level_for_scatters(scatters)
+            if index is None:
+                continue
+            if index not in solved:
+                solved[index] = self.solve_level(index)
+            rtp += probability * solved[index]["expected_multiplier"]
+        return rtp * 100
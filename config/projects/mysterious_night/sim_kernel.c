@@ -0,0 +1,377 @@
+/*
+ * Native simulation kernel for 'Mysterious Night'.
+ *
+ * Plays K base spins (and every bonus round they trigger) and accumulates the same
+ * counters as GameManager.run_spins with the scalar engine. It reproduces the Python
+ * reference draw for draw: PCG32 with the constants of libpcg_rng.so, one bounded draw
+ * per reel stop, then per bonus spin one float per cell followed by one float per
+ * Card Front. Floating-point sums are done in the same order as the Python code, so
+ * the results are identical from the same PCG state.
+ *
+ * Built locally by NativeKernel.py (cc -O2 -shared -fPIC -ffp-contract=off).
+ */
+#include <math.h>
+#include <stdint.h>
+#include <string.h>
+
+#define PCG_MULTIPLIER 0x5851F42D4C957F2DULL
+#define PCG_INCREMENT  0x14057B7EF767814FULL
+
+/* ---- PCG32 ---- */
+
+static inline uint32_t pcg32(uint64_t *state)
+{
+    uint64_t old = *state;
+    *state = old * PCG_MULTIPLIER + PCG_INCREMENT;
+    uint32_t xorshifted = (uint32_t)(((old >> 18u) ^ old) >> 27u);
+    uint32_t rot = (uint32_t)(old >> 59u);
+    return (xorshifted >> rot) | (xorshifted << ((-rot) & 31u));
+}
+
+static inline int64_t pcg_between(uint64_t *state, int64_t low, int64_t high)
+{
+    if (high < low)
+        return low;
+    uint64_t span = (uint64_t)(high - low + 1);
+    uint64_t threshold = ((1ULL << 32) - span) % span;
+    for (;;) {
+        uint64_t r = pcg32(state);
+        if (r >= threshold)
+            return low + (int64_t)(r % span);
+    }
+}
+
+static inline double pcg_percent(uint64_t *state)
+{
+    /* get_float_between(0.0, 100.0) */
+    return (double)pcg32(state) * (1.0 / 4294967296.0) * (100.0 - 0.0) + 0.0;
+}
+
+/* First index whose cumulative probability is >= r (DiscreteSampler.index_of) */
+static inline int sample_index(const double *cumulative, int n, double r)
+{
+    int i = 0;
+    while (i < n - 1 && cumulative[i] < r)
+        i++;
+    return i;
+}
+
+/* ---- Streaming statistics (same arithmetic as src/simulation/statistics.py) ---- */
+
+typedef struct {
+    int64_t count;
+    double mean;
+    double m2;
+} Welford;
+
+static inline void welford_add(Welford *w, double value)
+{
+    w->count += 1;
+    double delta = value - w->mean;
+    w->mean += delta / (double)w->count;
+    w->m2 += delta * (value - w->mean);
+}
+
+typedef struct {
+    double min_value;
+    double log_min;
+    int64_t buckets_per_decade;
+    int64_t log_buckets;
+} HistogramLayout;
+
+static inline int64_t bucket_of(const HistogramLayout *layout, double value)
+{
+    if (value <= 0.0)
+        return 0;
+    if (value < layout->min_value)
+        return 1;
+    int64_t index = (int64_t)((log10(value) - layout->log_min) * (double)layout->buckets_per_decade);
+    return index < layout->log_buckets ? 2 + index : layout->log_buckets + 2;
+}
+
+static inline void histogram_add(const HistogramLayout *layout, int64_t *counts, double *sums, double value)
+{
+    int64_t bucket = bucket_of(layout, value);
+    counts[bucket] += 1;
+    sums[bucket] += value;
+}
+
+/* TopWins.add: replace the spin's entry, keep the list sorted (stable) and trimmed */
+static void top_add(double *wins, int64_t *spins, int64_t *length, int64_t size, double win, int64_t spin)
+{
+    double threshold = *length >= size ? wins[*length - 1] : 0.0;
+    if (win <= threshold)
+        return;
+
+    int64_t n = 0;
+    for (int64_t i = 0; i < *length; i++) {
+        if (spins[i] != spin) {
+            wins[n] = wins[i];
+            spins[n] = spins[i];
+            n++;
+        }
+    }
+    int64_t position = n;
+    while (position > 0 && wins[position - 1] < win)
+        position--;
+    for (int64_t i = n; i > position; i--) {
+        if (i < size) {
+            wins[i] = wins[i - 1];
+            spins[i] = spins[i - 1];
+        }
+    }
+    if (position < size) {
+        wins[position] = win;
+        spins[position] = spin;
+        n++;
+    }
+    *length = n < size ? n : size;
+}
+
+/* ---- Game description and results (filled by NativeKernel.py) ---- */
+
+typedef struct {
+    /* Base game */
+    int64_t rows, columns;
+    const int64_t *reel_lengths;    /* [columns] */
+    const int64_t *window_offsets;  /* [columns] start of each reel in windows */
+    const uint8_t *windows;         /* reel r, stop s, row k: windows[offset[r] + s * rows + k] */
+    int64_t lines;
+    const int64_t *line_cells;      /* [lines * columns] flat row-major cell indexes */
+    int64_t symbols;
+    const double *pay;              /* [symbols * (columns + 1)] */
+    const uint8_t *is_wild;         /* [symbols] */
+    const uint8_t *is_scatter;      /* [symbols] */
+    int64_t trigger_scatters;
+
+    /* Bonus game */
+    int64_t elements;
+    const double *element_cumulative;  /* [elements] */
+    const uint8_t *is_card_front;      /* [elements] */
+    const uint8_t *is_chest;           /* [elements] */
+    const uint8_t *is_bonus;           /* [elements] */
+    int64_t multipliers;
+    const double *multiplier_cumulative;  /* [multipliers] */
+    const int64_t *multiplier_values;     /* [multipliers] */
+    int64_t levels;
+    const int64_t *level_scatters;      /* [levels] */
+    const int64_t *level_free_spins;    /* [levels] */
+    const int64_t *level_bonus_to_upgrade;
+    const int64_t *level_upgradeable;   /* upgrade_possible */
+    const int64_t *level_next;          /* position of level_id + 1, or -1 */
+
+    HistogramLayout histogram;
+    int64_t histogram_size;
+    int64_t top_size;
+} Game;
+
+typedef struct {
+    int64_t spins, bonus_triggers, bonus_total_spins, total_cf_count, total_chest_spins;
+    int64_t total_bonus_multiplier_sum, total_bonus_multi_when_chest, total_bonus_multiplier_final;
+    int64_t base_hits, bonus_only_hits;
+    double total_bet, base_win_total, bonus_win_total, base_bonus_cross_sum;
+    Welford base_win_stats, bonus_win_stats;
+    int64_t top_length;
+    int64_t last_total_multiplier;  /* BonusSlotGame.total_multiplier carried between rounds */
+} Counters;
+
+typedef struct {
+    int64_t *win_counts;     /* [histogram_size] */
+    double *win_sums;
+    double *top_wins;        /* [top_size] */
+    int64_t *top_spins;
+    Welford *level_stats;    /* [levels] */
+    int64_t *level_counts;   /* [levels * histogram_size] */
+    double *level_sums;
+} Distribution;
+
+/* ---- Game logic ---- */
+
+static double evaluate_lines(const Game *g, const uint8_t *cells, double bet)
+{
+    int64_t columns = g->columns;
+    const double *pay = g->pay;
+    double total_win = 0.0;
+
+    for (int64_t line = 0; line < g->lines; line++) {
+        const int64_t *line_cells = g->line_cells + line * columns;
+
+        /* Line symbol: first one that is neither Wild nor Scatter */
+        int first = -1;
+        for (int64_t c = 0; c < columns; c++) {
+            uint8_t symbol = cells[line_cells[c]];
+            if (!g->is_wild[symbol] && !g->is_scatter[symbol]) {
+                first = symbol;
+                break;
+            }
+        }
+
+        double payout = 0.0;
+        if (first >= 0) {
+            int64_t count = 0;
+            while (count < columns) {
+                uint8_t symbol = cells[line_cells[count]];
+                if (symbol != first && !g->is_wild[symbol])
+                    break;
+                count++;
+            }
+            payout = pay[first * (columns + 1) + count];
+        }
+        total_win += payout * bet;
+    }
+    return total_win;
+}
+
+static int64_t level_for(const Game *g, int64_t scatters)
+{
+    int64_t level = -1;
+    for (int64_t i = 0; i < g->levels; i++)
+        if (scatters >= g->level_scatters[i])
+            level = i;
+    return level;
+}
+
+typedef struct {
+    int64_t spins_played, cf_count, spins_with_chest, multi_sum, multi_when_chest, total_multiplier;
+} BonusRound;
+
+/* BonusSlotGame.start */
+static double play_bonus(const Game *g, uint64_t *rng, int64_t scatters, double bet, BonusRound *round,
+                         uint8_t *grid)
+{
+    int64_t level = level_for(g, scatters);
+    if (level < 0 || bet <= 0.0)
+        return 0.0;
+
+    int64_t free_spins = g->level_free_spins[level];
+    if (free_spins <= 0)
+        return 0.0;
+
+    int64_t cells = g->rows * g->columns;
+    int64_t collected = 0;
+    round->total_multiplier = 0;
+
+    while (free_spins > 0) {
+        round->spins_played += 1;
+
+        /* spin: one float per cell, then one per Card Front */
+        int64_t card_fronts = 0, bonus_count = 0;
+        int chest_found = 0;
+        for (int64_t c = 0; c < cells; c++) {
+            uint8_t element = (uint8_t)sample_index(g->element_cumulative, (int)g->elements, pcg_percent(rng));
+            grid[c] = element;
+            card_fronts += g->is_card_front[element];
+            chest_found |= g->is_chest[element];
+            bonus_count += g->is_bonus[element];
+        }
+        int64_t spin_multiplier = 0;
+        for (int64_t k = 0; k < card_fronts; k++)
+            spin_multiplier += g->multiplier_values[
+                sample_index(g->multiplier_cumulative, (int)g->multipliers, pcg_percent(rng))];
+        free_spins -= 1;
+
+        round->cf_count += card_fronts;
+        round->multi_sum += spin_multiplier;
+        if (chest_found) {
+            round->spins_with_chest += 1;
+            round->multi_when_chest += spin_multiplier;
+        }
+
+        /* evaluate_spin */
+        int64_t multiplier = chest_found ? spin_multiplier : 0;
+        collected += bonus_count;
+        if (g->level_upgradeable[level] && collected >= g->level_bonus_to_upgrade[level]) {
+            int64_t next = g->level_next[level];
+            if (next >= 0) {
+                int64_t overflow = collected - g->level_bonus_to_upgrade[level];
+                int64_t extra = g->level_free_spins[next] - g->level_free_spins[level];
+                free_spins += extra > 0 ? extra : 0;
+                collected = overflow;
+                level = next;
+            }
+        }
+        round->total_multiplier += multiplier;
+    }
+
+    if (round->total_multiplier == 0)
+        round->total_multiplier = 1;
+    return bet * (double)round->total_multiplier;
+}
+
+/*
+ * Plays total_spins spins from *rng (updated in place) into zeroed counters / distribution.
+ * Returns 0, or -1 if the grid is larger than the scratch buffers.
+ */
+int run_spins(const Game *g, uint64_t *rng, int64_t total_spins, double bet, Counters *counters, Distribution *d)
+{
+    uint8_t cells[256], bonus_grid[256];
+    int64_t columns = g->columns, rows = g->rows;
+    if (rows * columns > 256)
+        return -1;
+
+    for (int64_t spin = 0; spin < total_spins; spin++) {
+        /* --- Base spin: one bounded draw per reel, copy the stop's window into the column --- */
+        int64_t scatter_count = 0;
+        for (int64_t r = 0; r < columns; r++) {
+            int64_t stop = pcg_between(rng, 0, g->reel_lengths[r] - 1);
+            const uint8_t *window = g->windows + g->window_offsets[r] + stop * rows;
+            for (int64_t k = 0; k < rows; k++) {
+                cells[k * columns + r] = window[k];
+                scatter_count += g->is_scatter[window[k]];
+            }
+        }
+        double win = evaluate_lines(g, cells, bet);
+
+        /* counters.add_base */
+        welford_add(&counters->base_win_stats, win);
+        if (win > 0.0) {
+            counters->base_hits += 1;
+            histogram_add(&g->histogram, d->win_counts, d->win_sums, win / bet);
+            top_add(d->top_wins, d->top_spins, &counters->top_length, g->top_size, win, counters->spins);
+        } else {
+            d->win_counts[0] += 1;
+        }
+
+        counters->spins += 1;
+        counters->base_win_total += win;
+        counters->total_bet += bet;
+
+        /* --- Bonus trigger --- */
+        if (scatter_count >= g->trigger_scatters && g->levels > 0) {
+            BonusRound round = {0, 0, 0, 0, 0, counters->last_total_multiplier};
+            double bonus_win = play_bonus(g, rng, scatter_count, bet, &round, bonus_grid);
+            counters->last_total_multiplier = round.total_multiplier;
+            int64_t level = level_for(g, scatter_count);
+
+            /* counters.add_bonus */
+            counters->base_bonus_cross_sum += win * bonus_win;
+            if (win <= 0.0 && bonus_win > 0.0)
+                counters->bonus_only_hits += 1;
+            if (bonus_win > 0.0) {
+                double old_value = win / bet;
+                int64_t bucket = bucket_of(&g->histogram, old_value);
+                d->win_counts[bucket] -= 1;
+                d->win_sums[bucket] -= old_value;
+                histogram_add(&g->histogram, d->win_counts, d->win_sums, (win + bonus_win) / bet);
+                top_add(d->top_wins, d->top_spins, &counters->top_length, g->top_size, win + bonus_win,
+                        counters->spins - 1);
+            }
+            if (level >= 0) {
+                welford_add(&d->level_stats[level], bonus_win / bet);
+                histogram_add(&g->histogram, d->level_counts + level * g->histogram_size,
+                              d->level_sums + level * g->histogram_size, bonus_win / bet);
+            }
+
+            counters->bonus_triggers += 1;
+            counters->bonus_win_total += bonus_win;
+            welford_add(&counters->bonus_win_stats, bonus_win);
+            counters->bonus_total_spins += round.spins_played;
+            counters->total_cf_count += round.cf_count;
+            counters->total_chest_spins += round.spins_with_chest;
+            counters->total_bonus_multiplier_sum += round.multi_sum;
+            counters->total_bonus_multi_when_chest += round.multi_when_chest;
+            counters->total_bonus_multiplier_final += round.total_multiplier;
+        }
+    }
+    return 0;
+}
@@ -1,11 +1,23 @@
 from importlib import import_module
 import json
+import logging
 import random
+import time
 from pathlib import Path
+import numpy as np
 from config.base.base_config_factory import BaseConfigFactory
 from src.game.BaseSlotGame import BaseSlotGame
+from src.game.BaseBatchEngine import BaseBatchEngine
+from src.simulation.counters import SimulationCounters
+from src.simulation.statistics import RunningStats, z_score
+from src.simulation.parallel import run_parallel
+from src.simulation.checkpoint import save_checkpoint, load_checkpoint
+from src.freeprngLib import pcg
+from src.analysis.exact_rtp import BaseRtpCalculator
 import os
 
+logger = logging.getLogger(__name__)
+
 
 class GameManager:
     """
@@ -13,15 +25,25 @@ class GameManager:
     Handles initialization, simulation, and debug reporting.
     """
 
-    def __init__(self):
+    # Scatters needed on a base spin to trigger the bonus
+    TRIGGER_SCATTERS = 3
+
+    def __init__(self, game_name=None, base_data=None, bonus_data=None):
+        """
+        Args:
+            game_name (str): Project under config/projects (defaults to settings.json).
+            base_data (dict): Compiled base config payload (export_config()["base"]); if given,
+                the workbook is not read.
+            bonus_data (dict): Compiled bonus config payload (export_config()["bonus"]).
+        """
         # 🔹 Load global settings
         settings_path = Path(__file__).resolve().parent / "settings.json"
         with open(settings_path, "r", encoding="utf-8") as f:
             self.settings = json.load(f)
 
-        self.game_name = self.settings.get("game_name")
+        self.game_name = game_name or self.settings.get("game_name")
         if self.game_name is None:
-            print("⚠️ Warning: 'game_name' not found in settings.json. Defaulting to 'mysterious_night'.")
+            logger.warning("⚠️ Warning: 'game_name' not found in settings.json. Defaulting to 'mysterious_night'.")
             self.game_name = "mysterious_night"
 
         # 🔹 Load per-game settings
@@ -38,12 +60,18 @@ class GameManager:
         base_tables = self.game_settings.get("base_data", [])
         bonus_tables = self.game_settings.get("bonus_data", [])
 
-        # 🔹 Load Excel configuration via the factory
-        base_factory = BaseConfigFactory(self.game_name)
-        base_config = base_factory.build(base_tables)
+        # 🔹 Load Excel configuration via the factory (or rebuild it from a compiled payload)
+        if base_data is None:
+            base_factory = BaseConfigFactory(self.game_name)
+            base_config = base_factory.build(base_tables)
+        else:
+            base_config = BaseConfigFactory.from_dict(base_data)
+        self.base_config = base_config
+        self.bonus_config = None
 
         # 🔹 Initialize the base game
         self.game = BaseSlotGame(**base_config)
+        self.batch_engine = BaseBatchEngine(**base_config)
 
         # --- Dynamically load BONUS configuration ---
         try:
@@ -52,8 +80,13 @@ class GameManager:
             BonusConfigFactory = getattr(bonus_module, "BonusConfigFactory")
 
             # Build bonus configuration
-            bonus_factory = BonusConfigFactory(self.game_name)
-            bonus_config = bonus_factory.build(bonus_tables)
+            if bonus_data is None:
+                bonus_factory = BonusConfigFactory(self.game_name)
+                bonus_config = bonus_factory.build(bonus_tables)
+            else:
+                bonus_config = BonusConfigFactory.from_dict(bonus_data)
+            self.bonus_config = bonus_config
+            self._bonus_factory_class = BonusConfigFactory
 
             # Dynamically import BonusSlotGame class
             bonus_game_path = f"config.projects.{self.game_name}.BonusSlotGame"
@@ -67,10 +100,34 @@ class GameManager:
                 bonusLevels=bonus_config.get("levels")
             )
 
+            # Vectorized multi-round engine, if the project provides one
+            try:
+                bonus_engine_module = import_module(f"config.projects.{self.game_name}.BonusBatchEngine")
+                self.bonus_engine = bonus_engine_module.BonusBatchEngine(
+                    elementsSpawnrate=bonus_config.get("bonus_spawner"),
+                    multipliersSpawnrate=bonus_config.get("card_multiplier_spawner"),
+                    bonusLevels=bonus_config.get("levels"),
+                    gridSize=(self.game.grid.rows, self.game.grid.columns),
+                )
+            except ModuleNotFoundError:
+                self.bonus_engine = None
+
         except ModuleNotFoundError:
             self.bonus = None
-            print(f"⚠️ No bonus_config_factory found for '{self.game_name}'. Skipping bonus setup.")
+            self.bonus_engine = None
+            logger.warning(f"⚠️ No bonus_config_factory found for '{self.game_name}'. Skipping bonus setup.")
+
+    @classmethod
+    def from_config(cls, game_name, base_data, bonus_data=None):
+        """Builds a GameManager from compiled config payloads (see export_config), without reading the workbook."""
+        return cls(game_name, base_data=base_data, bonus_data=bonus_data)
 
+    def export_config(self):
+        """Returns the compiled configuration as plain data: {"base": payload, "bonus": payload or None}."""
+        return {
+            "base": BaseConfigFactory.to_dict(self.base_config),
+            "bonus": self._bonus_factory_class.to_dict(self.bonus_config) if self.bonus_config else None,
+        }
 
     # ---------------------------------------------------------------------
     def test(self):
@@ -81,111 +138,691 @@ class GameManager:
 
 
     # ---------------------------------------------------------------------
-    def simulate_rtp(self, debug=False, total_spins=2000000, bet=1.0):
+    def _base_spins(self, total_spins, bet, counters, recorder=None):
+        """Yields (win, scatter_count) for each base spin, one spin at a time (recording each win in the counters)."""
+        for spin_index in range(total_spins):
+            if recorder:
+                recorder.start_spin(pcg.get_state())
+            self.game.spin(debug=False)
+            win = self.game.evaluate_spin(bet)
+
+            scatter_count = self.game.scatter_count()
+            counters.add_base(win, bet)
+            yield win, scatter_count
+
+    def _base_spins_batched(self, total_spins, bet, batch_size, counters, recorder=None):
+        """Yields (win, scatter_count) for each base spin, evaluated in vectorized batches (recording the wins in the counters)."""
+        remaining = total_spins
+        while remaining > 0:
+            n = min(batch_size, remaining)
+            state_before = pcg.get_state() if recorder else None
+            wins, scatter_counts = self.batch_engine.spin_batch(n, bet)
+            if recorder:
+                recorder.start_batch(counters.spins, n, state_before, pcg.get_state(), self.batch_engine.reel_max_stop)
+            counters.add_base_batch(wins, bet)
+            yield from zip(wins.tolist(), scatter_counts.tolist())
+            remaining -= n
+
+    # ---------------------------------------------------------------------
+    def run_spins(self, total_spins, bet=1.0, batch_size=None, counters=None, recorder=None):
         """
-        Executes a full RTP simulation for both base and bonus games.
-        Calculates total RTP, base RTP, bonus RTP, and provides debug analytics.
+        Plays total_spins base spins (and every bonus they trigger) from the current
+        PCG state and accumulates the results into a SimulationCounters object.
 
         Args:
-            debug (bool): If True, prints detailed simulation data.
             total_spins (int): Number of spins to simulate.
             bet (float): The bet amount per spin.
+            batch_size (int): If set, base spins are drawn and evaluated in vectorized
+                batches of this size with the BaseBatchEngine.
+            counters (SimulationCounters): Counters to continue from (a new one if None).
+            recorder (ReplayRecorder): If set, spins it selects are appended to its replay log
+                with the PCG states needed to replay them (see src/simulation/replay.py).
         """
-        print("────────────────────────────────\n")
-        print("RTP Simulation In Progress...")
+        counters = counters or SimulationCounters()
 
-        total_bet = 0.0
-        total_win = 0.0
-        base_win_total = 0.0
-        bonus_win_total = 0.0
-        bonus_triggers = 0
-        bonus_total_spins = 0  # Total spins within all bonus rounds
+        if batch_size:
+            base_spins = self._base_spins_batched(total_spins, bet, batch_size, counters, recorder)
+        else:
+            base_spins = self._base_spins(total_spins, bet, counters, recorder)
 
-        # --- Global debug counters ---
-        total_cf_count = 0
-        total_bonus_spins = 0
-        total_chest_spins = 0
-        total_bonus_multiplier_sum = 0
-        total_bonus_multi_when_chest = 0
-        total_bonus_multiplier_final = 0        
-
-        for spin_index in range(total_spins):
+        for win, scatter_count in base_spins:
             # --- Base spin ---
-            spin_result = self.game.spin(debug=False)
-            win = self.game.evaluate_spin(bet)
-            base_win_total += win
-
-            total_bet += bet
-            total_win += win
+            counters.spins += 1
+            counters.base_win_total += win
+            counters.total_bet += bet
+            bonus_win, bonus_state = 0.0, None
 
             # --- Check for bonus trigger ---
-            scatter_count = sum(
-                1
-                for row in self.game.grid.grid
-                for symbol in row
-                if str(symbol).lower() == "scatter"
-            )
-
-            if scatter_count >= 3 and self.bonus:
-                bonus_triggers += 1
+            if scatter_count >= self.TRIGGER_SCATTERS and self.bonus:
                 grid_size = (self.game.grid.rows, self.game.grid.columns)
-                
+
                 # Reset bonus debug counters
-                self.bonus.debug_spins = 0
                 self.bonus.debug_cf_count = 0
                 self.bonus.debug_spins_with_chest = 0
                 self.bonus.debug_multi_sum = 0
                 self.bonus.debug_multi_when_chest = 0
                 self.bonus.spins_played = 0
 
-                # Execute bonus round
+                # Execute bonus round and retrieve its debug info
+                bonus_state = pcg.get_state() if recorder else None
                 bonus_win = self.bonus.start(scatters=scatter_count, bet=bet, gridSize=grid_size)
-                bonus_win_total += bonus_win
-                total_win += bonus_win                
-
-                # Retrieve debug info from the bonus round
-                spins_done = getattr(self.bonus, "spins_played", 0)
-                cf_count = getattr(self.bonus, "debug_cf_count", 0)
-                chest_spins = getattr(self.bonus, "debug_spins_with_chest", 0)
-                multi_sum = getattr(self.bonus, "debug_multi_sum", 0)
-                multi_when_chest = getattr(self.bonus, "debug_multi_when_chest", 0)
-                total_multi_final = getattr(self.bonus, "total_multiplier", 0)
-
-                bonus_total_spins += spins_done
-                total_cf_count += cf_count
-                total_bonus_spins += spins_done
-                total_chest_spins += chest_spins
-                total_bonus_multiplier_sum += multi_sum
-                total_bonus_multi_when_chest += multi_when_chest
-                total_bonus_multiplier_final += total_multi_final
-
-        # --- Final RTP results ---
-        base_rtp = (base_win_total / total_bet) * 100 if total_bet > 0 else 0
-        bonus_rtp = (bonus_win_total / total_bet) * 100 if total_bet > 0 else 0
-        total_rtp = base_rtp + bonus_rtp
-        avg_bonus_spins = (bonus_total_spins / bonus_triggers) if bonus_triggers > 0 else 0
-
-        # --- Global debug calculations ---
-        avg_cf_per_spin = total_cf_count / total_bonus_spins if total_bonus_spins > 0 else 0
-        chest_prob_per_spin = total_chest_spins / total_bonus_spins if total_bonus_spins > 0 else 0
-        avg_multi_per_spin = total_bonus_multiplier_sum / total_bonus_spins if total_bonus_spins > 0 else 0
-        avg_total_multi_per_bonus = total_bonus_multiplier_final / max(1, bonus_triggers)
-
-        print("Simulation complete! ✅")
-        print("\n────────────────────────────────")
+                level = self.bonus_level_for(scatter_count)
+                counters.add_bonus(self.bonus, bonus_win, win, bet, level.level_id if level else None)
+
+            # --- Replay log ---
+            if recorder and recorder.wants(counters.spins - 1, win + bonus_win):
+                recorder.record(counters.spins - 1, win, bonus_win, scatter_count, bonus_state)
+
+        return counters
+
+    # ---------------------------------------------------------------------
+    def native_kernel(self):
+        """
+        The project's compiled simulation kernel (config/projects/<game>/NativeKernel.py),
+        built on first use. Raises RuntimeError if the project has none or it cannot be built.
+        """
+        if getattr(self, "_native_kernel", None) is None:
+            if not self.bonus:
+                raise RuntimeError(f"❌ '{self.game_name}' has no bonus game for the native kernel")
+            try:
+                kernel_module = import_module(f"config.projects.{self.game_name}.NativeKernel")
+            except ModuleNotFoundError:
+                raise RuntimeError(f"❌ No native kernel found for '{self.game_name}'")
+            self._native_kernel = kernel_module.NativeKernel(self.game, self.bonus, self.TRIGGER_SCATTERS)
+        return self._native_kernel
+
+    def run_spins_native(self, total_spins, bet=1.0):
+        """
+        Same as run_spins(total_spins, bet) with the scalar engine, played by the native kernel:
+        identical counters from the same PCG state, which it advances the same way.
+        """
+        return self.native_kernel().run_spins(total_spins, bet)
+
+    def verify_native(self, total_spins=100000, seed=12345, bet=1.0, debug=False):
+        """
+        Checks the native kernel against the Python reference: plays the same spins from the
+        same seed with both and compares every counter and the final PCG state.
+        Returns a dict with "identical", the differing counters and both timings.
+
+        Args:
+            total_spins (int): Spins played by each engine.
+            seed (int): PCG seed of both runs.
+            bet (float): The bet amount per spin.
+            debug (bool): If True, prints the comparison.
+        """
+        kernel = self.native_kernel()
+
+        pcg.set_seed(seed)
+        start = time.perf_counter()
+        reference = self.run_spins(total_spins, bet)
+        python_seconds = time.perf_counter() - start
+        reference_state = pcg.get_state()
+
+        pcg.set_seed(seed)
+        start = time.perf_counter()
+        native = kernel.run_spins(total_spins, bet)
+        native_seconds = time.perf_counter() - start
+        native_state = pcg.get_state()
+
+        expected, actual = reference.to_dict(), native.to_dict()
+        mismatches = [name for name in expected if expected[name] != actual.get(name)]
+        if reference_state != native_state:
+            mismatches.append("pcg_state")
+
+        result = {
+            "identical": not mismatches,
+            "mismatches": mismatches,
+            "spins": total_spins,
+            "python_s": python_seconds,
+            "native_s": native_seconds,
+            "speedup": python_seconds / native_seconds if native_seconds > 0 else float("inf"),
+        }
+
+        if debug:
+            print("\nNative Kernel Check\n")
+            print(f"Spins:    {total_spins:,} (seed {seed})")
+            print(f"Python:   {python_seconds:.3f} s")
+            print(f"Native:   {native_seconds:.3f} s ({result['speedup']:,.0f}x)")
+            print("Identical results ✅" if result["identical"] else f"❌ Different: {', '.join(mismatches)}")
+            print("\n────────────────────────────────")
+
+        return result
+
+    # ---------------------------------------------------------------------
+    def simulate_rtp(self, debug=False, total_spins=2000000, bet=1.0, batch_size=None):
+        """
+        Executes a full RTP simulation for both base and bonus games.
+        Calculates total RTP, base RTP, bonus RTP, and provides debug analytics.
+
+        Args:
+            debug (bool): If True, prints detailed simulation data.
+            total_spins (int): Number of spins to simulate.
+            bet (float): The bet amount per spin.
+            batch_size (int): If set, base spins are drawn and evaluated in vectorized
+                batches of this size with the BaseBatchEngine.
+        """
+        logger.info("RTP Simulation In Progress...")
+
+        counters = self.run_spins(total_spins, bet, batch_size)
+
+        logger.info("Simulation complete! ✅")
+
+        if debug:
+            self.print_analytics(counters)
+
+        return counters.total_rtp
+
+    # ---------------------------------------------------------------------
+    def simulate_rtp_stream(self, total_spins=2000000, chunk_size=100000, bet=1.0, batch_size=None,
+                            checkpoint_path=None, resume=True, confidence=0.95):
+        """
+        Streaming RTP simulation: plays the spins in chunks and yields intermediate results
+        after every chunk. With a checkpoint_path, the aggregated counters and the exact PCG
+        state are persisted after each chunk, so a killed run resumes where it stopped and
+        ends with the same counters as an uninterrupted run.
+
+        Yields a dict per chunk: spins_done, total_spins, rtp, base_rtp, bonus_rtp,
+        ci_low, ci_high (confidence interval of the total RTP), spins_per_sec, elapsed
+        and counters (the SimulationCounters so far).
+
+        Args:
+            total_spins (int): Number of spins to simulate.
+            chunk_size (int): Spins played between two reports / checkpoints.
+            bet (float): The bet amount per spin.
+            batch_size (int): Vectorized batch size used for the base spins.
+            checkpoint_path (str | Path): Checkpoint file (None disables checkpointing).
+            resume (bool): If True and the checkpoint exists, continue from it.
+            confidence (float): Confidence level of the reported RTP interval.
+        """
+        if chunk_size <= 0:
+            raise ValueError(f"❌ chunk_size must be positive, got {chunk_size}")
+
+        run_params = {
+            "game_name": self.game_name,
+            "total_spins": total_spins,
+            "bet": bet,
+            "batch_size": batch_size,
+            "chunk_size": chunk_size,
+        }
+
+        counters = SimulationCounters()
+        elapsed_before = 0.0
+
+        checkpoint = load_checkpoint(checkpoint_path) if checkpoint_path and resume else None
+        if checkpoint:
+            mismatched = [key for key, value in run_params.items() if checkpoint.get(key) != value]
+            if mismatched:
+                raise ValueError(f"❌ Checkpoint {checkpoint_path} was written with different parameters: {mismatched}")
+            counters = SimulationCounters.from_dict(checkpoint["counters"])
+            elapsed_before = checkpoint.get("elapsed", 0.0)
+            pcg.set_state(checkpoint["pcg_state"])
+            logger.info(f"♻️ Resuming from checkpoint: {counters.spins:,}/{total_spins:,} spins done.")
+
+        start = time.perf_counter()
+        spins_at_start = counters.spins
+
+        while counters.spins < total_spins:
+            self.run_spins(min(chunk_size, total_spins - counters.spins), bet, batch_size, counters)
+
+            run_time = time.perf_counter() - start
+            elapsed = elapsed_before + run_time
+
+            if checkpoint_path:
+                save_checkpoint(checkpoint_path, {
+                    **run_params,
+                    "pcg_state": pcg.get_state(),
+                    "elapsed": elapsed,
+                    "counters": counters.to_dict(),
+                })
+
+            ci_low, ci_high = counters.rtp_confidence_interval(confidence)
+            yield {
+                "spins_done": counters.spins,
+                "total_spins": total_spins,
+                "rtp": counters.total_rtp,
+                "base_rtp": counters.base_rtp,
+                "bonus_rtp": counters.bonus_rtp,
+                "ci_low": ci_low,
+                "ci_high": ci_high,
+                "spins_per_sec": (counters.spins - spins_at_start) / run_time if run_time > 0 else 0.0,
+                "elapsed": elapsed,
+                "counters": counters,
+            }
+
+    # ---------------------------------------------------------------------
+    def simulate_rtp_precision(self, tolerance=0.1, confidence=0.95, debug=False, bet=1.0, batch_size=None,
+                               chunk_size=100000, min_spins=200000, max_spins=2000000000):
+        """
+        Target-precision RTP simulation: plays chunks of spins until the confidence interval
+        of the total RTP is within ±tolerance percentage points (or max_spins is reached).
+        The win variance is tracked online for the base win and the bonus win per trigger.
+        Returns a dict with rtp, base_rtp, bonus_rtp, ci_low, ci_high, half_width,
+        spins_used, converged and counters.
+
+        Args:
+            tolerance (float): Target half-width of the RTP interval, in RTP points (0.1 → ±0.1%).
+            confidence (float): Confidence level of the interval.
+            debug (bool): If True, prints detailed simulation data.
+            bet (float): The bet amount per spin.
+            batch_size (int): Vectorized batch size used for the base spins.
+            chunk_size (int): Spins played between two convergence checks.
+            min_spins (int): Never stop before this many spins (rare bonuses need a warm-up).
+            max_spins (int): Hard cap on the number of spins.
+        """
+        if tolerance <= 0:
+            raise ValueError(f"❌ tolerance must be positive, got {tolerance}")
+
+        logger.info(f"RTP Simulation In Progress (target ±{tolerance}% at {confidence:.0%} confidence)...")
+
+        progress = None
+        converged = False
+        for progress in self.simulate_rtp_stream(max_spins, chunk_size, bet, batch_size, confidence=confidence):
+            half_width = (progress["ci_high"] - progress["ci_low"]) / 2
+            if progress["spins_done"] >= min_spins and half_width <= tolerance:
+                converged = True
+                break
+
+        counters = progress["counters"] if progress else SimulationCounters()
+        ci_low, ci_high = counters.rtp_confidence_interval(confidence)
+
+        if converged:
+            logger.info(f"Simulation converged after {counters.spins:,} spins! ✅")
+        else:
+            logger.warning(f"⚠️ Target precision not reached after {counters.spins:,} spins.")
+        logger.info(f"RTP {counters.total_rtp:.4f}% ({confidence:.0%} CI: {ci_low:.4f}% – {ci_high:.4f}%)")
+
+        if debug:
+            self.print_analytics(counters)
+
+        return {
+            "rtp": counters.total_rtp,
+            "base_rtp": counters.base_rtp,
+            "bonus_rtp": counters.bonus_rtp,
+            "ci_low": ci_low,
+            "ci_high": ci_high,
+            "half_width": (ci_high - ci_low) / 2,
+            "spins_used": counters.spins,
+            "converged": converged,
+            "counters": counters,
+        }
+
+    # ---------------------------------------------------------------------
+    def simulate_rtp_parallel(self, seed, workers=None, debug=False, total_spins=2000000, bet=1.0, batch_size=None):
+        """
+        Executes the RTP simulation split across a process pool.
+        The spins are split into fixed blocks (src/simulation/parallel.py), each played on its
+        own PCG stream derived from the master seed, so the merged result is bit-identical for
+        a given seed whatever the number of workers.
+
+        Args:
+            seed (int): Master seed of the simulation.
+            workers (int): Number of workers / PCG streams (defaults to the CPU count).
+            debug (bool): If True, prints detailed simulation data.
+            total_spins (int): Number of spins to simulate.
+            bet (float): The bet amount per spin.
+            batch_size (int): Vectorized batch size used inside each worker.
+        """
+        workers = workers or os.cpu_count() or 1
+
+        logger.info(f"RTP Simulation In Progress on {workers} workers...")
+
+        counters = run_parallel(self.game_name, seed, workers, total_spins, bet, batch_size)
+
+        logger.info("Simulation complete! ✅")
+
+        if debug:
+            self.print_analytics(counters)
+
+        return counters.total_rtp
+
+    # ---------------------------------------------------------------------
+    def simulate_triggers(self, debug=False, total_spins=100000000, batch_size=1000000):
+        """
+        Bonus-frequency analysis without playing spins: draws the reel stops only and sums
+        the precomputed per-reel Scatter counts, so no grid is built and no line is evaluated.
+        Bonus rounds are not played (they would only consume random numbers between spins).
+        Returns a dict with the simulated and exact Scatter distributions, trigger probability
+        and the number of rounds started at every bonus level.
 
-        if debug:           
-            print("\nDebug Analytics\n")
-            print(f"🎯 Base RTP:  {base_rtp:.2f}%")
-            print(f"🎯 Bonus RTP: {bonus_rtp:.2f}%")
-            print(f"🏁 TOTAL RTP: {total_rtp:.2f}%")
-
-            print(f"\nBonus Played: {bonus_triggers:,}")
-            print(f"Avg spins per bonus: {avg_bonus_spins:.2f}")            
-            print(f"Avg multiplier per spin: {avg_multi_per_spin:.3f}")
-            print(f"Avg total multiplier per bonus: {avg_total_multi_per_bonus:.3f}")
-            print(f"Avg Card Front per spin: {avg_cf_per_spin:.3f}")
-            print(f"Chest probability per spin: {chest_prob_per_spin*100:.2f}%")
+        Args:
+            debug (bool): If True, prints the results.
+            total_spins (int): Number of base spins to sample.
+            batch_size (int): Spins drawn per vectorized batch.
+        """
+        max_scatters = self.game.grid.rows * self.game.grid.columns
+        histogram = np.zeros(max_scatters + 1, dtype=np.int64)
+
+        remaining = total_spins
+        while remaining > 0:
+            n = min(batch_size, remaining)
+            histogram += np.bincount(self.batch_engine.sample_scatter_counts(n), minlength=max_scatters + 1)
+            remaining -= n
+
+        distribution = {k: int(count) / total_spins for k, count in enumerate(histogram) if count}
+        exact_distribution = self.game.strips.scatter_distribution()
+        triggers = int(histogram[self.TRIGGER_SCATTERS:].sum())
+
+        # Rounds started per level
+        levels = {}
+        for scatters in range(self.TRIGGER_SCATTERS, max_scatters + 1):
+            level = self.bonus_level_for(scatters)
+            if level and histogram[scatters]:
+                levels[level.level_id] = levels.get(level.level_id, 0) + int(histogram[scatters])
+
+        result = {
+            "spins": total_spins,
+            "triggers": triggers,
+            "trigger_probability": triggers / total_spins if total_spins else 0.0,
+            "exact_trigger_probability": sum(p for k, p in exact_distribution.items() if k >= self.TRIGGER_SCATTERS),
+            "distribution": distribution,
+            "exact_distribution": exact_distribution,
+            "levels": levels,
+        }
+
+        if debug:
+            print("\nBonus Trigger Analysis\n")
+            print(f"Spins sampled:    {total_spins:,}")
+            print(f"Bonus triggers:   {triggers:,}")
+            if triggers:
+                print(f"Trigger rate:     1 in {total_spins / triggers:,.1f} (exact 1 in {1 / result['exact_trigger_probability']:,.1f})")
+            for level_id, count in sorted(levels.items()):
+                print(f" - Level {level_id}: {count:,} rounds")
             print("\n────────────────────────────────")
-            
-        return total_rtp
+
+        return result
+
+    # ---------------------------------------------------------------------
+    def bonus_level_for(self, scatters):
+        """Level a bonus triggered with `scatters` Scatters starts at (same rule as BonusSlotGame.start), or None."""
+        if not self.bonus or scatters < self.TRIGGER_SCATTERS:
+            return None
+        return self.bonus.bonusLevels.level_for(scatters)
+
+    def bonus_level_probabilities(self, scatter_distribution=None):
+        """
+        Probability per base spin of starting the bonus at each level, from a Scatter-count
+        distribution {count: probability} (the exact one of the reels by default).
+        Returns {level_id: {"scatters": smallest triggering count, "probability": p}}.
+        """
+        if scatter_distribution is None:
+            scatter_distribution = self.game.strips.scatter_distribution()
+        levels = {}
+        for scatters, probability in sorted(scatter_distribution.items()):
+            level = self.bonus_level_for(scatters)
+            if level is None or probability <= 0:
+                continue
+            entry = levels.setdefault(level.level_id, {"scatters": scatters, "probability": 0.0})
+            entry["probability"] += probability
+        return levels
+
+    def simulate_bonus_levels(self, debug=False, rounds_per_level=100000, confidence=0.95, scatter_distribution=None):
+        """
+        Bonus-only simulation: plays `rounds_per_level` bonus rounds directly at every level the
+        base game can trigger, with no base spins in between, and weights each level's mean win
+        by its trigger probability (importance sampling of the triggers):
+
+            bonus RTP = Σ P(level) · E[win per bet | level]
+
+        Every level gets the same number of rounds however rare its trigger is, so the bonus
+        contribution converges far faster than in the coupled loop, where a round is only played
+        once per trigger (simulate_triggers() reports how often that is). Rounds are played in
+        lockstep by the project's BonusBatchEngine when it provides one (BonusSlotGame.start
+        otherwise). Returns a dict with the bonus RTP, its confidence interval and, per level,
+        the trigger probability, win statistics and win distribution (win in bets → probability).
+
+        Args:
+            debug (bool): If True, prints the results.
+            rounds_per_level (int): Bonus rounds played at each level.
+            confidence (float): Confidence level of the interval.
+            scatter_distribution (dict): {scatter count: probability} to weight the levels
+                with (e.g. simulate_triggers()["distribution"]); the exact one by default.
+        """
+        if not self.bonus:
+            raise ValueError(f"❌ '{self.game_name}' has no bonus game")
+
+        grid_size = (self.game.grid.rows, self.game.grid.columns)
+        z = z_score(confidence)
+        bonus_rtp = 0.0
+        error_variance = 0.0
+        levels = {}
+        start = time.perf_counter()
+
+        for level_id, trigger in sorted(self.bonus_level_probabilities(scatter_distribution).items()):
+            # Wins are played at bet 1, so they are already in multiples of the bet
+            if self.bonus_engine:
+                wins = self.bonus_engine.play(trigger["scatters"], rounds_per_level)["win"]
+            else:
+                wins = np.empty(rounds_per_level, dtype=np.float64)
+                for round_index in range(rounds_per_level):
+                    wins[round_index] = self.bonus.start(scatters=trigger["scatters"], bet=1.0, gridSize=grid_size)
+
+            stats = RunningStats()
+            stats.add_many(wins)
+            values, counts = np.unique(wins, return_counts=True)
+
+            bonus_rtp += trigger["probability"] * stats.mean * 100
+            error_variance += (trigger["probability"] * 100) ** 2 * stats.variance / stats.count
+            levels[level_id] = {
+                "scatters": trigger["scatters"],
+                "trigger_probability": trigger["probability"],
+                "rounds": stats.count,
+                "mean_win": stats.mean,
+                "std_dev": stats.std_dev,
+                "std_error": stats.standard_error(),
+                "max_win": float(values[-1]),
+                "rtp_contribution": trigger["probability"] * stats.mean * 100,
+                "distribution": {float(v): int(c) / stats.count for v, c in zip(values, counts)},
+            }
+
+        elapsed = time.perf_counter() - start
+        half_width = z * error_variance ** 0.5
+        rounds = rounds_per_level * len(levels)
+        result = {
+            "bonus_rtp": bonus_rtp,
+            "ci_low": bonus_rtp - half_width,
+            "ci_high": bonus_rtp + half_width,
+            "confidence": confidence,
+            "rounds": rounds,
+            "rounds_per_sec": rounds / elapsed if elapsed > 0 else 0.0,
+            "levels": levels,
+        }
+
+        if debug:
+            print("\nBonus-Only Simulation\n")
+            for level_id, level in levels.items():
+                print(f"Level {level_id} (1 in {1 / level['trigger_probability']:,.0f}): "
+                      f"mean win {level['mean_win']:.3f} ± {level['std_error']:.3f}, "
+                      f"std {level['std_dev']:.3f}, max {level['max_win']:,.2f}")
+            print(f"\n🎯 Bonus RTP: {bonus_rtp:.4f}% ({confidence:.0%} CI: {result['ci_low']:.4f}% – {result['ci_high']:.4f}%)")
+            print(f"Rounds: {rounds:,} ({result['rounds_per_sec']:,.0f} rounds/s)")
+            print("\n────────────────────────────────")
+
+        return result
+
+    # ---------------------------------------------------------------------
+    def instrument_simulation(self, total_spins=100000, bet=1.0, batch_size=None, alloc_spins=20000,
+                              profile_spins=20000, output_dir=None):
+        """
+        Instrumented RTP simulation of run_spins: per-phase timings and counts (base spin,
+        batch windows, evaluate, scatter scan, bonus start, bonus spin, bonus evaluate) and RNG call counts, plus an
+        allocation slice under tracemalloc and a cProfile slice.
+        Returns the report dictionary (RTP results included); with output_dir, writes it as
+        instrumentation.json next to a flamegraph-compatible profile.collapsed file.
+
+        Args:
+            total_spins (int): Spins of the instrumented run.
+            bet (float): The bet amount per spin.
+            batch_size (int): Vectorized batch size used for the base spins.
+            alloc_spins (int): Spins of the tracemalloc slice (0 disables it).
+            profile_spins (int): Spins of the cProfile slice (0 disables it).
+            output_dir (str | Path): Folder for the JSON report and the collapsed stacks.
+        """
+        from src.simulation import instrumentation
+
+        counters, phases = instrumentation.run_spins_instrumented(self, total_spins, bet, batch_size)
+        report = {"game_name": self.game_name, "results": counters.summary(), "instrumentation": phases}
+
+        if alloc_spins:
+            report["allocations"] = instrumentation.allocation_report(self, alloc_spins, bet, batch_size)
+        if profile_spins:
+            collapsed_path = Path(output_dir) / "profile.collapsed" if output_dir else None
+            report["profile"] = instrumentation.profile_report(self, profile_spins, bet, batch_size, collapsed_path)
+
+        if output_dir:
+            instrumentation.write_report(report, Path(output_dir) / "instrumentation.json")
+            logger.info(f"Instrumentation report saved to {output_dir} ✅")
+
+        return report
+
+    # ---------------------------------------------------------------------
+    def exact_base_rtp(self, debug=False, bet=1.0):
+        """
+        Computes the exact base-game math by enumerating every reel-stop combination.
+        Returns the result dictionary of BaseRtpCalculator.calculate.
+
+        Args:
+            debug (bool): If True, prints the results.
+            bet (float): The bet amount per spin.
+        """
+        result = BaseRtpCalculator(self.batch_engine, self.TRIGGER_SCATTERS).calculate(bet)
+
+        if debug:
+            print("\nExact Base Game Math\n")
+            print(f"🎯 Base RTP:      {result['base_rtp']:.4f}%")
+            print(f"Hit frequency:    {result['hit_frequency']*100:.4f}%")
+            print(f"Std deviation:    {result['std_dev']:.4f}")
+            print(f"Max win:          {result['max_win']:.2f}")
+            print(f"Bonus trigger:    1 in {1 / result['trigger_probability']:,.1f}" if result["trigger_probability"] > 0 else "Bonus trigger:    never")
+
+            print("\nContributions (RTP %):")
+            for symbol, counts in result["contributions"].items():
+                per_count = ", ".join(f"{count}x {value:.4f}" for count, value in counts.items())
+                print(f" - {symbol}: {per_count}")
+            print("\n────────────────────────────────")
+
+        return result
+
+    # ---------------------------------------------------------------------
+    def exact_rtp(self, debug=False, bet=1.0):
+        """
+        Computes the exact total RTP: base game by reel-stop enumeration plus the bonus
+        expected value from the project's BonusEvSolver (if the project provides one).
+        Returns a dictionary with the base results, per-level bonus results and RTPs.
+
+        Args:
+            debug (bool): If True, prints the results.
+            bet (float): The bet amount per spin.
+        """
+        base = self.exact_base_rtp(debug, bet)
+        result = {"base": base, "base_rtp": base["base_rtp"], "bonus": None, "bonus_rtp": 0.0}
+
+        if self.bonus:
+            try:
+                solver_module = import_module(f"config.projects.{self.game_name}.bonus_ev_solver")
+            except ModuleNotFoundError:
+                solver_module = None
+                logger.warning(f"⚠️ No bonus_ev_solver found for '{self.game_name}'. Bonus RTP not computed.")
+
+            if solver_module:
+                solver = solver_module.BonusEvSolver(
+                    elementsSpawnrate=self.bonus.elementsSpawnrate,
+                    multipliersSpawnrate=self.bonus.multipliersSpawnrate,
+                    bonusLevels=self.bonus.bonusLevels,
+                    gridSize=(self.game.grid.rows, self.game.grid.columns),
+                )
+                result["bonus"] = solver.solve()
+                result["bonus_rtp"] = solver.bonus_rtp(base["scatter_distribution"], self.TRIGGER_SCATTERS)
+
+        result["total_rtp"] = result["base_rtp"] + result["bonus_rtp"]
+
+        if debug:
+            print("\nExact Bonus Math\n")
+            for level_id, level in (result["bonus"] or {}).items():
+                print(f"Level {level_id}: E[multiplier] {level['expected_multiplier']:.3f}, "
+                      f"std {level['std_dev']:.3f}, avg spins {level['expected_spins']:.2f}")
+            print(f"\n🎯 Base RTP:  {result['base_rtp']:.4f}%")
+            print(f"🎯 Bonus RTP: {result['bonus_rtp']:.4f}%")
+            print(f"🏁 TOTAL RTP: {result['total_rtp']:.4f}%")
+            print("\n────────────────────────────────")
+
+        return result
+
+    # ---------------------------------------------------------------------
+    def replay_spin(self, log_path, spin_index, debug=True):
+        """
+        Replays one spin recorded in a replay log (base spin and its bonus round) with debug
+        output, and checks it reproduces the recorded wins. Returns the replay result dict.
+
+        Args:
+            log_path (str | Path): Replay log written by a ReplayRecorder.
+            spin_index (int): Spin to replay (0-based within the recorded simulation).
+            debug (bool): Print the grid, line wins and results.
+        """
+        from src.simulation.replay import ReplayLog, replay
+
+        with ReplayLog(log_path) as log:
+            if log.game_name != self.game_name:
+                raise ValueError(f"❌ Replay log {log_path} belongs to '{log.game_name}', not '{self.game_name}'")
+            record = log.find(spin_index)
+            bet = log.bet
+        if record is None:
+            raise KeyError(f"❌ Spin {spin_index} is not in replay log {log_path}")
+
+        result = replay(self, record, bet, debug)
+
+        if debug:
+            print(f"\nReplay of spin {spin_index:,}\n")
+            print(f"Base win:  {result['base_win']:.2f} (recorded {record['base_win']:.2f})")
+            print(f"Bonus win: {result['bonus_win']:.2f} (recorded {record['bonus_win']:.2f})")
+            print("Reproduced ✅" if result["matches"] else "❌ Replay does not match the recorded spin")
+            print("\n────────────────────────────────")
+
+        return result
+
+    # ---------------------------------------------------------------------
+    def sweep(self, grid, seed, total_spins=1000000, bet=1.0, block_size=10000, workers=1, debug=False):
+        """
+        Evaluates every combination of config overrides against this loaded config, on common
+        random numbers, and returns one row per variant (RTP, volatility, hit rate).
+
+        Args:
+            grid (dict): {override path: [value, ...]} (see src/simulation/sweep.py); the
+                unmodified config is always the first "baseline" row.
+            seed (int): PCG seed shared by every variant.
+            total_spins (int): Base spins per variant.
+            bet (float): Bet amount per spin.
+            block_size (int): Spins per common-random-numbers block.
+            workers (int): Worker processes (one variant per task).
+            debug (bool): Print the results table.
+        """
+        from src.simulation.sweep import expand_grid, run_sweep, format_table
+
+        variants = expand_grid(grid)
+        logger.info(f"Sweep of {len(variants)} variants x {total_spins:,} spins in progress...")
+        rows = run_sweep(self, variants, total_spins, seed, bet, block_size, workers)
+        logger.info("Sweep complete! ✅")
+
+        if debug:
+            print("\nSweep Results\n")
+            print(format_table(rows))
+            print("\n────────────────────────────────")
+
+        return rows
+
+    # ---------------------------------------------------------------------
+    def print_analytics(self, counters):
+        """Prints the RTP results and bonus analytics of a finished simulation."""
+        summary = counters.summary()
+
+        print("\nDebug Analytics\n")
+        print(f"🎯 Base RTP:  {summary['base_rtp']:.2f}%")
+        print(f"🎯 Bonus RTP: {summary['bonus_rtp']:.2f}%")
+        print(f"🏁 TOTAL RTP: {summary['total_rtp']:.2f}%")
+
+        print(f"\nBonus Played: {summary['bonus_triggers']:,}")
+        print(f"Avg spins per bonus: {summary['avg_bonus_spins']:.2f}")
+        print(f"Avg multiplier per spin: {summary['avg_multi_per_spin']:.3f}")
+        print(f"Avg total multiplier per bonus: {summary['avg_total_multi_per_bonus']:.3f}")
+        print(f"Avg Card Front per spin: {summary['avg_cf_per_spin']:.3f}")
+        print(f"Chest probability per spin: {summary['chest_prob_per_spin']*100:.2f}%")
+        print("\n────────────────────────────────")
@@ -0,0 +1,176 @@
+import numpy as np
+
+
+class BaseRtpCalculator:
+    """
+    Exact base-game math by full reel-stop enumeration.
+
+    The base game is deterministic given one stop per reel, so every stop combination
+    is equally likely. Instead of evaluating the full Cartesian product, each payline is
+    decomposed at the shortest paying count p:
+      - the first p reels ("prefix") reduce every line to a small state:
+        dead, all-Wild so far, or an intact run of one symbol;
+      - prefix combinations are grouped by their vector of line states;
+      - each group is combined with every stop of the remaining reels ("suffix"),
+        reusing the per-line payouts cached by (state, suffix rows).
+    """
+
+    DEAD = 0
+    PENDING = 1  # Only Wilds so far: the line symbol is decided by the suffix
+    FIRST_SYMBOL_STATE = 2  # state = 2 + symbol_id for an intact run of that symbol
+
+    def __init__(self, engine, trigger_scatters):
+        """
+        Args:
+            engine (BaseBatchEngine): Provides the encoded reels, paylines and paytable.
+            trigger_scatters (int): Scatters needed to trigger the bonus (GameManager.TRIGGER_SCATTERS).
+        """
+        self.engine = engine
+        self.trigger_scatters = int(trigger_scatters)
+
+        # Shortest count that pays anything (3 for a classic paytable)
+        paying_counts = np.flatnonzero(engine.pay.any(axis=0))
+        self.prefix_length = int(paying_counts[0]) if paying_counts.size else engine.columns
+
+    def __repr__(self):
+        return f"<BaseRtpCalculator prefix={self.prefix_length} reels>"
+
+    # --------------------------------------------------------------
+    @staticmethod
+    def _stop_combinations(reel_lengths):
+        """All stop combinations of the given reels, shape (product, len(reel_lengths))."""
+        if not reel_lengths:
+            return np.zeros((1, 0), dtype=np.intp)
+        grids = np.meshgrid(*[np.arange(length) for length in reel_lengths], indexing="ij")
+        return np.stack([g.reshape(-1) for g in grids], axis=1)
+
+    def _line_symbols(self, stops, reels, rows):
+        """Symbols read along one line for every stop combination of the given reels."""
+        engine = self.engine
+        if not reels:
+            return np.zeros((stops.shape[0], 0), dtype=engine.reels[0].dtype)
+        return np.stack(
+            [engine.windows[reel][stops[:, i], row] for i, (reel, row) in enumerate(zip(reels, rows))],
+            axis=1,
+        )
+
+    def _prefix_states(self, symbols):
+        """Reduce (N, p) prefix symbols of one line to DEAD / PENDING / 2 + symbol_id."""
+        engine = self.engine
+        n = symbols.shape[0]
+        is_wild = symbols == engine.wild_id
+        candidates = ~(is_wild | (symbols == engine.scatter_id))
+
+        first_symbol = symbols[np.arange(n), candidates.argmax(axis=1)].astype(np.int64)
+        intact = ((symbols == first_symbol[:, None]) | is_wild).all(axis=1)
+        pays = engine.pay[first_symbol].any(axis=1)
+
+        states = np.full(n, self.DEAD, dtype=np.int64)
+        states[is_wild.all(axis=1)] = self.PENDING
+        alive = candidates.any(axis=1) & intact & pays
+        states[alive] = self.FIRST_SYMBOL_STATE + first_symbol[alive]
+        return states
+
+    def _suffix_payouts(self, state, suffix_symbols):
+        """Per-line (first_symbol, count, payout) of a prefix state followed by every suffix."""
+        engine = self.engine
+        m = suffix_symbols.shape[0]
+        representative = engine.wild_id if state == self.PENDING else state - self.FIRST_SYMBOL_STATE
+        prefix = np.full((m, self.prefix_length), representative, dtype=suffix_symbols.dtype)
+        return engine.evaluate_line(np.concatenate([prefix, suffix_symbols], axis=1))
+
+    def scatter_distribution(self):
+        """Exact distribution of the number of visible Scatters: {count: probability}."""
+        engine = self.engine
+        distribution = np.array([1], dtype=np.int64)
+        for per_stop in engine.scatter_per_stop:
+            distribution = np.convolve(distribution, np.bincount(per_stop, minlength=engine.rows + 1))
+        total = int(distribution.sum())
+        return {k: int(ways) / total for k, ways in enumerate(distribution) if ways}
+
+    # --------------------------------------------------------------
+    def calculate(self, bet=1.0):
+        """
+        Returns exact base-game results for one spin at the given bet:
+        RTP, hit frequency, mean / variance / max of the total win, per-symbol and
+        per-count RTP contributions, and the Scatter-count distribution.
+        """
+        engine = self.engine
+        p = self.prefix_length
+        prefix_reels = list(range(p))
+        suffix_reels = list(range(p, engine.columns))
+
+        prefix_stops = self._stop_combinations([engine.reel_lengths[r] for r in prefix_reels])
+        suffix_stops = self._stop_combinations([engine.reel_lengths[r] for r in suffix_reels])
+        combinations = prefix_stops.shape[0] * suffix_stops.shape[0]
+
+        # 🔹 Prefix: one state per line, then group identical state vectors
+        prefix_states = np.stack(
+            [self._prefix_states(self._line_symbols(prefix_stops, prefix_reels, line[:p])) for line in engine.lines],
+            axis=1,
+        )
+        groups, weights = np.unique(prefix_states, axis=0, return_counts=True)
+
+        # 🔹 Suffix: per-line payouts cached by (state, rows on the suffix reels)
+        suffix_cache = {}
+
+        def suffix_payouts(state, line):
+            key = (state, tuple(line[p:]))
+            if key not in suffix_cache:
+                symbols = self._line_symbols(suffix_stops, suffix_reels, line[p:])
+                suffix_cache[key] = self._suffix_payouts(state, symbols)
+            return suffix_cache[key]
+
+        pay_columns = engine.columns + 1
+        contributions = np.zeros(len(engine.symbols) * pay_columns, dtype=np.float64)
+        win_sum = 0.0
+        win_sq_sum = 0.0
+        hits = 0
+        max_win = 0.0
+
+        for states, weight in zip(groups, weights.tolist()):
+            if not states.any():
+                continue  # Every line dead: no win for any suffix
+
+            total_win = np.zeros(suffix_stops.shape[0], dtype=np.float64)
+            for line, state in zip(engine.lines.tolist(), states.tolist()):
+                if state == self.DEAD:
+                    continue
+                first_symbol, count, payout = suffix_payouts(state, line)
+                total_win += payout * bet
+                contributions += weight * np.bincount(
+                    first_symbol.astype(np.int64) * pay_columns + count,
+                    weights=payout * bet,
+                    minlength=contributions.size,
+                )
+
+            win_sum += weight * float(total_win.sum())
+            win_sq_sum += weight * float(np.dot(total_win, total_win))
+            hits += weight * int(np.count_nonzero(total_win > 0))
+            max_win = max(max_win, float(total_win.max()))
+
+        # 🔹 Results
+        mean_win = win_sum / combinations
+        variance = max(0.0, win_sq_sum / combinations - mean_win ** 2)
+        contributions = contributions.reshape(len(engine.symbols), pay_columns) / combinations / bet * 100
+
+        by_symbol = {}
+        for symbol_id, symbol in enumerate(engine.symbols):
+            counts = {count: float(contributions[symbol_id, count]) for count in range(pay_columns) if contributions[symbol_id, count] > 0}
+            if counts:
+                by_symbol[symbol] = counts
+
+        scatter_distribution = self.scatter_distribution()
+
+        return {
+            "combinations": combinations,
+            "base_rtp": mean_win / bet * 100,
+            "hit_frequency": hits / combinations,
+            "mean_win": mean_win,
+            "variance": variance,
+            "std_dev": variance ** 0.5,
+            "max_win": max_win,
+            "contributions": by_symbol,
+            "scatter_distribution": scatter_distribution,
+            "trigger_probability": sum(prob for k, prob in scatter_distribution.items() if k >= self.trigger_scatters),
+        }
@@ -0,0 +1,345 @@
+"""
+Performance benchmarks for the simulator.
+
+Usage (from the repository root):
+    python -m src.benchmarks.bench                       # run and print results
+    python -m src.benchmarks.bench --save-baseline       # store them as the baseline
+    python -m src.benchmarks.bench --output results.json # compare against the baseline and save
+
+Every metric is recorded with its unit and direction; a metric that moves in the wrong
+direction by more than --threshold (percent) against the baseline is flagged as a regression
+and the process exits with status 1.
+"""
+import argparse
+import contextlib
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from src.freeprngLib import pcg
+
+ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+# name → (unit, higher_is_better)
+METRICS = {
+    "rng_uint32_ns": ("ns/call", False),
+    "rng_int_between_ns": ("ns/call", False),
+    "rng_float_between_ns": ("ns/call", False),
+    "rng_bulk_uint32_ns": ("ns/value", False),
+    "config_load_cold_s": ("s", False),
+    "config_load_warm_s": ("s", False),
+    "base_spins_per_sec": ("spins/s", True),
+    "base_batch_spins_per_sec": ("spins/s", True),
+    "bonus_rounds_per_sec": ("rounds/s", True),
+    "bonus_batch_rounds_per_sec": ("rounds/s", True),
+    "simulation_spins_per_sec": ("spins/s", True),
+    "simulation_batch_spins_per_sec": ("spins/s", True),
+    "native_spins_per_sec": ("spins/s", True),
+}
+
+# Workload sizes: (full run, --quick run)
+SIZES = {
+    "rng_calls": (200000, 20000),
+    "base_spins": (50000, 5000),
+    "batch_spins": (500000, 50000),
+    "bonus_rounds": (2000, 200),
+    "bonus_batch_rounds": (50000, 5000),
+    "simulation_spins": (100000, 10000),
+    "simulation_batch_spins": (500000, 50000),
+    "native_spins": (2000000, 200000),
+}
+
+
+@contextlib.contextmanager
+def _quiet():
+    """Silences the loaders' progress logging (INFO and below) while measuring."""
+    previous = logging.root.manager.disable
+    logging.disable(logging.INFO)
+    try:
+        yield
+    finally:
+        logging.disable(previous)
+
+
+def _best_time(function, repeat):
+    """Runs function() `repeat` times; returns (best, median) wall time in seconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times), statistics.median(times)
+
+
+# ---- Benchmarks ----
+
+def bench_rng(repeat, quick):
+    n = SIZES["rng_calls"][quick]
+
+    def loop(call):
+        def run():
+            for _ in range(n):
+                call()
+        return run
+
+    results = {}
+    for name, call in (
+        ("rng_uint32_ns", pcg.get_uint32),
+        ("rng_int_between_ns", lambda: pcg.get_int_between(0, 49)),
+        ("rng_float_between_ns", lambda: pcg.get_float_between(0.0, 100.0)),
+    ):
+        best, median = _best_time(loop(call), repeat)
+        results[name] = (best / n * 1e9, median / n * 1e9)
+
+    buffer = np.empty(n, dtype=np.uint32)
+    best, median = _best_time(lambda: pcg.fill_uint32(buffer), repeat)
+    results["rng_bulk_uint32_ns"] = (best / n * 1e9, median / n * 1e9)
+    return results
+
+
+def bench_config_load(game_name, repeat, quick):
+    from importlib import import_module
+    from config.base.base_config_factory import BaseConfigFactory
+
+    settings_path = ROOT / "config" / "projects" / game_name / "game_settings.json"
+    with open(settings_path, "r", encoding="utf-8") as f:
+        game_settings = json.load(f)
+    bonus_factory_class = import_module(f"config.projects.{game_name}.bonus_config_factory").BonusConfigFactory
+
+    def load(use_cache):
+        def run():
+            with _quiet():
+                BaseConfigFactory(game_name).build(game_settings.get("base_data", []), use_cache=use_cache)
+                bonus_factory_class(game_name).build(game_settings.get("bonus_data", []), use_cache=use_cache)
+        return run
+
+    cold = _best_time(load(False), repeat)
+    load(True)()  # Make sure the compiled cache exists
+    warm = _best_time(load(True), repeat)
+    return {"config_load_cold_s": cold, "config_load_warm_s": warm}
+
+
+def bench_base(manager, repeat, quick):
+    n = SIZES["base_spins"][quick]
+    batch_n = SIZES["batch_spins"][quick]
+    game = manager.game
+
+    def scalar():
+        for _ in range(n):
+            game.spin()
+            game.evaluate_spin(1.0)
+            game.scatter_count()
+
+    def batched():
+        remaining = batch_n
+        while remaining > 0:
+            manager.batch_engine.spin_batch(min(10000, remaining), 1.0)
+            remaining -= 10000
+
+    best, median = _best_time(scalar, repeat)
+    batch_best, batch_median = _best_time(batched, repeat)
+    return {
+        "base_spins_per_sec": (n / best, n / median),
+        "base_batch_spins_per_sec": (batch_n / batch_best, batch_n / batch_median),
+    }
+
+
+def bench_bonus(manager, repeat, quick):
+    if not manager.bonus:
+        return {}
+    n = SIZES["bonus_rounds"][quick]
+    grid_size = (manager.game.grid.rows, manager.game.grid.columns)
+
+    def rounds():
+        for _ in range(n):
+            manager.bonus.start(scatters=manager.TRIGGER_SCATTERS, bet=1.0, gridSize=grid_size)
+
+    best, median = _best_time(rounds, repeat)
+    results = {"bonus_rounds_per_sec": (n / best, n / median)}
+
+    if manager.bonus_engine:
+        batch_n = SIZES["bonus_batch_rounds"][quick]
+        batch_best, batch_median = _best_time(
+            lambda: manager.bonus_engine.play(manager.TRIGGER_SCATTERS, batch_n, 1.0), repeat
+        )
+        results["bonus_batch_rounds_per_sec"] = (batch_n / batch_best, batch_n / batch_median)
+    return results
+
+
+def bench_simulation(manager, repeat, quick):
+    n = SIZES["simulation_spins"][quick]
+    batch_n = SIZES["simulation_batch_spins"][quick]
+    best, median = _best_time(lambda: manager.run_spins(n, 1.0), repeat)
+    batch_best, batch_median = _best_time(lambda: manager.run_spins(batch_n, 1.0, batch_size=10000), repeat)
+    return {
+        "simulation_spins_per_sec": (n / best, n / median),
+        "simulation_batch_spins_per_sec": (batch_n / batch_best, batch_n / batch_median),
+    }
+
+
+def bench_native(manager, repeat, quick):
+    try:
+        with _quiet():
+            manager.native_kernel()  # Build (or load) the kernel outside the timing
+    except RuntimeError as error:
+        print(f"⚠️ Skipping the native kernel benchmark: {error}")
+        return {}
+    n = SIZES["native_spins"][quick]
+    best, median = _best_time(lambda: manager.run_spins_native(n, 1.0), repeat)
+    return {"native_spins_per_sec": (n / best, n / median)}
+
+
+BENCHMARKS = ("rng", "config", "base", "bonus", "simulation", "native")
+
+
+# ---- Reporting ----
+
+def machine_metadata():
+    """Machine, interpreter and code version the results were measured on."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, timeout=10
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": commit,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor() or None,
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+    }
+
+
+def compare(results, baseline, threshold):
+    """
+    Compares every metric against the baseline.
+    Returns a list of {metric, baseline, value, change_pct, regression}.
+    """
+    comparison = []
+    for name, metric in results["metrics"].items():
+        old = baseline.get("metrics", {}).get(name)
+        if not old or not old["value"]:
+            continue
+        change = (metric["value"] - old["value"]) / old["value"] * 100
+        worse = -change if metric["higher_is_better"] else change
+        comparison.append({
+            "metric": name,
+            "baseline": old["value"],
+            "value": metric["value"],
+            "change_pct": change,
+            "regression": worse > threshold,
+        })
+    return comparison
+
+
+def print_report(results, comparison):
+    print("\nBenchmark Results\n")
+    changes = {row["metric"]: row for row in comparison}
+    for name, metric in results["metrics"].items():
+        line = f"{name:<32} {metric['value']:>16,.2f} {metric['unit']:<9}"
+        if name in changes:
+            row = changes[name]
+            flag = " ⚠️ REGRESSION" if row["regression"] else ""
+            line += f" ({row['change_pct']:+.1f}% vs baseline){flag}"
+        print(line)
+    print("\n────────────────────────────────")
+
+
+def run(game_name="mysterious_night", seed=12345, repeat=3, quick=False, only=None):
+    """Runs the selected benchmarks; returns the results dictionary."""
+    selected = only or BENCHMARKS
+    raw = {}
+
+    if "rng" in selected:
+        raw.update(bench_rng(repeat, quick))
+    if "config" in selected:
+        raw.update(bench_config_load(game_name, repeat, quick))
+
+    if {"base", "bonus", "simulation", "native"} & set(selected):
+        from src.GameManager import GameManager
+        with _quiet():
+            manager = GameManager(game_name)
+        pcg.set_seed(seed)
+        if "base" in selected:
+            raw.update(bench_base(manager, repeat, quick))
+        if "bonus" in selected:
+            raw.update(bench_bonus(manager, repeat, quick))
+        if "simulation" in selected:
+            raw.update(bench_simulation(manager, repeat, quick))
+        if "native" in selected:
+            raw.update(bench_native(manager, repeat, quick))
+
+    metrics = {}
+    for name, (best, median) in raw.items():
+        unit, higher_is_better = METRICS[name]
+        metrics[name] = {"value": best, "median": median, "unit": unit, "higher_is_better": higher_is_better}
+
+    return {
+        "game_name": game_name,
+        "seed": seed,
+        "repeat": repeat,
+        "quick": quick,
+        "metadata": machine_metadata(),
+        "metrics": metrics,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Slot simulator performance benchmarks.")
+    parser.add_argument("--game", default="mysterious_night", help="Project under config/projects.")
+    parser.add_argument("--seed", type=int, default=12345, help="PCG seed used for the workloads.")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions per benchmark (the best one is kept).")
+    parser.add_argument("--quick", action="store_true", help="Smaller workloads (smoke test).")
+    parser.add_argument("--only", nargs="+", choices=BENCHMARKS, help="Run only these benchmarks.")
+    parser.add_argument("--output", type=Path, help="Write the results JSON here.")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="Baseline JSON to compare against.")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the new baseline.")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Regression threshold in percent.")
+    args = parser.parse_args(argv)
+
+    results = run(args.game, args.seed, args.repeat, args.quick, args.only)
+
+    comparison = []
+    if args.baseline.exists() and not args.save_baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            comparison = compare(results, json.load(f), args.threshold)
+        results["comparison"] = {"baseline": str(args.baseline), "threshold_pct": args.threshold, "metrics": comparison}
+
+    print_report(results, comparison)
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results saved to {args.output} ✅")
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline saved to {args.baseline} ✅")
+
+    regressions = [row["metric"] for row in comparison if row["regression"]]
+    if regressions:
+        print(f"❌ Regressions beyond {args.threshold}%: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,6 @@
 import ctypes
 import os
+import numpy as np
 
 # Absolute path to the shared library (adjust if your layout differs)
 _here = os.path.abspath(os.path.dirname(__file__))
@@ -74,3 +75,245 @@ def get_float_between(min_val: float, max_val: float) -> float:
 
 def get_bool() -> bool:
     return bool(pcg.pcg_bool())
+
+# --- Pure-Python state arithmetic (mirrors libpcg_rng.so) ---
+
+PCG_MULTIPLIER = 0x5851F42D4C957F2D
+PCG_INCREMENT  = 0x14057B7EF767814F
+_MASK64        = 0xFFFFFFFFFFFFFFFF
+
+# Distance between per-worker streams: each stream may draw up to 2^48 numbers
+STREAM_STRIDE  = 1 << 48
+
+def seed_to_state(seed: int) -> int:
+    # Same state set_seed(seed) leaves in the native library, without touching it
+    state = PCG_INCREMENT
+    state = (state + (seed & _MASK64)) & _MASK64
+    return (state * PCG_MULTIPLIER + PCG_INCREMENT) & _MASK64
+
+def advance_state(state: int, delta: int) -> int:
+    # Jump the LCG ahead by delta steps in O(log delta) (Brown, "Random Number Generation with Arbitrary Stride")
+    acc_mult, acc_plus = 1, 0
+    cur_mult, cur_plus = PCG_MULTIPLIER, PCG_INCREMENT
+    delta &= _MASK64
+    while delta > 0:
+        if delta & 1:
+            acc_mult = (acc_mult * cur_mult) & _MASK64
+            acc_plus = (acc_plus * cur_mult + cur_plus) & _MASK64
+        cur_plus = ((cur_mult + 1) * cur_plus) & _MASK64
+        cur_mult = (cur_mult * cur_mult) & _MASK64
+        delta >>= 1
+    return (acc_mult * state + acc_plus) & _MASK64
+
+def stream_state(seed: int, stream_index: int) -> int:
+    # Starting state of a reproducible, non-overlapping stream derived from a master seed
+    return advance_state(seed_to_state(seed), stream_index * STREAM_STRIDE)
+
+
+# --- Bulk fills (vectorized, same sequence as n repeated scalar calls) ---
+#
+# The native library keeps a single global state. Bulk calls read it once, compute
+# every state of the block with precomputed jump-ahead coefficients
+# (state_i = A_i * state_0 + C_i mod 2^64), apply the PCG32 output function to the
+# whole array and write the result in place into the caller's buffer.
+
+_BLOCK = 4096
+_jump_mult = None
+_jump_plus = None
+_jump_mult_list = None
+_jump_plus_list = None
+
+_SHIFT_18 = np.uint64(18)
+_SHIFT_27 = np.uint64(27)
+_SHIFT_59 = np.uint64(59)
+_ROT_MASK = np.uint32(31)
+
+def _jump_tables():
+    global _jump_mult, _jump_plus, _jump_mult_list, _jump_plus_list
+    if _jump_mult is None:
+        mult, plus = [1], [0]
+        for _ in range(_BLOCK):
+            mult.append((mult[-1] * PCG_MULTIPLIER) & _MASK64)
+            plus.append((plus[-1] * PCG_MULTIPLIER + PCG_INCREMENT) & _MASK64)
+        _jump_mult_list, _jump_plus_list = mult, plus
+        _jump_mult = np.array(mult, dtype=np.uint64)
+        _jump_plus = np.array(plus, dtype=np.uint64)
+    return _jump_mult, _jump_plus
+
+def _advance(state: int, n: int) -> int:
+    # Table lookup for short jumps, general jump-ahead otherwise
+    if n <= _BLOCK:
+        _jump_tables()
+        return (_jump_mult_list[n] * state + _jump_plus_list[n]) & _MASK64
+    return advance_state(state, n)
+
+def _uint32_stream(state: int, n: int):
+    # Returns (n outputs of pcg32 starting at `state`, state after n draws)
+    mult, plus = _jump_tables()
+    if n <= _BLOCK:
+        states = mult[:n] * np.uint64(state)
+        states += plus[:n]
+    else:
+        states = np.empty(n, dtype=np.uint64)
+        for start in range(0, n, _BLOCK):
+            k = min(_BLOCK, n - start)
+            states[start:start + k] = mult[:k] * np.uint64(state) + plus[:k]
+            state = _advance(state, k)
+
+    xorshifted = states >> _SHIFT_18
+    xorshifted ^= states
+    xorshifted >>= _SHIFT_27
+    xorshifted = xorshifted.astype(np.uint32)
+    rot = (states >> _SHIFT_59).astype(np.uint32)
+    out = (xorshifted >> rot) | (xorshifted << (-rot & _ROT_MASK))
+    return out, _advance(state, n) if n <= _BLOCK else state
+
+def _as_output(buffer, n, dtype):
+    # Zero-copy writable 1-D view of `buffer` (NumPy array, array.array, memoryview...)
+    arr = buffer if isinstance(buffer, np.ndarray) else np.asarray(memoryview(buffer))
+    if not arr.flags.writeable:
+        raise ValueError("Output buffer is read-only")
+    if not arr.flags.c_contiguous:
+        raise ValueError("Output buffer must be C-contiguous")
+    if not np.can_cast(dtype, arr.dtype, casting="safe"):
+        raise TypeError(f"Cannot store {np.dtype(dtype)} values in a {arr.dtype} buffer")
+    flat = arr.reshape(-1)
+    n = flat.size if n is None else n
+    if n > flat.size:
+        raise ValueError(f"Buffer holds {flat.size} items, {n} requested")
+    return flat[:n]
+
+def _bounded_stream(state: int, low, span):
+    # Rejection sampling exactly as pcg_between: for each item draw until
+    # r >= (2^32 - span) % span, then return low + r % span. Rejections are rare, so the
+    # stream is generated in bulk and only re-aligned after a rejected draw.
+    n = span.size
+    threshold = (np.uint64(1 << 32) - span) % span
+    values = np.empty(n, dtype=np.int64)
+    done = 0
+    while done < n:
+        draws, next_state = _uint32_stream(state, n - done)
+        draws = draws.astype(np.uint64)
+        rejected = np.flatnonzero(draws < threshold[done:])
+        accepted = n - done if rejected.size == 0 else int(rejected[0])
+        values[done:done + accepted] = low[done:done + accepted] + (draws[:accepted] % span[done:done + accepted]).astype(np.int64)
+        # Skip the accepted draws plus the rejected one
+        state = next_state if rejected.size == 0 else advance_state(state, accepted + 1)
+        done += accepted
+    return values, state
+
+def _fill_between(out, min_val, max_val, inc_min, inc_max, unsigned):
+    n = out.size
+    min_arr = np.broadcast_to(np.asarray(min_val, dtype=np.int64), (n,))
+    max_arr = np.broadcast_to(np.asarray(max_val, dtype=np.int64), (n,))
+    low = np.minimum(min_arr, max_arr) + (0 if inc_min else 1)
+    high = np.maximum(min_arr, max_arr) - (0 if inc_max else 1)
+
+    # Empty ranges return `low` without consuming a draw (same as the native helpers)
+    draw = high >= low
+    values = low.copy()
+    state = get_state()
+    if draw.any():
+        span = (high[draw] - low[draw] + 1).astype(np.uint64)
+        if unsigned and np.any(span == np.uint64(1 << 32)):
+            raise ValueError("Full 32-bit range: use fill_uint32 instead")
+        values[draw], state = _bounded_stream(state, low[draw], span)
+    set_state(state)
+    out[:] = values
+    return out
+
+def fill_uint32(buffer, n: int = None):
+    """Fill `buffer` with n pcg32 outputs (same as n get_uint32 calls)."""
+    out = _as_output(buffer, n, np.uint32)
+    values, state = _uint32_stream(get_state(), out.size)
+    set_state(state)
+    out[:] = values
+    return out
+
+def fill_normalized(buffer, n: int = None):
+    """Fill `buffer` with n doubles in [0, 1) (same as n get_normalized calls)."""
+    out = _as_output(buffer, n, np.float64)
+    values, state = _uint32_stream(get_state(), out.size)
+    set_state(state)
+    out[:] = values * (1.0 / 4294967296.0)
+    return out
+
+def fill_int_between(buffer, min_val, max_val, inc_min: bool = True, inc_max: bool = True, n: int = None):
+    """
+    Fill `buffer` with n bounded ints (same as n get_int_between calls).
+    min_val / max_val may be scalars or arrays of length n (one range per item).
+    """
+    out = _as_output(buffer, n, np.int32)
+    return _fill_between(out, min_val, max_val, inc_min, inc_max, unsigned=False)
+
+def fill_uint_between(buffer, min_val, max_val, inc_min: bool = True, inc_max: bool = True, n: int = None):
+    """Fill `buffer` with n bounded unsigned ints (same as n get_uint_between calls)."""
+    out = _as_output(buffer, n, np.uint32)
+    return _fill_between(out, min_val, max_val, inc_min, inc_max, unsigned=True)
+
+def fill_float_between(buffer, min_val: float, max_val: float, n: int = None):
+    """Fill `buffer` with n doubles in [min, max) (same as n get_float_between calls)."""
+    out = _as_output(buffer, n, np.float64)
+    low, high = (min_val, max_val) if min_val <= max_val else (max_val, min_val)
+    values, state = _uint32_stream(get_state(), out.size)
+    set_state(state)
+    out[:] = values * (1.0 / 4294967296.0) * (high - low) + low
+    return out
+
+
+def peek_float_between(n: int, min_val: float, max_val: float):
+    """
+    Return the next n get_float_between values as a new array WITHOUT advancing the state.
+    Draw ahead when the number of draws needed is only known afterwards, then call skip().
+    """
+    low, high = (min_val, max_val) if min_val <= max_val else (max_val, min_val)
+    values, _ = _uint32_stream(get_state(), n)
+    return values * (1.0 / 4294967296.0) * (high - low) + low
+
+def skip(n: int) -> None:
+    """Advance the state by n draws (same as discarding n pcg32 outputs)."""
+    set_state(_advance(get_state(), n))
+
+
+# --- Pure-Python reference implementation (for testing the native and bulk paths) ---
+
+class ReferencePCG32:
+    """
+    Pure-Python PCG32 with the same constants, seeding and helpers as libpcg_rng.so.
+    Slow, but independent of ctypes and NumPy: use it to validate both paths.
+    """
+
+    def __init__(self, seed: int = None, state: int = 0):
+        self.state = seed_to_state(seed) if seed is not None else state & _MASK64
+
+    def uint32(self) -> int:
+        old = self.state
+        self.state = (old * PCG_MULTIPLIER + PCG_INCREMENT) & _MASK64
+        xorshifted = (((old >> 18) ^ old) >> 27) & 0xFFFFFFFF
+        rot = old >> 59
+        return ((xorshifted >> rot) | (xorshifted << ((-rot) & 31))) & 0xFFFFFFFF
+
+    def normalized(self) -> float:
+        return self.uint32() * (1.0 / 4294967296.0)
+
+    def int_between(self, min_val: int, max_val: int, inc_min: bool = True, inc_max: bool = True) -> int:
+        low, high = min(min_val, max_val), max(min_val, max_val)
+        low += 0 if inc_min else 1
+        high -= 0 if inc_max else 1
+        if high < low:
+            return low
+        span = high - low + 1
+        threshold = ((1 << 32) - span) % span
+        while True:
+            r = self.uint32()
+            if r >= threshold:
+                return low + r % span
+
+    uint_between = int_between
+
+    def float_between(self, min_val: float, max_val: float) -> float:
+        low, high = (min_val, max_val) if min_val <= max_val else (max_val, min_val)
+        return self.normalized() * (high - low) + low
+
+    def bool(self) -> bool:
+        return bool(self.uint32() >> 31)
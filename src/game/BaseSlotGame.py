@@ -6,54 +6,66 @@ class BaseSlotGame:
     Handles the grid, reels, paylines, and paytable mechanics directly.
     """
 
-    def __init__(self, grid, strips, paylines, paytable):
+    __slots__ = ("grid", "strips", "paylines", "paytable", "symbols", "stops", "evaluator")
+
+    def __init__(self, grid, strips, paylines, paytable, symbols=None, evaluator=None):
         self.grid = grid
-        self.strips = strips
         self.paylines = paylines
         self.paytable = paytable
+        self.symbols = symbols or grid.symbols
+
+        # Precomputed windows and Scatter counts for every stop, and the stops of the last spin
+        if strips.windows is None:
+            strips = strips.compile(grid.rows, self.symbols)
+        self.strips = strips
+        self.stops = [0] * grid.columns
+
+        # Compiled payline evaluator (flat line coordinates + dense payout tables)
+        self.evaluator = evaluator or paylines.compile(paytable, self.symbols, grid.columns)
 
     def spin(self, debug=False):
         """
         Performs a professional-style spin:
         - For each reel, selects a random starting index using the PCG RNG.
-        - Takes as many symbols as there are rows in the grid.
-        - Wraps around the reel strip if necessary.
+        - Copies the precomputed window of that stop (as many symbols as there are rows,
+          already wrapped around the reel strip) into the grid column.
+        The symbol IDs are written in place into grid.cells, which is returned.
         """
         if debug:
             print("\n🔄 Performing spin...")
 
-        num_rows = self.grid.rows
         num_reels = self.grid.columns
-        spin_result = [[] for _ in range(num_rows)]
+        cells = self.grid.cells
+        windows = self.strips.windows
 
-        # Iterate through each reel (strip)
+        # Iterate through each reel (strip): pick a stop and copy its precomputed window
+        # into the grid column in place (cells are row-major, so a column is a strided slice)
         for reel_index in range(num_reels):
-            reel = self.strips.reels[reel_index]
+            reel_windows = windows[reel_index]
             # 🔹 Use PCG RNG instead of random.randint
-            start_index = pcg.get_int_between(0, len(reel) - 1)
-
-            # Retrieve visible symbols (wrap around if needed)
-            visible = [reel[(start_index + i) % len(reel)] for i in range(num_rows)]
-
-            # Place symbols vertically into the grid
-            for row in range(num_rows):
-                spin_result[row].append(visible[row])
+            start_index = pcg.get_int_between(0, len(reel_windows) - 1)
+            self.stops[reel_index] = start_index
+            cells[reel_index::num_reels] = reel_windows[start_index]
 
         if debug:
             print("🎯 Spin result (grid):")
+            spin_result = self.grid.grid
 
-        # Compute the maximum width of each column for pretty printing
-        col_widths = [max(len(row[col]) for row in spin_result) for col in range(len(spin_result[0]))]
+            # Compute the maximum width of each column for pretty printing
+            col_widths = [max(len(row[col]) for row in spin_result) for col in range(len(spin_result[0]))]
 
-        # Print each row with alignment
-        for row in spin_result:
-            formatted_row = " | ".join(f"{symbol:<{col_widths[i]}}" for i, symbol in enumerate(row))
-            if debug:
+            # Print each row with alignment
+            for row in spin_result:
+                formatted_row = " | ".join(f"{symbol:<{col_widths[i]}}" for i, symbol in enumerate(row))
                 print(formatted_row)
 
-        # Update the internal grid state to reflect the current spin
-        self.grid.grid = spin_result
-        return spin_result
+        return cells
+
+
+    def scatter_count(self):
+        """Number of Scatters visible after the last spin (one per-stop lookup per reel)."""
+        scatter_counts = self.strips.scatter_counts
+        return sum(scatter_counts[reel][stop] for reel, stop in enumerate(self.stops))
 
 
     def evaluate_spin(self, bet=1.0, debug=False):
@@ -62,45 +74,32 @@ class BaseSlotGame:
         Wilds substitute for any symbol except Scatter.
         Returns the total win amount for this spin.
         """
-        total_win = 0.0
-        if debug:
-            print("\n💰 Evaluating spin...")
-
-        for i, line in enumerate(self.paylines.lines, start=1):
-            symbols = [self.grid.get_symbol(row, col) for col, row in enumerate(line)]
-
-            # Find the first non-Wild and non-Scatter symbol
-            first_symbol = next((s for s in symbols if s not in ["Wild", "Scatter"]), None)
-            if not first_symbol or first_symbol not in self.paytable.table:
-                continue
-
-            count = 0
-            for sym in symbols:
-                if sym == first_symbol or sym == "Wild":
-                    count += 1
-                else:
-                    break
-
-            # If 3 or more consecutive matches, award payout
-            if count >= 3:
-                payout = self.paytable.get_payout(first_symbol, count)
-                win_amount = payout * bet
-                total_win += win_amount
-                if debug:
-                    print(f"✅ Line {i}: {count}x {first_symbol} (with Wilds) → {win_amount:.2f}")
+        if not debug:
+            return self.evaluator.evaluate(self.grid.cells, bet)
 
-        if debug:
-            print(f"\n🏆 Total Win: {total_win:.2f}\n")
-            
+        print("\n💰 Evaluating spin...")
+        total_win = 0.0
+        cells = self.grid.cells
+        for i, win_amount in enumerate(self.line_wins(bet), start=1):
+            total_win += win_amount
+            if win_amount > 0:
+                first_symbol, count, _ = self.evaluator.line_result(cells, i - 1)
+                print(f"✅ Line {i}: {count}x {self.symbols.names[first_symbol]} (with Wilds) → {win_amount:.2f}")
+
+        print(f"\n🏆 Total Win: {total_win:.2f}\n")
         return total_win
 
+    def line_wins(self, bet=1.0):
+        """Returns the win of every payline on the current grid, in payline order (for analytics)."""
+        return [payout * bet for payout in self.evaluator.line_payouts(self.grid.cells)]
+
 
     def show_summary(self):
         """
         Prints a quick summary of the current slot game configuration.
         """
         print("\n📊 Game Summary:")
-        print(f"Grid size: {int(self.grid.data.loc[0, 'Rows'])}x{int(self.grid.data.loc[0, 'Columns'])}" if self.grid.data is not None else "Grid size: Unknown")
+        print(f"Grid size: {self.grid.rows}x{self.grid.columns}")
         print(f"Strips: {len(self.strips.reels)} reels")
         print(f"Paylines: {len(self.paylines.lines)} lines")
-        print(f"Paytable symbols: {len(self.paytable.table)} symbols")
+        print(f"Paytable symbols: {len(self.paytable.names)} symbols")
@@ -1,14 +1,147 @@
+import argparse
+import json
+import logging
+import sys
+import time
+
 from src.GameManager import GameManager
 from src.freeprngLib import pcg
-import os
-import time
+from src.simulation.parallel import run_parallel
+from src.simulation.replay import ReplayRecorder
+
+logger = logging.getLogger(__name__)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Slot RTP simulator.")
+    parser.add_argument("--game", help="Project under config/projects (defaults to settings.json).")
+    parser.add_argument("--seed", type=int, help="PCG seed (defaults to the current time).")
+    parser.add_argument("--spins", type=int, default=2000000, help="Number of base spins to simulate.")
+    parser.add_argument("--bet", type=float, default=1.0, help="Bet amount per spin.")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes; with more than one, the spins are split into blocks played on "
+                             "their own PCG streams of the seed (same result for any worker count above one).")
+    parser.add_argument("--batch-size", type=int, help="Vectorized batch size for the base spins.")
+    parser.add_argument("--native", action="store_true",
+                        help="Play the spins with the project's compiled kernel (same results as the scalar engine).")
+    parser.add_argument("--confidence", type=float, default=0.95, help="Confidence level of the RTP interval.")
+    parser.add_argument("--format", choices=("text", "json"), default="text", help="Output format of the results.")
+    parser.add_argument("--output", help="Write the results to this file instead of stdout.")
+    parser.add_argument("--quiet", action="store_true", help="Only log warnings and errors (to stderr).")
+    parser.add_argument("--replay-log", help="Replay log file: spins selected by --record-threshold / "
+                                             "--record-interval are appended to it.")
+    parser.add_argument("--record-threshold", type=float, help="Record spins winning at least this many bets.")
+    parser.add_argument("--record-interval", type=int, help="Record every N-th spin.")
+    parser.add_argument("--replay-spin", type=int, help="Replay this spin from --replay-log (with debug output) "
+                                                         "instead of simulating.")
+    args = parser.parse_args(argv)
+
+    if (args.replay_spin is not None or args.record_threshold is not None or args.record_interval) and not args.replay_log:
+        parser.error("--replay-spin, --record-threshold and --record-interval need --replay-log")
+    if args.native and (args.workers > 1 or args.batch_size or args.replay_log):
+        parser.error("--native runs a single stream with the scalar rules: drop --workers, --batch-size and --replay-log")
+    if args.replay_log and args.replay_spin is None and args.workers > 1:
+        parser.error("--replay-log records a single simulation stream: use --workers 1")
+    return args
+
+
+def simulate(args):
+    """Runs the simulation described by the parsed arguments and returns the results dictionary."""
+    seed = args.seed if args.seed is not None else time.time_ns() & ((1 << 64) - 1)
+    manager = GameManager(args.game)
+
+    start = time.perf_counter()
+    if args.workers > 1:
+        logger.info(f"RTP Simulation In Progress on {args.workers} workers...")
+        counters = run_parallel(manager.game_name, seed, args.workers, args.spins, args.bet, args.batch_size)
+    else:
+        logger.info("RTP Simulation In Progress...")
+        pcg.set_seed(seed)
+        if args.native:
+            counters = manager.run_spins_native(args.spins, args.bet)
+        elif args.replay_log:
+            with ReplayRecorder(args.replay_log, args.bet, manager.game_name,
+                                args.record_threshold, args.record_interval) as recorder:
+                counters = manager.run_spins(args.spins, args.bet, args.batch_size, recorder=recorder)
+            logger.info(f"{recorder.records:,} spins recorded in {args.replay_log} ✅")
+        else:
+            counters = manager.run_spins(args.spins, args.bet, args.batch_size)
+    elapsed = time.perf_counter() - start
+    logger.info("Simulation complete! ✅")
+
+    ci_low, ci_high = counters.rtp_confidence_interval(args.confidence)
+    return {
+        "game": manager.game_name,
+        "seed": seed,
+        "spins": counters.spins,
+        "bet": args.bet,
+        "workers": args.workers,
+        "batch_size": args.batch_size,
+        "native": args.native,
+        "elapsed_s": elapsed,
+        "spins_per_sec": counters.spins / elapsed if elapsed > 0 else 0.0,
+        "rtp": counters.total_rtp,
+        "base_rtp": counters.base_rtp,
+        "bonus_rtp": counters.bonus_rtp,
+        "confidence": args.confidence,
+        "ci_low": ci_low,
+        "ci_high": ci_high,
+        "summary": counters.summary(),
+        "distribution": counters.win_distribution(),
+        "counters": counters.to_dict(),
+    }
+
+
+def format_text(results):
+    summary = results["summary"]
+    distribution = results["distribution"]
+    lines = [
+        f"Game:        {results['game']}",
+        f"Seed:        {results['seed']}",
+        f"Spins:       {results['spins']:,} ({results['spins_per_sec']:,.0f} spins/s)",
+        "",
+        f"🎯 Base RTP:  {results['base_rtp']:.4f}%",
+        f"🎯 Bonus RTP: {results['bonus_rtp']:.4f}%",
+        f"🏁 TOTAL RTP: {results['rtp']:.4f}% "
+        f"({results['confidence']:.0%} CI: {results['ci_low']:.4f}% – {results['ci_high']:.4f}%)",
+        "",
+        f"Bonus Played: {summary['bonus_triggers']:,}",
+        f"Avg spins per bonus: {summary['avg_bonus_spins']:.2f}",
+        f"Avg total multiplier per bonus: {summary['avg_total_multi_per_bonus']:.3f}",
+        "",
+        f"Hit rate:         {distribution['hit_rate']:.2%}",
+        f"Std deviation:    {distribution['std_dev']:.3f} x bet",
+        f"Volatility index: {distribution['volatility_index']:.3f} ({distribution['volatility_confidence']:.0%})",
+        f"Max win:          {distribution['max_win']:,.2f} x bet",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    # Logs go to stderr, so stdout only ever carries the results
+    logging.basicConfig(
+        level=logging.WARNING if args.quiet else logging.INFO,
+        format="%(message)s",
+        stream=sys.stderr,
+    )
+
+    if args.replay_spin is not None:
+        result = GameManager(args.game).replay_spin(args.replay_log, args.replay_spin, debug=True)
+        return 0 if result["matches"] else 1
+
+    results = simulate(args)
+    text = json.dumps(results, indent=2) + "\n" if args.format == "json" else format_text(results)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+        logger.info(f"Results saved to {args.output} ✅")
+    else:
+        sys.stdout.write(text)
+    return 0
 
-def main():
-    os.system('cls' if os.name == 'nt' else 'clear')
-    
-    pcg.set_seed(int(time.time_ns()))
-    manager = GameManager()
-    manager.simulate_rtp(True)
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
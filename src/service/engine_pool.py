@@ -0,0 +1,91 @@
+"""
+Warm engines for the job server's worker processes.
+
+Every worker process keeps a bounded LRU of GameManager instances keyed by game and config
+overrides, so consecutive jobs on the same game skip the imports, the config load and the
+engine compilation. Overridden variants are rebuilt from the cached base instance's
+compiled config (see src/simulation/sweep.py), never from the workbook.
+"""
+import json
+from collections import OrderedDict
+from pathlib import Path
+from src.freeprngLib import pcg
+from src.simulation.counters import SimulationCounters
+
+# Engines kept per worker process
+POOL_SIZE = 4
+
+# Spins played between two checks of a job's cancel flag
+CANCEL_CHECK_SPINS = 20000
+
+_engines = OrderedDict()
+
+
+def init_worker(pool_size=POOL_SIZE, preload=()):
+    """Process pool initializer: sets the LRU size and warms the given games."""
+    global POOL_SIZE
+    POOL_SIZE = pool_size
+    for game_name in preload:
+        get_engine(game_name)
+
+
+def _default_game():
+    # Same default as GameManager, resolved without loading a game
+    settings_path = Path(__file__).resolve().parents[1] / "settings.json"
+    with open(settings_path, "r", encoding="utf-8") as f:
+        return json.load(f).get("game_name") or "mysterious_night"
+
+
+def _key(game_name, overrides):
+    return game_name, json.dumps(overrides or {}, sort_keys=True)
+
+
+def get_engine(game_name, overrides=None):
+    """The warm GameManager for a game (with overrides applied), building it on a miss."""
+    from src.GameManager import GameManager
+    from src.simulation.sweep import apply_overrides
+
+    game_name = game_name or _default_game()
+    key = _key(game_name, overrides)
+    engine = _engines.get(key)
+    if engine is not None:
+        _engines.move_to_end(key)
+        return engine
+
+    if overrides:
+        base = get_engine(game_name)
+        config = apply_overrides(base.export_config(), overrides)
+        engine = GameManager.from_config(base.game_name, config["base"], config["bonus"])
+    else:
+        engine = GameManager(game_name)
+
+    _engines[key] = engine
+    while len(_engines) > POOL_SIZE:
+        _engines.popitem(last=False)
+    return engine
+
+
+def cached_engines():
+    """(game, overrides) keys of the engines warm in this worker, least recently used first."""
+    return [(game_name, json.loads(overrides)) for game_name, overrides in _engines]
+
+
+def run_chunk(game_name, overrides, seed, chunk_index, spins, bet, batch_size, cancel_event=None):
+    """
+    Plays one chunk of a job on PCG stream chunk_index of the seed; returns the raw counters.
+    With cancel_event (a multiprocessing.Manager Event shared with the server), the chunk is
+    played in slices of whole batches and abandoned (returning None) once the event is set.
+    Slicing on batch boundaries leaves the results identical to a single run_spins call.
+    """
+    engine = get_engine(game_name, overrides)
+    pcg.set_state(pcg.stream_state(seed, chunk_index))
+    counters = SimulationCounters(stream=chunk_index)
+    if cancel_event is None:
+        return engine.run_spins(spins, bet, batch_size, counters).to_dict()
+
+    step = batch_size * max(1, CANCEL_CHECK_SPINS // batch_size) if batch_size else CANCEL_CHECK_SPINS
+    while counters.spins < spins:
+        if cancel_event.is_set():
+            return None
+        engine.run_spins(min(step, spins - counters.spins), bet, batch_size, counters)
+    return counters.to_dict()
@@ -0,0 +1,399 @@
+"""
+Local simulation job server (asyncio, JSON over HTTP or a Unix socket).
+
+Usage (from the repository root):
+    python -m src.service.job_server --port 8765 --workers 4
+    python -m src.service.job_server --unix /tmp/slot_sim.sock --preload mysterious_night
+
+API:
+    POST   /jobs              {"game", "spins", "seed", "bet", "batch_size", "chunk_size", "overrides"}
+                              → 202 {"id", ...}
+    GET    /jobs              → every known job (without results)
+    GET    /jobs/<id>         → status, progress and, once done, the results
+    GET    /jobs/<id>/events  → progress stream (chunked NDJSON, one event per finished chunk)
+    DELETE /jobs/<id>         → cancels a queued or running job (chunks already playing stop
+                                at their next cancel check)
+    GET    /health            → {"status": "ok", ...}
+
+A job is split into chunks of chunk_size spins; chunk k plays PCG stream k of the job's
+seed, so results only depend on (seed, spins, chunk_size, batch_size, overrides) and not
+on scheduling. Chunks of all running jobs share the process pool round-robin, and every
+worker keeps warm GameManagers (src/service/engine_pool.py), so small jobs cost their
+simulation time rather than a process start and a config load.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import math
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+from src.service import engine_pool
+from src.simulation.counters import SimulationCounters
+from src.simulation.sweep import check_override_path
+
+logger = logging.getLogger(__name__)
+
+MAX_BODY = 1 << 20
+FINISHED_JOBS_KEPT = 1000
+JOB_STATES = ("queued", "running", "done", "failed", "cancelled")
+
+
+def _is_integer(value):
+    # JSON true / false arrive as bool, which is an int subclass
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _is_number(value):
+    return _is_integer(value) or (isinstance(value, float) and math.isfinite(value))
+
+
+class Job:
+    """One simulation job: its parameters, chunk progress and merged results."""
+
+    def __init__(self, job_id, params):
+        self.id = job_id
+        self.params = params
+        self.status = "queued"
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.error = None
+
+        spins, chunk_size = params["spins"], params["chunk_size"]
+        self.chunks = [min(chunk_size, spins - start) for start in range(0, spins, chunk_size)]
+        self.results = [None] * len(self.chunks)
+        self.chunks_done = 0
+        self.spins_done = 0
+        self.progress = SimulationCounters()  # Chunks merged in completion order (for progress only)
+        self.counters = None  # Chunks merged in chunk order once done
+
+        self.task = None
+        self.cancel_event = None  # Shared with the workers playing its chunks
+        self.changed = asyncio.Event()
+
+    @property
+    def finished_state(self):
+        return self.status in ("done", "failed", "cancelled")
+
+    def notify(self):
+        self.changed.set()
+        self.changed = asyncio.Event()
+
+    def snapshot(self, results=True):
+        """JSON-ready view of the job."""
+        elapsed = ((self.finished or time.time()) - self.started) if self.started else 0.0
+        view = {
+            "id": self.id,
+            "status": self.status,
+            "params": self.params,
+            "chunks": len(self.chunks),
+            "chunks_done": self.chunks_done,
+            "spins_done": self.spins_done,
+            "progress": self.spins_done / self.params["spins"],
+            "rtp": self.progress.total_rtp,
+            "elapsed_s": elapsed,
+            "spins_per_sec": self.spins_done / elapsed if elapsed > 0 else 0.0,
+            "error": self.error,
+        }
+        if results and self.counters is not None:
+            ci_low, ci_high = self.counters.rtp_confidence_interval(self.params["confidence"])
+            view["results"] = {
+                "rtp": self.counters.total_rtp,
+                "base_rtp": self.counters.base_rtp,
+                "bonus_rtp": self.counters.bonus_rtp,
+                "ci_low": ci_low,
+                "ci_high": ci_high,
+                "summary": self.counters.summary(),
+                "distribution": self.counters.win_distribution(),
+                "counters": self.counters.to_dict(),
+            }
+        return view
+
+
+class JobServer:
+    """
+    Keeps the jobs and runs their chunks on a process pool (at most `workers` chunks in flight,
+    shared fairly between running jobs).
+    """
+
+    def __init__(self, workers=2, pool_size=engine_pool.POOL_SIZE, preload=()):
+        self.workers = workers
+        self.pool = ProcessPoolExecutor(
+            max_workers=workers, initializer=engine_pool.init_worker, initargs=(pool_size, tuple(preload))
+        )
+        if preload:
+            self.pool.submit(engine_pool.cached_engines)  # Starts the workers (and their preloads) right away
+        # Cross-process cancel flags: chunks already in the pool stop at their next check
+        self.manager = multiprocessing.Manager()
+        self.slots = asyncio.Semaphore(workers)
+        self.jobs = {}
+        self._ids = itertools.count(1)
+
+    def close(self):
+        for job in self.jobs.values():
+            if job.task and not job.task.done():
+                job.task.cancel()
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        self.manager.shutdown()
+
+    # --------------------------------------------------------------
+    @staticmethod
+    def parse_params(body):
+        """Validates a job request; raises ValueError with a client-facing message."""
+        if not isinstance(body, dict):
+            raise ValueError("job must be a JSON object")
+        unknown = set(body) - {"game", "spins", "seed", "bet", "batch_size", "chunk_size", "overrides", "confidence"}
+        if unknown:
+            raise ValueError(f"unknown job fields: {', '.join(sorted(unknown))}")
+
+        params = {
+            "game": body.get("game"),
+            "spins": body.get("spins", 1000000),
+            "seed": body.get("seed", time.time_ns() & ((1 << 64) - 1)),
+            "bet": body.get("bet", 1.0),
+            "batch_size": body.get("batch_size"),
+            "chunk_size": body.get("chunk_size", 100000),
+            "overrides": body.get("overrides") or {},
+            "confidence": body.get("confidence", 0.95),
+        }
+        if params["game"] is not None and not isinstance(params["game"], str):
+            raise ValueError("game must be a string")
+        for name in ("spins", "chunk_size"):
+            if not _is_integer(params[name]) or params[name] < 1:
+                raise ValueError(f"{name} must be a positive integer")
+        if params["batch_size"] is not None and (not _is_integer(params["batch_size"]) or params["batch_size"] < 1):
+            raise ValueError("batch_size must be a positive integer")
+        if not _is_integer(params["seed"]) or not 0 <= params["seed"] < 1 << 64:
+            raise ValueError("seed must be an integer in [0, 2**64)")
+        if not _is_number(params["bet"]) or params["bet"] <= 0:
+            raise ValueError("bet must be a positive number")
+        if not _is_number(params["confidence"]) or not 0 < params["confidence"] < 1:
+            raise ValueError("confidence must be a number in (0, 1)")
+        if not isinstance(params["overrides"], dict):
+            raise ValueError("overrides must be an object of {path: value}")
+        for path in params["overrides"]:
+            try:
+                check_override_path(path)
+            except ValueError:
+                raise ValueError(f"unknown override {path!r}") from None
+        return params
+
+    def submit(self, params):
+        job = Job(str(next(self._ids)), params)
+        job.cancel_event = self.manager.Event()
+        self.jobs[job.id] = job
+        job.task = asyncio.create_task(self._run(job))
+        self._forget_old_jobs()
+        return job
+
+    def cancel(self, job):
+        if job.finished_state:
+            return
+        job.cancel_event.set()
+        job.task.cancel()
+        if job.status == "queued":
+            # A task cancelled before its first step never reaches _run's cleanup
+            job.status, job.finished = "cancelled", time.time()
+            job.notify()
+
+    def _forget_old_jobs(self):
+        finished = [job for job in self.jobs.values() if job.finished_state]
+        for job in finished[:max(0, len(finished) - FINISHED_JOBS_KEPT)]:
+            del self.jobs[job.id]
+
+    # --------------------------------------------------------------
+    async def _run(self, job):
+        params = job.params
+        pending = iter(range(len(job.chunks)))
+        loop = asyncio.get_running_loop()
+
+        async def chunk_runner():
+            # Takes the job's next chunk each time a pool slot frees up
+            for index in pending:
+                async with self.slots:
+                    if job.status == "queued":
+                        job.status, job.started = "running", time.time()
+                        job.notify()
+                    result = await loop.run_in_executor(
+                        self.pool, engine_pool.run_chunk, params["game"], params["overrides"],
+                        params["seed"], index, job.chunks[index], params["bet"], params["batch_size"],
+                        job.cancel_event,
+                    )
+                job.results[index] = result
+                job.progress.merge(SimulationCounters.from_dict(result))
+                job.chunks_done += 1
+                job.spins_done += job.chunks[index]
+                job.notify()
+
+        runners = [asyncio.create_task(chunk_runner()) for _ in range(min(self.workers, len(job.chunks)))]
+        try:
+            await asyncio.gather(*runners)
+            counters = SimulationCounters()
+            for result in job.results:
+                counters.merge(SimulationCounters.from_dict(result))
+            job.counters = counters
+            job.status = "done"
+        except asyncio.CancelledError:
+            job.status = "cancelled"
+        except Exception as error:  # Reported to the client through the job
+            job.status, job.error = "failed", f"{type(error).__name__}: {error}"
+            logger.warning(f"⚠️ Job {job.id} failed: {job.error}")
+        finally:
+            for runner in runners:
+                runner.cancel()
+            await asyncio.gather(*runners, return_exceptions=True)
+            job.finished = time.time()
+            job.notify()
+        logger.info(f"Job {job.id} {job.status} ({job.spins_done:,}/{params['spins']:,} spins)")
+
+    # ---- HTTP ----
+
+    async def handle(self, reader, writer):
+        try:
+            method, path, body = await self._read_request(reader)
+            await self._dispatch(method, path, body, writer)
+        except ValueError as error:
+            await self._respond(writer, HTTPStatus.BAD_REQUEST, {"error": str(error)})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            try:
+                writer.close()
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    @staticmethod
+    async def _read_request(reader):
+        request_line = (await reader.readline()).decode("latin-1").strip()
+        parts = request_line.split()
+        if len(parts) != 3:
+            raise ValueError("malformed request line")
+        method, path, _ = parts
+
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode("latin-1")
+            if line in ("\r\n", "\n", ""):
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        length = int(headers.get("content-length", 0) or 0)
+        if length > MAX_BODY:
+            raise ValueError("request body too large")
+        body = None
+        if length:
+            try:
+                body = json.loads(await reader.readexactly(length))
+            except json.JSONDecodeError as error:
+                raise ValueError(f"invalid JSON: {error}")
+        return method.upper(), path.split("?", 1)[0].rstrip("/") or "/", body
+
+    async def _dispatch(self, method, path, body, writer):
+        parts = path.strip("/").split("/")
+
+        if method == "GET" and parts == ["health"]:
+            counts = {state: sum(job.status == state for job in self.jobs.values()) for state in JOB_STATES}
+            return await self._respond(writer, HTTPStatus.OK, {"status": "ok", "workers": self.workers, "jobs": counts})
+
+        if parts[0] != "jobs" or len(parts) > 3:
+            return await self._respond(writer, HTTPStatus.NOT_FOUND, {"error": f"no route for {path}"})
+
+        if len(parts) == 1:
+            if method == "POST":
+                job = self.submit(self.parse_params(body))
+                return await self._respond(writer, HTTPStatus.ACCEPTED, job.snapshot(results=False))
+            if method == "GET":
+                return await self._respond(writer, HTTPStatus.OK, [job.snapshot(results=False) for job in self.jobs.values()])
+            return await self._respond(writer, HTTPStatus.METHOD_NOT_ALLOWED, {"error": f"{method} not allowed"})
+
+        job = self.jobs.get(parts[1])
+        if job is None:
+            return await self._respond(writer, HTTPStatus.NOT_FOUND, {"error": f"unknown job {parts[1]}"})
+
+        if len(parts) == 3 and parts[2] == "events" and method == "GET":
+            return await self._stream_events(job, writer)
+        if len(parts) == 2 and method == "GET":
+            return await self._respond(writer, HTTPStatus.OK, job.snapshot())
+        if len(parts) == 2 and method == "DELETE":
+            self.cancel(job)
+            return await self._respond(writer, HTTPStatus.ACCEPTED, job.snapshot(results=False))
+        return await self._respond(writer, HTTPStatus.NOT_FOUND, {"error": f"no route for {method} {path}"})
+
+    @staticmethod
+    async def _respond(writer, status, payload):
+        body = (json.dumps(payload) + "\n").encode("utf-8")
+        writer.write(
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: close\r\n\r\n".encode("latin-1") + body
+        )
+        await writer.drain()
+
+    @staticmethod
+    async def _stream_events(job, writer):
+        """Streams one NDJSON progress event per change until the job finishes (the last one has the results)."""
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\n"
+            b"Transfer-Encoding: chunked\r\nConnection: close\r\n\r\n"
+        )
+
+        def chunk(payload):
+            data = (json.dumps(payload) + "\n").encode("utf-8")
+            return f"{len(data):x}\r\n".encode("latin-1") + data + b"\r\n"
+
+        while True:
+            changed = job.changed
+            finished = job.finished_state
+            writer.write(chunk(job.snapshot(results=finished)))
+            await writer.drain()
+            if finished:
+                break
+            await changed.wait()
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+
+async def serve(host="127.0.0.1", port=8765, unix_path=None, workers=2, pool_size=engine_pool.POOL_SIZE, preload=()):
+    server = JobServer(workers, pool_size, preload)
+    if unix_path:
+        listener = await asyncio.start_unix_server(server.handle, path=unix_path)
+        logger.info(f"Job server listening on {unix_path} ({workers} workers) ✅")
+    else:
+        listener = await asyncio.start_server(server.handle, host, port)
+        logger.info(f"Job server listening on http://{host}:{port} ({workers} workers) ✅")
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local slot simulation job server.")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on.")
+    parser.add_argument("--port", type=int, default=8765, help="TCP port to listen on.")
+    parser.add_argument("--unix", help="Listen on this Unix socket instead of TCP.")
+    parser.add_argument("--workers", type=int, default=2, help="Worker processes running the chunks.")
+    parser.add_argument("--pool-size", type=int, default=engine_pool.POOL_SIZE,
+                        help="Warm GameManagers kept per worker (LRU).")
+    parser.add_argument("--preload", nargs="*", default=(), help="Games each worker loads at startup.")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stderr)
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix, args.workers, args.pool_size, args.preload))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,29 @@
+import json
+import os
+from pathlib import Path
+
+CHECKPOINT_VERSION = 1
+
+
+def save_checkpoint(path, payload):
+    """Write a checkpoint atomically: a crash never leaves a half-written file behind."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"version": CHECKPOINT_VERSION, **payload}, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(path):
+    """Return the checkpoint payload, or None if there is no checkpoint at `path`."""
+    path = Path(path)
+    if not path.exists():
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        payload = json.load(f)
+    if payload.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(f"❌ Unsupported checkpoint version in {path}: {payload.get('version')}")
+    return payload
@@ -0,0 +1,269 @@
+import numpy as np
+from src.simulation.statistics import RunningStats, LogHistogram, TopWins, z_score
+
+
+class SimulationCounters:
+    """
+    Aggregated counters of an RTP simulation (base + bonus).
+    Counters from independent runs can be merged, so a simulation can be split
+    across workers and recombined into the same totals.
+
+    Besides the sums, it streams the win distribution in fixed memory: a log-bucketed
+    histogram of the total win of every spin (base + its bonus, in multiples of the bet),
+    the top wins with their spin index, and per bonus level the win stats and histogram.
+
+    Spin indexes are local to the PCG stream the counters play (`stream`: the worker, sweep
+    block or job chunk), matching the replay log of that stream; merged top wins keep the
+    stream of each entry.
+    """
+
+    FIELDS = (
+        "spins",
+        "total_bet",
+        "base_win_total",
+        "bonus_win_total",
+        "bonus_triggers",
+        "bonus_total_spins",
+        "total_cf_count",
+        "total_chest_spins",
+        "total_bonus_multiplier_sum",
+        "total_bonus_multi_when_chest",
+        "total_bonus_multiplier_final",
+        "base_bonus_cross_sum",
+        "base_hits",  # Spins with a base win
+        "bonus_only_hits",  # Spins without a base win whose bonus paid
+    )
+
+    # Mergeable online variance trackers (Welford)
+    STATS = (
+        "base_win_stats",  # Base win of every spin
+        "bonus_win_stats",  # Bonus win of every triggered round
+    )
+
+    # Largest wins kept (with their spin index)
+    TOP_WINS = 20
+
+    def __init__(self, stream=0, **values):
+        self.stream = int(stream)
+        for field in self.FIELDS:
+            setattr(self, field, values.get(field, 0))
+        self.total_bet = float(self.total_bet)
+        self.base_win_total = float(self.base_win_total)
+        self.bonus_win_total = float(self.bonus_win_total)
+        self.base_bonus_cross_sum = float(self.base_bonus_cross_sum)
+        for name in self.STATS:
+            stats = values.get(name)
+            setattr(self, name, RunningStats.from_dict(stats) if isinstance(stats, dict) else stats or RunningStats())
+
+        histogram = values.get("win_histogram")
+        self.win_histogram = LogHistogram.from_dict(histogram) if histogram else LogHistogram()
+        top_wins = values.get("top_wins")
+        self.top_wins = TopWins.from_dict(top_wins) if top_wins else TopWins(self.TOP_WINS)
+        # {level_id: {"stats": RunningStats, "histogram": LogHistogram}} of bonus wins (in bets)
+        self.bonus_levels = {
+            int(level_id): {
+                "stats": RunningStats.from_dict(level["stats"]),
+                "histogram": LogHistogram.from_dict(level["histogram"]),
+            }
+            for level_id, level in (values.get("bonus_levels") or {}).items()
+        }
+
+    def __repr__(self):
+        return f"<SimulationCounters {self.spins:,} spins, RTP {self.total_rtp:.2f}%>"
+
+    # --------------------------------------------------------------
+    def add_base(self, win, bet):
+        """Records the base win of the next spin (its bonus, if any, is added by add_bonus)."""
+        self.base_win_stats.add(win)
+        if win > 0:
+            self.base_hits += 1
+            self.win_histogram.add(win / bet)
+            self.top_wins.add(win, self.spins, self.stream)
+        else:
+            self.win_histogram.counts[0] += 1
+
+    def add_base_batch(self, wins, bet):
+        """Records the base wins of the next len(wins) spins (NumPy array)."""
+        self.base_win_stats.add_many(wins)
+        self.base_hits += int(np.count_nonzero(wins > 0))
+        self.win_histogram.add_many(wins / bet)
+        self.top_wins.add_many(wins, self.spins, self.stream)
+
+    def add_bonus(self, bonus, bonus_win, base_win=0.0, bet=1.0, level_id=None):
+        """
+        Adds the result and debug counters of a bonus round triggered by the last counted spin,
+        and updates that spin's entry in the win distribution to its total win.
+
+        Args:
+            bonus: The bonus game, after start().
+            bonus_win (float): Win of the round.
+            base_win (float): Base win of the triggering spin.
+            bet (float): Bet of the triggering spin.
+            level_id (int): Level the round started at.
+        """
+        spins_done = getattr(bonus, "spins_played", 0)
+
+        self.base_bonus_cross_sum += base_win * bonus_win
+        if base_win <= 0 and bonus_win > 0:
+            self.bonus_only_hits += 1
+        if bonus_win > 0:
+            self.win_histogram.move(base_win / bet, (base_win + bonus_win) / bet)
+            self.top_wins.add(base_win + bonus_win, self.spins - 1, self.stream)
+
+        if level_id is not None:
+            level = self.bonus_levels.get(level_id)
+            if level is None:
+                level = self.bonus_levels[level_id] = {"stats": RunningStats(), "histogram": LogHistogram()}
+            level["stats"].add(bonus_win / bet)
+            level["histogram"].add(bonus_win / bet)
+
+        self.bonus_triggers += 1
+        self.bonus_win_total += bonus_win
+        self.bonus_win_stats.add(bonus_win)
+        self.bonus_total_spins += spins_done
+        self.total_cf_count += getattr(bonus, "debug_cf_count", 0)
+        self.total_chest_spins += getattr(bonus, "debug_spins_with_chest", 0)
+        self.total_bonus_multiplier_sum += getattr(bonus, "debug_multi_sum", 0)
+        self.total_bonus_multi_when_chest += getattr(bonus, "debug_multi_when_chest", 0)
+        self.total_bonus_multiplier_final += getattr(bonus, "total_multiplier", 0)
+
+    def merge(self, other):
+        """
+        Adds the counters of another run into this one (in place) and returns self.
+        The stream of this object is kept; the other run's top wins keep their own.
+        """
+        for field in self.FIELDS:
+            setattr(self, field, getattr(self, field) + getattr(other, field))
+        for name in self.STATS:
+            getattr(self, name).merge(getattr(other, name))
+        self.win_histogram.merge(other.win_histogram)
+        self.top_wins.merge(other.top_wins)
+        for level_id, other_level in other.bonus_levels.items():
+            level = self.bonus_levels.setdefault(level_id, {"stats": RunningStats(), "histogram": LogHistogram()})
+            level["stats"].merge(other_level["stats"])
+            level["histogram"].merge(other_level["histogram"])
+        return self
+
+    def to_dict(self):
+        """Return the raw counters as a plain dictionary."""
+        values = {field: getattr(self, field) for field in self.FIELDS}
+        values["stream"] = self.stream
+        values.update({name: getattr(self, name).to_dict() for name in self.STATS})
+        values["win_histogram"] = self.win_histogram.to_dict()
+        values["top_wins"] = self.top_wins.to_dict()
+        values["bonus_levels"] = {
+            level_id: {"stats": level["stats"].to_dict(), "histogram": level["histogram"].to_dict()}
+            for level_id, level in sorted(self.bonus_levels.items())
+        }
+        return values
+
+    @classmethod
+    def from_dict(cls, values):
+        """Rebuild counters from to_dict() output."""
+        return cls(**values)
+
+    # --------------------------------------------------------------
+    @property
+    def base_rtp(self):
+        return (self.base_win_total / self.total_bet) * 100 if self.total_bet > 0 else 0
+
+    @property
+    def bonus_rtp(self):
+        return (self.bonus_win_total / self.total_bet) * 100 if self.total_bet > 0 else 0
+
+    @property
+    def total_rtp(self):
+        return self.base_rtp + self.bonus_rtp
+
+    @property
+    def hit_rate(self):
+        """Fraction of spins that won anything (base or bonus)."""
+        return (self.base_hits + self.bonus_only_hits) / self.spins if self.spins > 0 else 0
+
+    def volatility(self):
+        """Standard deviation of the total win of one spin, in bets."""
+        bet = self.total_bet / self.spins if self.spins > 0 else 0
+        return self.total_win_variance() ** 0.5 / bet if bet > 0 else 0
+
+    def total_win_variance(self):
+        """
+        Variance of the total win (base + bonus) of one spin, from the base win stats,
+        the bonus win stats per trigger and the base x bonus cross term of triggered spins.
+        """
+        n = self.spins
+        if n < 2:
+            return 0.0
+        base, bonus = self.base_win_stats, self.bonus_win_stats
+
+        # Per-spin bonus contribution: 0 on spins that did not trigger
+        bonus_mean = self.bonus_win_total / n
+        bonus_sq_mean = (bonus.m2 + bonus.count * bonus.mean ** 2) / n
+        covariance = self.base_bonus_cross_sum / n - base.mean * bonus_mean
+
+        variance = base.m2 / n + (bonus_sq_mean - bonus_mean ** 2) + 2 * covariance
+        return max(0.0, variance * n / (n - 1))
+
+    def rtp_confidence_interval(self, confidence=0.95):
+        """
+        Normal-approximation confidence interval of the total RTP (%).
+        Returns (low, high); (rtp, rtp) until at least two spins were played.
+        """
+        rtp = self.total_rtp
+        if self.spins < 2 or self.total_bet <= 0:
+            return rtp, rtp
+
+        bet = self.total_bet / self.spins
+        half_width = z_score(confidence) * (self.total_win_variance() / self.spins) ** 0.5 / bet * 100
+        return rtp - half_width, rtp + half_width
+
+    def summary(self):
+        """Return RTP results and derived bonus analytics as a dictionary."""
+        bonus_spins = self.bonus_total_spins
+        return {
+            "spins": self.spins,
+            "base_rtp": self.base_rtp,
+            "bonus_rtp": self.bonus_rtp,
+            "total_rtp": self.total_rtp,
+            "hit_rate": self.hit_rate,
+            "volatility": self.volatility(),
+            "bonus_triggers": self.bonus_triggers,
+            "avg_bonus_spins": self.bonus_total_spins / self.bonus_triggers if self.bonus_triggers > 0 else 0,
+            "avg_cf_per_spin": self.total_cf_count / bonus_spins if bonus_spins > 0 else 0,
+            "chest_prob_per_spin": self.total_chest_spins / bonus_spins if bonus_spins > 0 else 0,
+            "avg_multi_per_spin": self.total_bonus_multiplier_sum / bonus_spins if bonus_spins > 0 else 0,
+            "avg_total_multi_per_bonus": self.total_bonus_multiplier_final / max(1, self.bonus_triggers),
+        }
+
+    def win_distribution(self, volatility_confidence=0.90, percentiles=(50, 90, 99, 99.9, 99.99)):
+        """
+        Win distribution analytics (wins in multiples of the bet): hit rate, standard deviation,
+        volatility index (z · std at the given confidence), percentiles (upper bucket edges),
+        win-size buckets with their RTP contribution, top wins and the bonus wins per level.
+        """
+        histogram = self.win_histogram
+        std_dev = self.volatility()
+        spins = max(1, self.spins)
+        bet = self.total_bet / self.spins if self.spins else 1.0
+        return {
+            "spins": self.spins,
+            "hit_rate": self.hit_rate,
+            "std_dev": std_dev,
+            "volatility_index": z_score(volatility_confidence) * std_dev,
+            "volatility_confidence": volatility_confidence,
+            "max_win": self.top_wins.entries[0][0] / bet if self.top_wins.entries else 0.0,
+            "percentiles": {q: histogram.percentile(q) for q in percentiles},
+            "buckets": [
+                {**bucket, "rtp_contribution": bucket["sum"] / spins * 100}
+                for bucket in histogram.buckets()
+            ],
+            "top_wins": [{"win": win / bet, "stream": stream, "spin": spin} for win, stream, spin in self.top_wins.entries],
+            "bonus_levels": {
+                level_id: {
+                    "rounds": level["stats"].count,
+                    "mean_win": level["stats"].mean,
+                    "std_dev": level["stats"].std_dev,
+                    "buckets": level["histogram"].buckets(),
+                }
+                for level_id, level in sorted(self.bonus_levels.items())
+            },
+        }
@@ -0,0 +1,274 @@
+import cProfile
+import json
+import pstats
+import time
+import tracemalloc
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+
+from src.freeprngLib import pcg
+
+# Scalar (one ctypes call each) and bulk entry points of the RNG wrapper
+RNG_SCALAR_CALLS = (
+    "get_uint32", "get_normalized", "get_int_between", "get_uint_between", "get_float_between", "get_bool",
+)
+RNG_BULK_CALLS = (
+    "fill_uint32", "fill_normalized", "fill_int_between", "fill_uint_between", "fill_float_between",
+    "peek_float_between", "skip",
+)
+
+PHASES = ("base_spin", "base_windows", "evaluate", "scatter_scan", "bonus_start", "bonus_spin", "bonus_evaluate")
+
+
+class PhaseTimer:
+    """Accumulates call counts and wall time per phase."""
+
+    def __init__(self):
+        self.calls = {}
+        self.seconds = {}
+
+    def add(self, phase, seconds):
+        self.calls[phase] = self.calls.get(phase, 0) + 1
+        self.seconds[phase] = self.seconds.get(phase, 0.0) + seconds
+
+    def wrap(self, phase, function):
+        """Returns function timed under `phase`."""
+        clock = time.perf_counter
+
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.add(phase, clock() - start)
+        return timed
+
+    def report(self, total_seconds):
+        return {
+            phase: {
+                "calls": self.calls[phase],
+                "total_s": self.seconds[phase],
+                "mean_ns": self.seconds[phase] / self.calls[phase] * 1e9,
+                "share": self.seconds[phase] / total_seconds if total_seconds > 0 else 0.0,
+            }
+            for phase in PHASES if phase in self.calls
+        }
+
+
+@contextmanager
+def _patched(target, name, replacement):
+    """Temporarily replaces target.name (module function or class method)."""
+    had_own = name in vars(target)
+    original = vars(target).get(name)
+    setattr(target, name, replacement)
+    try:
+        yield
+    finally:
+        if had_own:
+            setattr(target, name, original)
+        else:
+            delattr(target, name)
+
+
+@contextmanager
+def count_rng_calls(counts):
+    """
+    Counts calls through the pcg wrapper while active: counts[name] = calls, and for the
+    bulk entry points counts[name + "_values"] = values requested.
+    """
+    with ExitStack() as stack:
+        for name in RNG_SCALAR_CALLS + RNG_BULK_CALLS:
+            stack.enter_context(_patched(pcg, name, _counted(counts, name, getattr(pcg, name))))
+        yield counts
+
+
+def _counted(counts, name, original):
+    bulk = name in RNG_BULK_CALLS
+
+    def counted(*args, **kwargs):
+        counts[name] = counts.get(name, 0) + 1
+        if bulk:
+            values = kwargs.get("n")
+            if values is None:
+                values = args[0] if name in ("peek_float_between", "skip") else getattr(args[0], "size", 0)
+            counts[name + "_values"] = counts.get(name + "_values", 0) + int(values)
+        return original(*args, **kwargs)
+    return counted
+
+
+# ---- Instrumented simulation ----
+
+def _timed_methods(manager):
+    """(class, method name, phase) of every engine method timed by run_spins_instrumented."""
+    methods = [
+        (type(manager.game), "spin", "base_spin"),
+        (type(manager.game), "evaluate_spin", "evaluate"),
+        (type(manager.game), "scatter_count", "scatter_scan"),
+        (type(manager.batch_engine), "draw_stops", "base_spin"),
+        (type(manager.batch_engine), "build_windows", "base_windows"),
+        (type(manager.batch_engine), "evaluate", "evaluate"),
+        (type(manager.batch_engine), "stop_scatter_counts", "scatter_scan"),
+    ]
+    if manager.bonus:
+        methods += [
+            (type(manager.bonus), "start", "bonus_start"),
+            (type(manager.bonus), "spin", "bonus_spin"),
+            (type(manager.bonus), "evaluate_spin", "bonus_evaluate"),
+        ]
+    return methods
+
+
+def run_spins_instrumented(manager, total_spins, bet=1.0, batch_size=None):
+    """
+    Runs GameManager.run_spins with every phase timed and the RNG calls counted.
+    The engine methods are wrapped with PhaseTimer on their classes for the duration of the
+    run (the game objects are slotted), so the regular loop is measured as is and carries
+    no instrumentation cost outside this call.
+    Returns (counters, report).
+    """
+    timer = PhaseTimer()
+    rng_calls = {}
+    clock = time.perf_counter
+
+    with ExitStack() as stack:
+        stack.enter_context(count_rng_calls(rng_calls))
+        for cls, name, phase in _timed_methods(manager):
+            stack.enter_context(_patched(cls, name, timer.wrap(phase, getattr(cls, name))))
+
+        start = clock()
+        counters = manager.run_spins(total_spins, bet, batch_size)
+        elapsed = clock() - start
+
+    # bonus_start includes its spins and evaluations: keep only the round's own overhead
+    if "bonus_start" in timer.seconds:
+        timer.seconds["bonus_start"] -= timer.seconds.get("bonus_spin", 0.0) + timer.seconds.get("bonus_evaluate", 0.0)
+
+    report = {
+        "spins": total_spins,
+        "batch_size": batch_size,
+        "elapsed_s": elapsed,
+        "spins_per_sec": total_spins / elapsed if elapsed > 0 else 0.0,
+        "phases": timer.report(elapsed),
+        "rng_calls": rng_calls,
+        "rng_scalar_calls_per_spin": sum(rng_calls.get(name, 0) for name in RNG_SCALAR_CALLS) / max(1, total_spins),
+    }
+    return counters, report
+
+
+# ---- Allocations ----
+
+def allocation_report(manager, total_spins, bet=1.0, batch_size=None, top=15, frames=1):
+    """
+    Runs a short slice under tracemalloc and reports its memory behaviour: peak traced
+    memory during the slice, blocks / bytes still held afterwards (per spin) and the
+    allocation sites holding the most.
+    """
+    tracemalloc.start(frames)
+    try:
+        before = tracemalloc.take_snapshot()
+        manager.run_spins(total_spins, bet, batch_size)
+        after = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    filters = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    diff = after.filter_traces(filters).compare_to(before.filter_traces(filters), "lineno")
+    allocated = [stat for stat in diff if stat.count_diff > 0]
+
+    return {
+        "spins": total_spins,
+        "peak_bytes": peak,
+        "retained_blocks": sum(stat.count_diff for stat in allocated),
+        "retained_blocks_per_spin": sum(stat.count_diff for stat in allocated) / max(1, total_spins),
+        "retained_bytes": sum(stat.size_diff for stat in allocated),
+        "top_sites": [
+            {"site": str(stat.traceback), "blocks": stat.count_diff, "bytes": stat.size_diff}
+            for stat in sorted(allocated, key=lambda s: s.size_diff, reverse=True)[:top]
+        ],
+    }
+
+
+# ---- Profiling ----
+
+def _function_label(func):
+    filename, line, name = func
+    if filename == "~":
+        return name  # Built-ins
+    return f"{Path(filename).stem}:{name}:{line}"
+
+
+def collapsed_stacks(stats, max_depth=64):
+    """
+    Converts cProfile stats into flamegraph "collapsed stack" lines ("a;b;c microseconds").
+    cProfile only records caller → callee edges, so every function's own time is split
+    across the paths leading to it in proportion to each edge's cumulative time.
+    """
+    raw = stats.stats
+    children = {}
+    for func, (_, _, _, _, callers) in raw.items():
+        for caller, edge in callers.items():
+            children.setdefault(caller, []).append((func, edge[3]))
+
+    lines = {}
+
+    def expand(func, path, fraction):
+        _, _, own_time, cumulative, _ = raw[func]
+        stack = path + (func,)
+        label = ";".join(_function_label(f) for f in stack)
+        lines[label] = lines.get(label, 0.0) + own_time * fraction
+        if len(stack) >= max_depth:
+            return
+        for child, edge_time in children.get(func, ()):
+            if child in stack or raw[child][3] <= 0:
+                continue  # Recursion: already accounted on this path
+            expand(child, stack, fraction * edge_time / raw[child][3])
+
+    roots = [func for func, entry in raw.items() if not entry[4]]
+    for root in roots:
+        expand(root, (), 1.0)
+
+    return [f"{label} {int(round(seconds * 1e6))}" for label, seconds in lines.items() if seconds * 1e6 >= 0.5]
+
+
+def profile_report(manager, total_spins, bet=1.0, batch_size=None, collapsed_path=None, top=20):
+    """
+    Profiles a short slice of the simulation with cProfile. Returns the top functions by
+    cumulative time and, with collapsed_path, writes a flamegraph-compatible collapsed-stack file.
+    """
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        manager.run_spins(total_spins, bet, batch_size)
+    finally:
+        profiler.disable()
+
+    stats = pstats.Stats(profiler)
+    report = {
+        "spins": total_spins,
+        "top_functions": [
+            {
+                "function": _function_label(func),
+                "calls": entry[1],
+                "own_s": entry[2],
+                "cumulative_s": entry[3],
+            }
+            for func, entry in sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:top]
+        ],
+    }
+
+    if collapsed_path:
+        collapsed_path = Path(collapsed_path)
+        collapsed_path.parent.mkdir(parents=True, exist_ok=True)
+        collapsed_path.write_text("\n".join(collapsed_stacks(stats)) + "\n", encoding="utf-8")
+        report["collapsed_stacks"] = str(collapsed_path)
+
+    return report
+
+
+def write_report(report, path):
+    """Writes an instrumentation report as JSON."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
@@ -0,0 +1,50 @@
+from concurrent.futures import ProcessPoolExecutor
+from src.freeprngLib import pcg
+from src.simulation.counters import SimulationCounters
+
+# Spins per PCG stream: the split (and so the result) does not depend on the worker count
+BLOCK_SIZE = 100000
+
+# GameManager owned by each worker process (built once by the pool initializer)
+_worker_manager = None
+
+
+def _init_worker(game_name):
+    global _worker_manager
+    from src.GameManager import GameManager
+    _worker_manager = GameManager(game_name)
+
+
+def _run_stream(seed, stream_index, spins, bet, batch_size):
+    """Plays `spins` spins on PCG stream `stream_index` and returns the raw counters."""
+    pcg.set_state(pcg.stream_state(seed, stream_index))
+    counters = _worker_manager.run_spins(spins, bet, batch_size, SimulationCounters(stream=stream_index))
+    return counters.to_dict()
+
+
+def split_spins(total_spins, block_size=BLOCK_SIZE):
+    """Splits total_spins into blocks of block_size spins (the last one holds the remainder)."""
+    return [min(block_size, total_spins - start) for start in range(0, total_spins, block_size)]
+
+
+def run_parallel(game_name, seed, workers, total_spins, bet=1.0, batch_size=None, block_size=BLOCK_SIZE):
+    """
+    Runs an RTP simulation across a process pool. The spins are split into blocks of
+    block_size, block k plays PCG stream k of the seed, and the counters are merged in
+    block order, so the result only depends on (seed, total_spins, bet, batch_size,
+    block_size) and is bit-identical for any number of workers.
+    """
+    blocks = split_spins(total_spins, block_size)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(game_name,)) as pool:
+        futures = [
+            pool.submit(_run_stream, seed, stream_index, spins, bet, batch_size)
+            for stream_index, spins in enumerate(blocks)
+        ]
+        results = [future.result() for future in futures]
+
+    # Merge in stream order so float sums are reproducible
+    counters = SimulationCounters()
+    for result in results:
+        counters.merge(SimulationCounters.from_dict(result))
+    return counters
@@ -0,0 +1,250 @@
+"""
+Replay log: records selected spins of a simulation with the PCG states needed to play
+them again, and replays them with debug output.
+
+File layout (little-endian, append-only):
+    header  MAGIC, version, record size, bet, game name           (HEADER, 56 bytes)
+    records spin index, base state, bonus state, base win,
+            bonus win, scatters, flags                            (RECORD, 48 bytes each)
+
+The base state is the PCG state before the spin's reel stops were drawn; the bonus state
+is the one the bonus round started from (only meaningful with FLAG_BONUS). Records are
+fixed-size, so a log of any size can be memory-mapped and queried as a NumPy array.
+A log belongs to one simulation stream: parallel workers each need their own file.
+"""
+import mmap
+import struct
+from pathlib import Path
+import numpy as np
+from src.freeprngLib import pcg
+
+MAGIC = b"SLOTRPL\0"
+VERSION = 1
+HEADER = struct.Struct("<8sHHId32s")
+RECORD = struct.Struct("<QQQddBB6x")
+RECORD_DTYPE = np.dtype([
+    ("spin", "<u8"),
+    ("base_state", "<u8"),
+    ("bonus_state", "<u8"),
+    ("base_win", "<f8"),
+    ("bonus_win", "<f8"),
+    ("scatters", "u1"),
+    ("flags", "u1"),
+    ("_pad", "V6"),
+])
+
+FLAG_BONUS = 1  # A bonus round was played
+
+
+class ReplayRecorder:
+    """
+    Appends the spins selected by a win threshold and/or a sampling interval to a replay log.
+    Passed to GameManager.run_spins(recorder=...); costs nothing when not used.
+
+    Args:
+        path (str | Path): Log file; appended to if it already holds a log of the same game and bet.
+        bet (float): Bet of the recorded simulation.
+        game_name (str): Game the spins belong to.
+        threshold (float): Record spins whose total win is at least this many bets.
+        interval (int): Also record every interval-th spin.
+    """
+
+    def __init__(self, path, bet, game_name, threshold=None, interval=None):
+        self.path = Path(path)
+        self.bet = float(bet)
+        self.game_name = game_name
+        self.min_win = threshold * self.bet if threshold is not None else None
+        self.interval = interval
+        self.records = 0
+
+        self._spin_state = None
+        self._batch = None
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.path.exists() and self.path.stat().st_size > 0:
+            header = read_header(self.path)
+            if header["game_name"] != game_name or header["bet"] != self.bet:
+                raise ValueError(f"❌ Replay log {self.path} belongs to {header['game_name']} at bet {header['bet']}")
+            # Drop a record left half-written by an interrupted run, so appends stay aligned
+            size = self.path.stat().st_size
+            whole = HEADER.size + (size - HEADER.size) // RECORD.size * RECORD.size
+            if whole != size:
+                with open(self.path, "r+b") as f:
+                    f.truncate(whole)
+            self._file = open(self.path, "ab")
+        else:
+            self._file = open(self.path, "wb")
+            self._file.write(HEADER.pack(MAGIC, VERSION, RECORD.size, 0, self.bet, game_name.encode("utf-8")[:32]))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+    # --------------------------------------------------------------
+    def start_spin(self, state):
+        """Scalar path: PCG state before the next spin's stops are drawn."""
+        self._spin_state = state
+
+    def start_batch(self, first_spin, spins, state_before, state_after, reel_max_stop):
+        """
+        Batched path: PCG states around the stop draw of spins first_spin .. first_spin + spins - 1
+        (reel_max_stop gives each reel's draw range, to locate a spin's state inside the batch).
+        """
+        columns = len(reel_max_stop)
+        # Every stop takes one draw unless the bounded draw rejected one (very rare)
+        one_draw_per_stop = state_after == pcg.advance_state(state_before, spins * columns)
+        self._batch = (first_spin, state_before, [int(m) for m in reel_max_stop], one_draw_per_stop)
+        self._spin_state = None
+
+    def base_state(self, spin_index):
+        """PCG state before the stops of spin_index were drawn."""
+        if self._spin_state is not None:
+            return self._spin_state
+
+        first_spin, state_before, reel_max_stop, one_draw_per_stop = self._batch
+        offset = spin_index - first_spin
+        if one_draw_per_stop:
+            return pcg.advance_state(state_before, offset * len(reel_max_stop))
+
+        # A draw was rejected somewhere in the batch: redraw the stops up to the spin
+        current = pcg.get_state()
+        try:
+            pcg.set_state(state_before)
+            for _ in range(offset):
+                for max_stop in reel_max_stop:
+                    pcg.get_int_between(0, max_stop)
+            return pcg.get_state()
+        finally:
+            pcg.set_state(current)
+
+    def wants(self, spin_index, total_win):
+        return (self.min_win is not None and total_win >= self.min_win) or \
+               (self.interval is not None and spin_index % self.interval == 0)
+
+    def record(self, spin_index, base_win, bonus_win, scatters, bonus_state=None):
+        """Appends one spin (spin_index is 0-based within the simulation stream)."""
+        flags = FLAG_BONUS if bonus_state is not None else 0
+        self._file.write(RECORD.pack(
+            spin_index, self.base_state(spin_index), bonus_state or 0,
+            base_win, bonus_win, min(scatters, 255), flags,
+        ))
+        self.records += 1
+
+
+# ---- Reading ----
+
+def read_header(path):
+    with open(path, "rb") as f:
+        raw = f.read(HEADER.size)
+    if len(raw) < HEADER.size:
+        raise ValueError(f"❌ {path} is not a replay log (truncated header)")
+    magic, version, record_size, _, bet, game_name = HEADER.unpack(raw)
+    if magic != MAGIC:
+        raise ValueError(f"❌ {path} is not a replay log")
+    if version != VERSION or record_size != RECORD.size:
+        raise ValueError(f"❌ Replay log version {version} is not supported (expected {VERSION})")
+    return {"version": version, "bet": bet, "game_name": game_name.rstrip(b"\0").decode("utf-8")}
+
+
+class ReplayLog:
+    """
+    Memory-mapped, read-only view of a replay log. `records` is a NumPy structured array
+    over the file (RECORD_DTYPE), so queries never load the whole file.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        header = read_header(self.path)
+        self.bet = header["bet"]
+        self.game_name = header["game_name"]
+
+        self._file = open(self.path, "rb")
+        size = self.path.stat().st_size
+        count = (size - HEADER.size) // RECORD.size  # A partly written last record is ignored
+        if count > 0:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.records = np.frombuffer(self._mmap, dtype=RECORD_DTYPE, count=count, offset=HEADER.size)
+        else:
+            self._mmap = None
+            self.records = np.empty(0, dtype=RECORD_DTYPE)
+
+    def __repr__(self):
+        return f"<ReplayLog {self.path.name}: {len(self):,} spins of {self.game_name}>"
+
+    def __len__(self):
+        return len(self.records)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.records = None
+        if self._mmap is not None:
+            self._mmap.close()
+        self._file.close()
+
+    # --------------------------------------------------------------
+    def find(self, spin_index):
+        """The record of a spin (the last one if the log holds several runs), or None."""
+        matches = np.flatnonzero(self.records["spin"] == spin_index)
+        return self.record(int(matches[-1])) if matches.size else None
+
+    def top(self, n=10):
+        """The n records with the largest total win (largest first)."""
+        total = self.records["base_win"] + self.records["bonus_win"]
+        order = np.argsort(total)[::-1][:n]
+        return [self.record(int(i)) for i in order]
+
+    def above(self, win):
+        """Records whose total win is at least `win` (in currency, not bets)."""
+        total = self.records["base_win"] + self.records["bonus_win"]
+        return [self.record(int(i)) for i in np.flatnonzero(total >= win)]
+
+    def record(self, index):
+        """Record at a position in the log, as a plain dict."""
+        row = self.records[index]
+        return {
+            "spin": int(row["spin"]),
+            "base_state": int(row["base_state"]),
+            "bonus_state": int(row["bonus_state"]) if row["flags"] & FLAG_BONUS else None,
+            "base_win": float(row["base_win"]),
+            "bonus_win": float(row["bonus_win"]),
+            "scatters": int(row["scatters"]),
+        }
+
+
+# ---- Replaying ----
+
+def replay(manager, record, bet, debug=True):
+    """
+    Plays a recorded spin again from its PCG states: the base spin and, if it triggered one,
+    its bonus round (with the grids, line wins, multipliers and level progress when debug is on).
+    The PCG state is restored afterwards. Returns {base_win, bonus_win, matches}.
+    """
+    current = pcg.get_state()
+    try:
+        pcg.set_state(record["base_state"])
+        manager.game.spin(debug=debug)
+        base_win = manager.game.evaluate_spin(bet, debug)
+        scatters = manager.game.scatter_count()
+
+        bonus_win = 0.0
+        if record["bonus_state"] is not None and manager.bonus:
+            pcg.set_state(record["bonus_state"])
+            bonus_win = manager.bonus.start(
+                scatters=scatters, bet=bet, gridSize=(manager.game.grid.rows, manager.game.grid.columns), debug=debug
+            )
+    finally:
+        pcg.set_state(current)
+
+    matches = base_win == record["base_win"] and bonus_win == record["bonus_win"] and scatters == record["scatters"]
+    return {"base_win": base_win, "bonus_win": bonus_win, "scatters": scatters, "matches": matches}
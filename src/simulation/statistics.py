@@ -0,0 +1,256 @@
+from statistics import NormalDist
+import numpy as np
+
+
+class RunningStats:
+    """
+    Online mean / variance of a stream of values (Welford's algorithm).
+    Stays numerically stable over billions of samples and can be merged with the
+    stats of another run (Chan et al.), so workers and checkpoints combine exactly.
+    """
+
+    def __init__(self, count=0, mean=0.0, m2=0.0):
+        self.count = count
+        self.mean = float(mean)
+        self.m2 = float(m2)
+
+    def __repr__(self):
+        return f"<RunningStats n={self.count:,} mean={self.mean:.6f} std={self.std_dev:.6f}>"
+
+    # --------------------------------------------------------------
+    def add(self, value):
+        """Adds one sample."""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def add_many(self, values):
+        """Adds a whole array of samples at once (one vectorized pass, then a merge)."""
+        values = np.asarray(values, dtype=np.float64)
+        if values.size == 0:
+            return
+        mean = float(values.mean())
+        deviations = values - mean
+        self.merge(RunningStats(int(values.size), mean, float(np.dot(deviations, deviations))))
+
+    def merge(self, other):
+        """Combines the samples of another RunningStats into this one (in place) and returns self."""
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            return self
+
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        return self
+
+    def to_dict(self):
+        return {"count": self.count, "mean": self.mean, "m2": self.m2}
+
+    @classmethod
+    def from_dict(cls, values):
+        return cls(**values)
+
+    # --------------------------------------------------------------
+    @property
+    def variance(self):
+        """Sample variance (0 until there are two samples)."""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std_dev(self):
+        return self.variance ** 0.5
+
+    def standard_error(self):
+        """Standard error of the mean."""
+        return (self.variance / self.count) ** 0.5 if self.count > 0 else float("inf")
+
+
+class LogHistogram:
+    """
+    Fixed-memory histogram of non-negative values (wins in multiples of the bet), with
+    log-spaced buckets: one for exact zeros, one below min_value, `buckets_per_decade`
+    per decade up to max_value and one overflow bucket. Keeps the count and the sum of
+    the values of every bucket, so each bucket's RTP contribution is exact.
+    Histograms with the same layout merge by adding their arrays.
+    """
+
+    def __init__(self, min_value=0.01, max_value=1e6, buckets_per_decade=10, counts=None, sums=None):
+        self.min_value = float(min_value)
+        self.max_value = float(max_value)
+        self.buckets_per_decade = int(buckets_per_decade)
+        self._log_min = np.log10(self.min_value)
+        decades = np.log10(self.max_value) - self._log_min
+        self.log_buckets = int(np.ceil(decades * self.buckets_per_decade))
+
+        size = self.log_buckets + 3  # zero, underflow, log buckets, overflow
+        self.counts = np.zeros(size, dtype=np.int64) if counts is None else np.asarray(counts, dtype=np.int64)
+        self.sums = np.zeros(size, dtype=np.float64) if sums is None else np.asarray(sums, dtype=np.float64)
+
+    def __repr__(self):
+        return f"<LogHistogram n={self.total:,} {self.min_value:g}–{self.max_value:g}, {len(self.counts)} buckets>"
+
+    @property
+    def total(self):
+        return int(self.counts.sum())
+
+    # --------------------------------------------------------------
+    def bucket_of(self, value):
+        """Bucket index of one value."""
+        if value <= 0:
+            return 0
+        if value < self.min_value:
+            return 1
+        index = int((np.log10(value) - self._log_min) * self.buckets_per_decade)
+        return 2 + index if index < self.log_buckets else self.log_buckets + 2
+
+    def buckets_of(self, values):
+        """Bucket indexes of an array of values."""
+        values = np.asarray(values, dtype=np.float64)
+        index = np.empty(values.shape, dtype=np.int64)
+        positive = values >= self.min_value
+        with np.errstate(divide="ignore"):
+            log_index = ((np.log10(values[positive]) - self._log_min) * self.buckets_per_decade).astype(np.int64)
+        index[positive] = 2 + np.minimum(log_index, self.log_buckets)
+        index[~positive] = np.where(values[~positive] > 0, 1, 0)
+        return index
+
+    def add(self, value):
+        bucket = self.bucket_of(value)
+        self.counts[bucket] += 1
+        self.sums[bucket] += value
+
+    def add_many(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        if values.size == 0:
+            return
+        buckets = self.buckets_of(values)
+        size = len(self.counts)
+        self.counts += np.bincount(buckets, minlength=size)
+        self.sums += np.bincount(buckets, weights=values, minlength=size)
+
+    def move(self, old_value, new_value):
+        """Replaces one recorded value by another (e.g. a base win once its bonus is added)."""
+        bucket = self.bucket_of(old_value)
+        self.counts[bucket] -= 1
+        self.sums[bucket] -= old_value
+        self.add(new_value)
+
+    def merge(self, other):
+        """Adds another histogram with the same layout (in place) and returns self."""
+        if (other.min_value, other.max_value, other.buckets_per_decade) != (self.min_value, self.max_value, self.buckets_per_decade):
+            raise ValueError("❌ LogHistogram: cannot merge histograms with different bucket layouts")
+        self.counts += other.counts
+        self.sums += other.sums
+        return self
+
+    # --------------------------------------------------------------
+    def edges(self, index):
+        """(low, high) value range of a bucket."""
+        if index == 0:
+            return 0.0, 0.0
+        if index == 1:
+            return 0.0, self.min_value
+        if index == len(self.counts) - 1:
+            return self.max_value, float("inf")
+        k = index - 2
+        return (float(10 ** (self._log_min + k / self.buckets_per_decade)),
+                min(self.max_value, float(10 ** (self._log_min + (k + 1) / self.buckets_per_decade))))
+
+    def buckets(self):
+        """Non-empty buckets as a list of {low, high, count, probability, sum}."""
+        total = self.total
+        return [
+            {
+                "low": self.edges(index)[0],
+                "high": self.edges(index)[1],
+                "count": int(count),
+                "probability": int(count) / total,
+                "sum": float(self.sums[index]),
+            }
+            for index, count in enumerate(self.counts.tolist()) if count
+        ]
+
+    def percentile(self, q):
+        """Upper edge of the bucket holding the q-th percentile (0–100): an upper bound of it."""
+        total = self.total
+        if total == 0:
+            return 0.0
+        index = int(np.searchsorted(np.cumsum(self.counts), q / 100 * total, side="left"))
+        return self.edges(min(index, len(self.counts) - 1))[1]
+
+    def to_dict(self):
+        return {
+            "min_value": self.min_value,
+            "max_value": self.max_value,
+            "buckets_per_decade": self.buckets_per_decade,
+            "counts": self.counts.tolist(),
+            "sums": self.sums.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, values):
+        return cls(**values)
+
+
+class TopWins:
+    """
+    The N largest wins seen, as [win, stream, spin_index] entries (largest first). spin_index
+    is 0-based within its PCG stream (the same index as the stream's replay log), and stream
+    is the stream / chunk that played it, so entries merged from several runs stay distinct.
+    Recording the same spin again replaces its entry, so a spin can be logged with its base
+    win and then updated with its total once the bonus is played. Mergeable by keeping the
+    N largest of both.
+    """
+
+    def __init__(self, size=20, entries=None):
+        self.size = int(size)
+        self.entries = [[float(win), int(stream), int(spin)] for win, stream, spin in (entries or [])]
+
+    def __repr__(self):
+        return f"<TopWins {len(self.entries)}/{self.size}>"
+
+    @property
+    def threshold(self):
+        """Smallest win that can still enter the list."""
+        return self.entries[-1][0] if len(self.entries) >= self.size else 0.0
+
+    def add(self, win, spin_index, stream=0):
+        if win <= self.threshold:
+            return
+        self.entries = [entry for entry in self.entries if entry[1] != stream or entry[2] != spin_index]
+        self.entries.append([float(win), int(stream), int(spin_index)])
+        self.entries.sort(key=lambda entry: -entry[0])
+        del self.entries[self.size:]
+
+    def add_many(self, wins, first_spin_index, stream=0):
+        """Records an array of consecutive spins of a stream starting at first_spin_index."""
+        wins = np.asarray(wins, dtype=np.float64)
+        candidates = np.flatnonzero(wins > self.threshold)
+        if candidates.size > self.size:
+            candidates = candidates[np.argpartition(wins[candidates], -self.size)[-self.size:]]
+        for index in candidates.tolist():
+            self.add(float(wins[index]), first_spin_index + index, stream)
+
+    def merge(self, other):
+        self.entries = sorted(self.entries + other.entries, key=lambda entry: -entry[0])[:self.size]
+        return self
+
+    def to_dict(self):
+        return {"size": self.size, "entries": self.entries}
+
+    @classmethod
+    def from_dict(cls, values):
+        return cls(**values)
+
+
+def z_score(confidence):
+    """Two-sided normal quantile for a confidence level (1.96 for 0.95)."""
+    if not 0 < confidence < 1:
+        raise ValueError(f"❌ confidence must be in (0, 1), got {confidence}")
+    return NormalDist().inv_cdf(0.5 + confidence / 2)
@@ -0,0 +1,202 @@
+"""
+Parameter sweeps over a loaded game configuration.
+
+The workbook is parsed once; every variant is the compiled payload (GameManager.export_config)
+with a few overrides applied, rebuilt with GameManager.from_config in the worker processes.
+
+Overrides are {dotted path: value}:
+    "bonus_spawner.probabilities"            {element: probability%, ...}  (merged)
+    "bonus_spawner.probabilities.<element>"  probability%
+    "card_multiplier_spawner.multipliers"    {multiplier: probability%, ...}  (merged)
+    "card_multiplier_spawner.multipliers.<multiplier>"  probability%
+    "paytable.<symbol>"                      [pay3, pay4, pay5]
+    "levels.<level_id>.<field>"              field: scatters | free_spins | bonus_to_upgrade
+    "strips.<reel_index>"                    [symbol, symbol, ...]  (the whole reel)
+
+Probability tables must still add up to 100%: the samplers validate every variant.
+
+Every variant plays the same random numbers (common random numbers): the spins are split
+into blocks and block k always starts from PCG stream k of the seed, so the base spins of
+every block line up across variants even when their bonus rounds consume different amounts
+of randomness. RTP differences between variants are then far less noisy than independent runs.
+"""
+import copy
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from src.freeprngLib import pcg
+from src.simulation.counters import SimulationCounters
+
+LEVEL_FIELDS = {"scatters": 1, "free_spins": 2, "bonus_to_upgrade": 3}
+SPAWNER_FIELDS = {"bonus_spawner": "probabilities", "card_multiplier_spawner": "multipliers"}
+
+
+# ---- Overrides ----
+
+def _set_pair(pairs, key, value, cast):
+    """Sets key → value in a list of [key, value] pairs (appending it if missing)."""
+    for index, (pair_key, _) in enumerate(pairs):
+        if cast(pair_key) == cast(key):
+            pairs[index] = [pair_key, float(value)]
+            return
+    pairs.append([cast(key), float(value)])
+
+
+def check_override_path(path):
+    """
+    Raises ValueError unless path has one of the shapes listed in the module docstring.
+    Only the path is checked: whether the game has that element, level or reel is decided
+    by apply_overrides against its config.
+    """
+    section, _, rest = path.partition(".") if isinstance(path, str) else ("", "", "")
+    field, _, key = rest.partition(".")
+
+    if section in SPAWNER_FIELDS:
+        valid = field == SPAWNER_FIELDS[section] and (section == "bonus_spawner" or not key or key.isdigit())
+    elif section == "paytable":
+        valid = bool(rest)
+    elif section == "levels":
+        valid = field.isdigit() and key in LEVEL_FIELDS
+    elif section == "strips":
+        valid = rest.isdigit()
+    else:
+        valid = False
+
+    if not valid:
+        raise ValueError(f"❌ Unknown override '{path}'")
+
+
+def apply_overrides(config, overrides):
+    """
+    Returns a copy of an exported config ({"base": ..., "bonus": ...}) with the overrides applied.
+
+    Args:
+        config (dict): GameManager.export_config() output.
+        overrides (dict): {dotted path: value} (see the module docstring).
+    """
+    config = copy.deepcopy(config)
+    base, bonus = config["base"], config["bonus"] or {}
+
+    for path, value in overrides.items():
+        check_override_path(path)
+        section, _, rest = path.partition(".")
+
+        if section in ("bonus_spawner", "card_multiplier_spawner") and section in bonus:
+            field, _, key = rest.partition(".")
+            pairs = bonus[section].get(field)
+            if pairs is None:
+                raise ValueError(f"❌ Unknown override '{path}'")
+            cast = str if section == "bonus_spawner" else int
+            items = value.items() if not key else [(key, value)]
+            for item_key, item_value in items:
+                _set_pair(pairs, item_key, item_value, cast)
+
+        elif section == "paytable" and "paytable" in base and rest:
+            base["paytable"]["table"][rest] = [float(p) for p in value]
+
+        elif section == "levels" and "levels" in bonus:
+            level_id, _, field = rest.partition(".")
+            levels = [lvl for lvl in bonus["levels"]["levels"] if str(lvl[0]) == level_id]
+            if not levels or field not in LEVEL_FIELDS:
+                raise ValueError(f"❌ Unknown override '{path}'")
+            levels[0][LEVEL_FIELDS[field]] = int(value)
+
+        elif section == "strips" and "strips" in base and rest.isdigit():
+            reels = base["strips"]["reels"]
+            if int(rest) >= len(reels):
+                raise ValueError(f"❌ Override '{path}': reel index out of range")
+            reels[int(rest)] = list(value)
+
+        else:
+            raise ValueError(f"❌ Unknown override '{path}'")
+
+    return config
+
+
+def expand_grid(grid):
+    """
+    Expands {path: [value, ...]} into every combination, as a list of (name, overrides).
+    The first variant of the sweep is always the unmodified "baseline".
+    """
+    variants = [("baseline", {})]
+    paths = list(grid)
+    for values in itertools.product(*(grid[path] for path in paths)):
+        overrides = dict(zip(paths, values))
+        name = ", ".join(f"{path}={value}" for path, value in overrides.items())
+        variants.append((name, overrides))
+    return variants
+
+
+# ---- Running ----
+
+def _run_variant(game_name, config, seed, total_spins, bet, block_size):
+    """Plays one variant with common random numbers and returns its raw counters."""
+    from src.GameManager import GameManager
+    manager = GameManager.from_config(game_name, config["base"], config["bonus"])
+
+    counters = SimulationCounters()
+    block_index = 0
+    remaining = total_spins
+    while remaining > 0:
+        n = min(block_size, remaining)
+        pcg.set_state(pcg.stream_state(seed, block_index))
+        counters.merge(manager.run_spins(n, bet, batch_size=n, counters=SimulationCounters(stream=block_index)))
+        remaining -= n
+        block_index += 1
+    return counters.to_dict()
+
+
+def summarize(name, counters):
+    """One table row: RTP (%), volatility (per-spin standard deviation in bets) and hit rate."""
+    return {
+        "variant": name,
+        "spins": counters.spins,
+        "rtp": counters.total_rtp,
+        "base_rtp": counters.base_rtp,
+        "bonus_rtp": counters.bonus_rtp,
+        "volatility": counters.volatility(),
+        "hit_rate": counters.hit_rate,
+        "bonus_frequency": counters.spins / counters.bonus_triggers if counters.bonus_triggers else None,
+    }
+
+
+def run_sweep(manager, variants, total_spins, seed, bet=1.0, block_size=10000, workers=1):
+    """
+    Evaluates every variant on the same random numbers; returns one summary row per variant.
+
+    Args:
+        manager (GameManager): Loaded game whose configuration is the sweep's starting point.
+        variants (list): (name, overrides) pairs, e.g. from expand_grid.
+        total_spins (int): Base spins per variant.
+        seed (int): PCG seed shared by every variant.
+        bet (float): Bet amount per spin.
+        block_size (int): Spins per common-random-numbers block (also the vectorized batch size).
+        workers (int): Worker processes (one variant per task).
+    """
+    exported = manager.export_config()
+    configs = [apply_overrides(exported, overrides) for _, overrides in variants]  # Fails fast on bad paths
+    args = (seed, total_spins, bet, block_size)
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_run_variant, manager.game_name, config, *args) for config in configs]
+            results = [future.result() for future in futures]
+    else:
+        results = [_run_variant(manager.game_name, config, *args) for config in configs]
+
+    return [
+        summarize(name, SimulationCounters.from_dict(result))
+        for (name, _), result in zip(variants, results)
+    ]
+
+
+def format_table(rows):
+    """Formats sweep rows as a text table (RTP shown as the difference to the first row too)."""
+    reference = rows[0]["rtp"] if rows else 0.0
+    lines = [f"{'Variant':<48} {'RTP %':>9} {'Δ RTP':>8} {'Vol':>7} {'Hit %':>7} {'1 bonus in':>11}"]
+    for row in rows:
+        frequency = f"{row['bonus_frequency']:,.0f}" if row["bonus_frequency"] else "-"
+        lines.append(
+            f"{row['variant'][:48]:<48} {row['rtp']:>9.4f} {row['rtp'] - reference:>+8.4f} "
+            f"{row['volatility']:>7.2f} {row['hit_rate'] * 100:>7.2f} {frequency:>11}"
+        )
+    return "\n".join(lines)
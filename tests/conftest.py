@@ -0,0 +1,18 @@
+import pytest
+
+from src.freeprngLib import pcg
+from src.GameManager import GameManager
+
+
+@pytest.fixture(scope="session")
+def manager():
+    """The default project's GameManager, loaded once for the whole run."""
+    return GameManager("mysterious_night")
+
+
+@pytest.fixture(autouse=True)
+def restore_pcg_state():
+    # Every test may reseed the global PCG state freely
+    state = pcg.get_state()
+    yield
+    pcg.set_state(state)
@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+from src.freeprngLib import pcg
+
+
+def _scalar_spins(game, n, bet):
+    wins, scatters = [], []
+    for _ in range(n):
+        game.spin()
+        wins.append(game.evaluate_spin(bet))
+        scatters.append(game.scatter_count())
+    return wins, scatters
+
+
+@pytest.mark.parametrize("seed, bet", [(1, 1.0), (99, 0.2)])
+def test_spin_batch_pays_like_the_scalar_game(manager, seed, bet):
+    n = 20000
+
+    pcg.set_seed(seed)
+    wins, scatters = _scalar_spins(manager.game, n, bet)
+    scalar_state = pcg.get_state()
+
+    pcg.set_seed(seed)
+    batch_wins, batch_scatters = manager.batch_engine.spin_batch(n, bet)
+
+    assert batch_wins.tolist() == wins
+    assert batch_scatters.tolist() == scatters
+    assert pcg.get_state() == scalar_state
+    assert np.count_nonzero(batch_wins) > 0 and max(scatters) >= manager.TRIGGER_SCATTERS
+
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from src.freeprngLib import pcg
+
+FIELDS = ("total_multiplier", "spins_played", "cf_count", "spins_with_chest", "multi_sum", "multi_when_chest")
+
+
+def _scalar_round(bonus, scatters, bet, grid_size):
+    win = bonus.start(scatters=scatters, bet=bet, gridSize=grid_size)
+    values = {
+        "win": win,
+        "total_multiplier": bonus.total_multiplier,
+        "spins_played": bonus.spins_played,
+        "cf_count": bonus.debug_cf_count,
+        "spins_with_chest": bonus.debug_spins_with_chest,
+        "multi_sum": bonus.debug_multi_sum,
+        "multi_when_chest": bonus.debug_multi_when_chest,
+    }
+    return values, pcg.get_state()
+
+
+@pytest.mark.parametrize("scatters", [3, 4, 5])
+def test_single_rounds_match_the_scalar_bonus(manager, scatters):
+    """A batch of one round draws its numbers in the scalar order, so every round is identical."""
+    grid_size = (manager.game.grid.rows, manager.game.grid.columns)
+    for seed in range(40):
+        pcg.set_seed(seed)
+        expected, expected_state = _scalar_round(manager.bonus, scatters, 2.0, grid_size)
+
+        pcg.set_seed(seed)
+        result = manager.bonus_engine.play(scatters, 1, bet=2.0)
+
+        assert {name: result[name][0].item() for name in expected} == expected
+        assert pcg.get_state() == expected_state
+
+
+def test_many_rounds_follow_the_scalar_distribution(manager):
+    """Rounds played in lockstep use another draw order: compare the means, not the rounds."""
+    grid_size = (manager.game.grid.rows, manager.game.grid.columns)
+    n = 3000
+
+    pcg.set_seed(11)
+    scalar = [manager.bonus.start(scatters=3, bet=1.0, gridSize=grid_size) for _ in range(n)]
+    pcg.set_seed(12)
+    batch = manager.bonus_engine.play(3, n, bet=1.0)["win"]
+
+    # Difference of two independent means, in standard errors
+    z = (batch.mean() - np.mean(scalar)) / np.sqrt(batch.var() / n + np.var(scalar) / n)
+    assert abs(z) < 4
+
+
+def test_rounds_without_a_level_win_nothing(manager):
+    result = manager.bonus_engine.play(0, 5, bet=1.0)
+    assert result["win"].tolist() == [0.0] * 5
+    assert result["spins_played"].tolist() == [0] * 5
@@ -0,0 +1,41 @@
+import pytest
+
+from src.freeprngLib import pcg
+
+
+def _finish(stream):
+    progress = None
+    for progress in stream:
+        pass
+    return progress["counters"].to_dict(), pcg.get_state()
+
+
+@pytest.mark.parametrize("batch_size", [None, 2500])
+def test_resumed_run_equals_uninterrupted_run(manager, tmp_path, batch_size):
+    total_spins, chunk_size = 40000, 10000
+
+    pcg.set_seed(21)
+    expected = _finish(manager.simulate_rtp_stream(total_spins, chunk_size, 1.0, batch_size))
+
+    checkpoint = tmp_path / "run.json"
+    pcg.set_seed(21)
+    stream = manager.simulate_rtp_stream(total_spins, chunk_size, 1.0, batch_size, checkpoint_path=checkpoint)
+    for progress in stream:
+        if progress["spins_done"] == 2 * chunk_size:
+            break  # "Killed" after two chunks
+    stream.close()
+
+    pcg.set_seed(999)  # A new process starts from another state: the checkpoint restores it
+    resumed = _finish(manager.simulate_rtp_stream(total_spins, chunk_size, 1.0, batch_size,
+                                                  checkpoint_path=checkpoint, resume=True))
+    assert resumed == expected
+    assert expected[0]["bonus_triggers"] > 0
+
+
+def test_resume_rejects_other_parameters(manager, tmp_path):
+    checkpoint = tmp_path / "run.json"
+    pcg.set_seed(1)
+    next(manager.simulate_rtp_stream(20000, 10000, 1.0, checkpoint_path=checkpoint))
+
+    with pytest.raises(ValueError, match="different parameters"):
+        next(manager.simulate_rtp_stream(20000, 5000, 1.0, checkpoint_path=checkpoint, resume=True))
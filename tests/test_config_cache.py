@@ -0,0 +1,28 @@
+from config.base import config_cache
+
+
+def test_key_changes_with_the_factory_source(tmp_path):
+    workbook = tmp_path / "slot_config.xlsx"
+    workbook.write_bytes(b"workbook")
+    factory = tmp_path / "factory.py"
+
+    factory.write_text("FORMAT = 1\n")
+    first = config_cache.cache_key(workbook, ["Paytable"], "base", factory)
+    assert config_cache.cache_key(workbook, ["Paytable"], "base", factory) == first
+
+    config_cache._schema_digests.clear()
+    factory.write_text("FORMAT = 2\n")
+    assert config_cache.cache_key(workbook, ["Paytable"], "base", factory) != first
+
+
+def test_key_changes_with_the_workbook_and_tables(tmp_path):
+    workbook = tmp_path / "slot_config.xlsx"
+    workbook.write_bytes(b"workbook")
+    factory = tmp_path / "factory.py"
+    factory.write_text("")
+
+    key = config_cache.cache_key(workbook, ["Paytable"], "base", factory)
+    assert config_cache.cache_key(workbook, ["Paytable", "Strips"], "base", factory) != key
+    assert config_cache.cache_key(workbook, ["Paytable"], "bonus", factory) != key
+    workbook.write_bytes(b"edited workbook")
+    assert config_cache.cache_key(workbook, ["Paytable"], "base", factory) != key
@@ -0,0 +1,24 @@
+from src.simulation.counters import SimulationCounters
+from src.simulation.statistics import TopWins
+
+
+def test_merged_top_wins_keep_their_stream():
+    first, second = SimulationCounters(stream=0), SimulationCounters(stream=1)
+    for counters, win in ((first, 50.0), (second, 80.0)):
+        counters.add_base(win, 1.0)
+        counters.spins += 1
+
+    merged = SimulationCounters().merge(first).merge(second)
+    # Same stream-local spin index, different streams: both entries survive
+    assert merged.top_wins.entries == [[80.0, 1, 0], [50.0, 0, 0]]
+
+    restored = SimulationCounters.from_dict(merged.to_dict())
+    assert restored.top_wins.entries == merged.top_wins.entries
+
+
+def test_top_wins_replace_only_the_same_stream_spin():
+    top = TopWins(size=4)
+    top.add(10.0, 7, stream=0)
+    top.add(20.0, 7, stream=1)
+    top.add(30.0, 7, stream=0)
+    assert top.entries == [[30.0, 0, 7], [20.0, 1, 7]]
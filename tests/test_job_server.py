@@ -0,0 +1,44 @@
+import pytest
+
+from src.service.job_server import JobServer
+
+
+def test_defaults_are_filled_in():
+    params = JobServer.parse_params({"spins": 10, "seed": 5})
+    assert params["spins"] == 10 and params["seed"] == 5
+    assert params["bet"] == 1.0 and params["confidence"] == 0.95 and params["overrides"] == {}
+
+
+@pytest.mark.parametrize("body", [
+    {"spins": 10, "confidence": "x"},
+    {"spins": 10, "confidence": True},
+    {"spins": 10, "confidence": 1},
+    {"spins": 10, "bet": True},
+    {"spins": 10, "bet": "1"},
+    {"spins": 10, "bet": float("nan")},
+    {"spins": True},
+    {"spins": 10, "seed": -1},
+    {"spins": 10, "seed": 1 << 64},
+    {"spins": 10, "seed": 1.5},
+    {"spins": 10, "batch_size": False},
+    {"spins": 10, "overrides": {"reels.0": []}},
+    {"spins": 10, "overrides": {"levels.1.speed": 3}},
+    {"spins": 10, "overrides": {"strips.first": []}},
+    {"spins": 10, "colour": "red"},
+    [1, 2],
+])
+def test_invalid_jobs_raise_value_error(body):
+    with pytest.raises(ValueError):
+        JobServer.parse_params(body)
+
+
+def test_documented_override_paths_are_accepted():
+    overrides = {
+        "bonus_spawner.probabilities": {"Chest": 10},
+        "bonus_spawner.probabilities.Chest": 10,
+        "card_multiplier_spawner.multipliers.5": 2,
+        "paytable.Wild": [1, 2, 3],
+        "levels.2.free_spins": 12,
+        "strips.0": ["Wild"],
+    }
+    assert JobServer.parse_params({"spins": 10, "overrides": overrides})["overrides"] == overrides
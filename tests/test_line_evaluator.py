@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from config.base.line_evaluator import LineEvaluator
+
+
+class DenseLineEvaluator(LineEvaluator):
+    # No sequence table: both paths fall back to evaluating the rule with arrays
+    MAX_TABLE_SIZE = 0
+
+
+def old_line_payout(names, payouts):
+    """The original line rule on symbol names: first non-Wild, non-Scatter symbol, run from reel 1."""
+    first = next((name for name in names if name not in ("Wild", "Scatter")), None)
+    if first is None:
+        return 0.0
+    count = 0
+    for name in names:
+        if name != first and name != "Wild":
+            break
+        count += 1
+    pays = payouts.get(first, [])
+    return pays[count - 3] if 3 <= count < len(pays) + 3 else 0.0
+
+
+@pytest.fixture(scope="module")
+def evaluators(manager):
+    evaluator = manager.game.evaluator
+    dense = DenseLineEvaluator(evaluator.lines, evaluator.payouts, evaluator.symbols, evaluator.columns)
+    assert evaluator.sequence_payouts is not None and dense.sequence_payouts is None
+    return evaluator, dense
+
+
+def _grids(evaluator, n, seed):
+    cells = evaluator.lines.max() * evaluator.columns + evaluator.columns
+    rng = np.random.default_rng(seed)
+    grids = rng.integers(0, len(evaluator.symbols), size=(n, cells), dtype=np.uint8)
+    # Wild-heavy grids so long runs and all-Wild lines show up
+    wild = evaluator.symbols.ids["Wild"]
+    grids[: n // 4][rng.random((n // 4, cells)) < 0.5] = wild
+    grids[0] = wild
+    return grids
+
+
+def _expected(evaluator, grids):
+    names = evaluator.symbols.names
+    return np.array([
+        [old_line_payout([names[grid[cell]] for cell in line], evaluator.payouts) for line in evaluator.line_cells.tolist()]
+        for grid in grids.tolist()
+    ])
+
+
+def test_table_and_dense_paths_match_the_old_rule(evaluators):
+    table, dense = evaluators
+    grids = _grids(table, 4000, seed=1)
+    expected = _expected(table, grids)
+    assert np.count_nonzero(expected) > 0
+
+    for evaluator in (table, dense):
+        assert evaluator.line_payouts_batch(grids).tolist() == expected.tolist()
+        assert [evaluator.line_payouts(grid.tolist()) for grid in grids[:500]] == expected[:500].tolist()
+
+
+def test_total_win_adds_the_lines_in_order(evaluators):
+    table, dense = evaluators
+    for grid in _grids(table, 200, seed=2).tolist():
+        expected = 0.0
+        for payout in table.line_payouts(grid):
+            expected += payout * 0.5
+        assert table.evaluate(grid, 0.5) == dense.evaluate(grid, 0.5) == expected
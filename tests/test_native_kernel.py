@@ -0,0 +1,48 @@
+import pytest
+from src.GameManager import GameManager
+from src.freeprngLib import pcg
+
+
+@pytest.fixture(scope="module")
+def manager():
+    manager = GameManager("mysterious_night")
+    try:
+        manager.native_kernel()
+    except RuntimeError as error:  # No C compiler, or the build failed
+        pytest.skip(str(error))
+    return manager
+
+
+@pytest.mark.parametrize("seed", [1, 12345])
+def test_native_kernel_matches_python(manager, seed):
+    """Same PCG seed → identical counters (per-level bonus stats and distribution included) and final PCG state."""
+    spins = 30000
+
+    pcg.set_seed(seed)
+    reference = manager.run_spins(spins, 1.0)
+    reference_state = pcg.get_state()
+
+    pcg.set_seed(seed)
+    native = manager.run_spins_native(spins, 1.0)
+    native_state = pcg.get_state()
+
+    assert native.to_dict() == reference.to_dict()
+    assert native.bonus_triggers > 0
+    assert {level: entry["stats"].to_dict() for level, entry in native.bonus_levels.items()} == \
+           {level: entry["stats"].to_dict() for level, entry in reference.bonus_levels.items()}
+    assert native_state == reference_state
+
+
+def test_native_kernel_continues_the_pcg_stream(manager):
+    """Two native runs back to back play the same spins as one Python run of both."""
+    pcg.set_seed(7)
+    first = manager.run_spins_native(10000, 2.0)
+    first.merge(manager.run_spins_native(10000, 2.0))
+    native_state = pcg.get_state()
+
+    pcg.set_seed(7)
+    reference = manager.run_spins(10000, 2.0)
+    reference.merge(manager.run_spins(10000, 2.0))
+
+    assert first.to_dict() == reference.to_dict()
+    assert native_state == pcg.get_state()
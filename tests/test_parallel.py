@@ -0,0 +1,22 @@
+from src.simulation.parallel import run_parallel, split_spins
+
+
+def test_split_spins_covers_every_spin():
+    assert split_spins(23000, 5000) == [5000, 5000, 5000, 5000, 3000]
+    assert split_spins(0, 5000) == []
+
+
+def test_parallel_run_is_bit_identical_for_any_worker_count(manager):
+    results = [
+        run_parallel(manager.game_name, 42, workers, 23000, bet=1.0, block_size=5000).to_dict()
+        for workers in (1, 2, 3)
+    ]
+    assert results[0]["spins"] == 23000 and results[0]["bonus_triggers"] > 0
+    assert results[1] == results[0]
+    assert results[2] == results[0]
+
+
+def test_simulate_rtp_parallel_is_reproducible(manager):
+    # Three default-size blocks, spread over a different number of workers each time
+    rtp = [manager.simulate_rtp_parallel(7, workers, total_spins=250000, batch_size=10000) for workers in (2, 3)]
+    assert rtp[0] == rtp[1]
@@ -0,0 +1,101 @@
+import numpy as np
+import pytest
+
+from src.freeprngLib import pcg
+from src.freeprngLib.pcg import ReferencePCG32
+
+SEED = 2024
+N = 5000  # Crosses the 4096-draw jump table block
+
+
+def _scalar(call, n):
+    pcg.set_seed(SEED)
+    values = [call() for _ in range(n)]
+    return values, pcg.get_state()
+
+
+def _bulk(fill, n):
+    pcg.set_seed(SEED)
+    values = fill(n)
+    return values, pcg.get_state()
+
+
+def test_set_seed_matches_reference():
+    pcg.set_seed(SEED)
+    assert pcg.get_state() == ReferencePCG32(SEED).state == pcg.seed_to_state(SEED)
+
+
+def test_fill_uint32_matches_scalar_and_reference():
+    scalar, scalar_state = _scalar(pcg.get_uint32, N)
+    bulk, bulk_state = _bulk(lambda n: pcg.fill_uint32(np.empty(n, dtype=np.uint32)), N)
+    reference = ReferencePCG32(SEED)
+    assert bulk.tolist() == scalar == [reference.uint32() for _ in range(N)]
+    assert bulk_state == scalar_state == reference.state
+
+
+def test_fill_normalized_and_float_between_match_scalar():
+    scalar, scalar_state = _scalar(pcg.get_normalized, N)
+    bulk, bulk_state = _bulk(lambda n: pcg.fill_normalized(np.empty(n)), N)
+    assert bulk.tolist() == scalar and bulk_state == scalar_state
+
+    scalar, scalar_state = _scalar(lambda: pcg.get_float_between(0.0, 100.0), N)
+    bulk, bulk_state = _bulk(lambda n: pcg.fill_float_between(np.empty(n), 0.0, 100.0), N)
+    reference = ReferencePCG32(SEED)
+    assert bulk.tolist() == scalar == [reference.float_between(0.0, 100.0) for _ in range(N)]
+    assert bulk_state == scalar_state
+
+
+@pytest.mark.parametrize("min_val, max_val, inc_min, inc_max", [
+    (0, 49, True, True),
+    (0, 6, False, False),
+    (10, 3, True, True),  # Reversed bounds
+    (5, 5, True, False),  # Empty range: no draw
+    (0, (1 << 31) - 1, True, True),  # Large span: rejections happen
+])
+def test_fill_int_between_matches_scalar_and_reference(min_val, max_val, inc_min, inc_max):
+    scalar, scalar_state = _scalar(lambda: pcg.get_int_between(min_val, max_val, inc_min, inc_max), N)
+    bulk, bulk_state = _bulk(
+        lambda n: pcg.fill_int_between(np.empty(n, dtype=np.int32), min_val, max_val, inc_min, inc_max), N
+    )
+    reference = ReferencePCG32(SEED)
+    assert bulk.tolist() == scalar == [reference.int_between(min_val, max_val, inc_min, inc_max) for _ in range(N)]
+    assert bulk_state == scalar_state == reference.state
+
+
+def test_fill_int_between_with_one_range_per_item():
+    highs = np.arange(1, 301) % 7 + 1
+    pcg.set_seed(SEED)
+    scalar = [pcg.get_int_between(0, int(high)) for high in highs]
+    scalar_state = pcg.get_state()
+
+    pcg.set_seed(SEED)
+    bulk = pcg.fill_int_between(np.empty(highs.size, dtype=np.int32), 0, highs)
+    assert bulk.tolist() == scalar and pcg.get_state() == scalar_state
+
+
+def test_peek_does_not_advance_and_skip_does():
+    pcg.set_seed(SEED)
+    peeked = pcg.peek_float_between(100, 0.0, 100.0)
+    assert pcg.get_state() == pcg.seed_to_state(SEED)
+    pcg.skip(40)
+    reference = ReferencePCG32(SEED)
+    expected = [reference.float_between(0.0, 100.0) for _ in range(100)]
+    assert peeked.tolist() == expected
+    assert pcg.get_float_between(0.0, 100.0) == expected[40]
+
+
+def test_advance_state_matches_stepping():
+    reference = ReferencePCG32(SEED)
+    start = reference.state
+    for _ in range(1000):
+        reference.uint32()
+    assert pcg.advance_state(start, 1000) == reference.state
+    assert pcg.advance_state(start, 0) == start
+
+
+def test_stream_state_is_a_jump_ahead_of_the_seed():
+    base = pcg.seed_to_state(SEED)
+    assert pcg.stream_state(SEED, 0) == base
+    assert pcg.stream_state(SEED, 3) == pcg.advance_state(base, 3 * pcg.STREAM_STRIDE)
+    # Jumps compose: stream k + 1 starts one stride after stream k
+    assert pcg.stream_state(SEED, 4) == pcg.advance_state(pcg.stream_state(SEED, 3), pcg.STREAM_STRIDE)
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from config.base.sampler import DiscreteSampler
+from src.freeprngLib import pcg
+
+
+@pytest.mark.parametrize("probabilities", [[50, 40], [50, 60], [0, 0], [100.001, 0]])
+def test_rejects_tables_that_do_not_sum_to_100(probabilities):
+    with pytest.raises(ValueError, match="expected 100%"):
+        DiscreteSampler(["a", "b"], probabilities)
+
+
+def test_rejects_negative_and_mismatched_tables():
+    with pytest.raises(ValueError, match="negative"):
+        DiscreteSampler(["a", "b"], [110, -10])
+    with pytest.raises(ValueError, match="one probability per value"):
+        DiscreteSampler(["a", "b"], [100])
+    with pytest.raises(ValueError, match="one probability per value"):
+        DiscreteSampler([], [])
+
+
+def test_rounding_gap_within_tolerance_is_closed_at_100():
+    sampler = DiscreteSampler(["a", "b", "c"], [33.3333333, 33.3333333, 33.3333333])
+    assert sampler.cumulative[-1] == 100.0
+    assert sampler.index_of(99.99999999) == 2
+    assert sampler.probabilities.sum() == pytest.approx(1.0)
+
+
+def test_boundaries_belong_to_the_lower_entry():
+    sampler = DiscreteSampler(["a", "b", "c"], [25, 0, 75])
+    rand_values = np.array([0.0, 24.999999, 25.0, 25.000001, 99.999999])
+    expected = [0, 0, 0, 2, 2]  # First entry whose cumulative probability is >= r; "b" is never drawn
+    assert [sampler.index_of(r) for r in rand_values.tolist()] == expected
+    assert sampler.indices_for(rand_values).tolist() == expected
+
+
+def test_single_outcome_always_wins():
+    sampler = DiscreteSampler([7], [100])
+    pcg.set_seed(3)
+    assert sampler.draw_values(1000).tolist() == [7] * 1000
+
+
+def test_bulk_draws_match_scalar_draws():
+    sampler = DiscreteSampler([1, 2, 5, 10], [40, 30, 20, 10])
+    pcg.set_seed(8)
+    scalar = [sampler.draw() for _ in range(5000)]
+    scalar_state = pcg.get_state()
+
+    pcg.set_seed(8)
+    assert sampler.draw_values(5000).tolist() == scalar
+    assert pcg.get_state() == scalar_state